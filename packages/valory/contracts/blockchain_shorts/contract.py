@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -90,7 +90,7 @@ class BlockchainShortsContract(Contract):
         contract_address: str,
         owner: str,
         ipfs_hash: str,
-        **kwargs: Any
+        **kwargs: Any,
     ) -> JSONLike:
         """Gets the encoded arguments for a request tx, which should only be called via the multisig."""
 
@@ -122,3 +122,28 @@ class BlockchainShortsContract(Contract):
         for log in logs:
             return {"token_id": log["args"]["id"]}
         return {"token_id": None}
+
+    @classmethod
+    def get_token_ids_from_hash(
+        cls,
+        ledger_api: LedgerApi,
+        contract_address: str,
+        tx_hash: str,
+        **kwargs: Any,
+    ) -> JSONLike:
+        """
+        Process the receipt of a tx which may have minted several tokens.
+
+        :param ledger_api: the ledger apis.
+        :param contract_address: the contract address.
+        :param tx_hash: the hash of the mint tx to be processed.
+        :param kwargs: the keyword arguments.
+        :return: a dictionary with the ids of the minted tokens, keyed by the hex of their metadata hash.
+        """
+        contract = cls.get_instance(ledger_api, contract_address)
+        receipt = ledger_api.api.eth.get_transaction_receipt(tx_hash)
+        logs = contract.events.CreateBlockchainShort().process_receipt(receipt)
+        token_ids = {
+            bytes(log["args"]["hash"]).hex(): log["args"]["id"] for log in logs
+        }
+        return {"token_ids": token_ids}
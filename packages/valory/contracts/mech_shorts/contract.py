@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -81,7 +81,12 @@ class Mech(Contract):
         contract = cls.get_instance(ledger_api, contract_address)
         receipt: TxReceipt = ledger_api.api.eth.get_transaction_receipt(tx_hash)
         event_method = getattr(contract.events, event_name)
-        logs: List[EventData] = list(event_method().process_receipt(receipt))
+        # a tx may emit the same event from several mechs, keep only this contract's logs
+        logs: List[EventData] = [
+            log
+            for log in event_method().process_receipt(receipt)
+            if log["address"].lower() == contract_address.lower()
+        ]
 
         n_logs = len(logs)
         if n_logs != expected_logs:
@@ -211,6 +216,62 @@ class Mech(Contract):
 
         return dict(data=deliver_args["data"])
 
+    @classmethod
+    def get_delivered(
+        cls,
+        ledger_api: LedgerApi,
+        contract_address: str,
+        request_ids: List[int],
+        from_block: int,
+        **kwargs: Any,
+    ) -> JSONLike:
+        """
+        Get the `Deliver` events emitted for any of the given request ids since `from_block`.
+
+        Unlike `get_response`, a single call covers all the pending requests,
+        so tracking deliveries costs one logs query per newly mined block range.
+
+        :param ledger_api: the ledger apis.
+        :param contract_address: the contract address.
+        :param request_ids: the ids of the requests to track.
+        :param from_block: the first block to scan.
+        :param kwargs: the keyword arguments.
+        :return: a dictionary with a key named `delivered`, which contains the last scanned block
+            and a list of dictionaries with the request id, the data and the block number of each delivery.
+        """
+        ledger_api = cast(EthereumApi, ledger_api)
+        contract_instance = cls.get_instance(ledger_api, contract_address)
+
+        # pin the range's end so that no block is skipped between two consecutive scans
+        to_block = ledger_api.api.eth.block_number
+        if from_block > to_block:
+            return dict(delivered=dict(to_block=from_block - 1, events=[]))
+
+        tracked = set(request_ids)
+        events = []
+        # `requestId` is not indexed, therefore it cannot be used as a topic filter
+        logs: List[EventData] = contract_instance.events.Deliver.get_logs(
+            fromBlock=from_block, toBlock=to_block
+        )
+        for log in logs:
+            deliver_args = log.get("args", None)
+            if deliver_args is None or any(
+                key not in deliver_args for key in ("requestId", "data")
+            ):
+                error = f"The mech's response does not match the expected format: {log}"
+                return {"error": error}
+            if deliver_args["requestId"] not in tracked:
+                continue
+            events.append(
+                dict(
+                    requestId=deliver_args["requestId"],
+                    data=deliver_args["data"],
+                    block_number=log["blockNumber"],
+                )
+            )
+
+        return dict(delivered=dict(to_block=to_block, events=events))
+
     @classmethod
     def get_mech_id(
         cls, ledger_api: EthereumApi, contract_address: str, **kwargs: Any
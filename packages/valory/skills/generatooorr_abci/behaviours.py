@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2024 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -19,8 +19,11 @@
 
 """This package contains round behaviours of ContributionSkillAbci."""
 
+import json
 from abc import ABC
-from typing import Generator, Set, Type, cast
+from typing import Any, Dict, Generator, Optional, Set, Tuple, Type, cast
+
+from aea.skills.behaviours import TickerBehaviour
 
 from packages.valory.skills.abstract_round_abci.behaviours import (
     AbstractRoundBehaviour,
@@ -34,11 +37,26 @@ from packages.valory.skills.generatooorr_abci.tx_multiplexer import (
     TxSettlementMultiplexerAbci,
 )
 from packages.valory.skills.inbox_abci.behaviours import InboxAbciRoundBehaviour
+from packages.valory.skills.inbox_abci.behaviours import (
+    LongPollBehaviour as BaseLongPollBehaviour,
+)
+from packages.valory.skills.inbox_abci.handlers import InBox, RequestStage
 from packages.valory.skills.mech_interact_abci.behaviours.round_behaviour import (
     MechInteractRoundBehaviour,
 )
+from packages.valory.skills.mech_interact_abci.models import Metrics, RequestTracer
+from packages.valory.skills.mech_interact_abci.states.response import MechResponseRound
+from packages.valory.skills.mech_interact_abci.tracing import ROUND_KIND, STAGE_KIND
 from packages.valory.skills.nft_mint_abci.behaviours import NftMintAbciRoundBehaviour
+from packages.valory.skills.nft_mint_abci.rounds import NftMintRound
+from packages.valory.skills.outbox_abci.behaviours import (
+    NotificationDeliveryBehaviour as BaseNotificationDeliveryBehaviour,
+)
 from packages.valory.skills.outbox_abci.behaviours import OutboxAbciRoundBehaviour
+from packages.valory.skills.outbox_abci.rounds import PushNotificationRound
+from packages.valory.skills.outbox_abci.rounds import (
+    SynchronizedData as OutboxSynchronizedData,
+)
 from packages.valory.skills.registration_abci.behaviours import (
     AgentRegistrationRoundBehaviour,
     RegistrationStartupBehaviour,
@@ -55,6 +73,125 @@ from packages.valory.skills.transaction_settlement_abci.behaviours import (
 )
 
 
+NotificationDeliveryBehaviour = BaseNotificationDeliveryBehaviour
+LongPollBehaviour = BaseLongPollBehaviour
+
+# the lifecycle stage which the requests of a period have reached once the FSM enters each round,
+# except for the delivered one, which is only reached if the mech's response could be used
+ROUND_STAGES: Dict[str, RequestStage] = {
+    MechResponseRound.auto_round_id(): RequestStage.MECH_SUBMITTED,
+    NftMintRound.auto_round_id(): RequestStage.DELIVERED,
+    PushNotificationRound.auto_round_id(): RequestStage.MINTED,
+}
+# the detail under which the latest settled tx is recorded when a stage is reached
+STAGE_TX_HASHES: Dict[RequestStage, str] = {
+    RequestStage.MECH_SUBMITTED: "mech_tx_hash",
+    RequestStage.MINTED: "mint_tx_hash",
+}
+
+
+class RequestStageBehaviour(TickerBehaviour):
+    """Feeds the lifecycle stages of the requests being processed from the rounds of the FSM to the inbox."""
+
+    def act(self) -> None:
+        """Move the requests of the current period to the stage of the current round."""
+        round_sequence = self.context.state.round_sequence
+        stage = ROUND_STAGES.get(round_sequence.current_round_id, None)
+        if stage is None:
+            return
+
+        synchronized_data = OutboxSynchronizedData(
+            db=round_sequence.latest_synchronized_data.db
+        )
+        if stage == RequestStage.DELIVERED and not self.is_delivered(synchronized_data):
+            # the mint's behaviour fails the request instead, which the inbox re-queues or records as failed
+            return
+        inbox = cast(InBox, self.context.state.inbox)
+        details: Dict[str, Any] = {}
+        if stage in STAGE_TX_HASHES:
+            tx_hash = synchronized_data.db.get("final_tx_hash", None)
+            details[STAGE_TX_HASHES[stage]] = tx_hash
+        if stage == RequestStage.MINTED:
+            for nonce, token_id in synchronized_data.token_ids.items():
+                inbox.set_stage(nonce, stage, token_id=token_id, **details)
+            return
+        for nonce in synchronized_data.requests:
+            inbox.set_stage(nonce, stage, **details)
+
+    @staticmethod
+    def is_delivered(synchronized_data: OutboxSynchronizedData) -> bool:
+        """Check whether the mech has delivered a result for the requests of the period which can be minted."""
+        mech_responses = synchronized_data.mech_responses
+        if not mech_responses or mech_responses[0].result is None:
+            return False
+        try:
+            json.loads(mech_responses[0].result)
+        except json.JSONDecodeError:
+            return False
+        return True
+
+
+class RequestTracingBehaviour(TickerBehaviour):
+    """
+    Traces the rounds of the FSM and the lifecycle stages of the requests, tagged with the requests' nonces.
+
+    A round's span is tagged with the requests of the period, as known when the round is entered or exited,
+    so the round in which a request is picked up from the inbox is part of its trace too.
+    The rounds which are not part of any request's processing, e.g., waiting for one, are not recorded.
+    """
+
+    def setup(self) -> None:
+        """Set up the behaviour."""
+        # the id and the height of the current round, with its span
+        self._round: Optional[Tuple[str, int]] = None
+        self._round_span: Optional[Dict[str, Any]] = None
+        # the current stage of each request which has not reached a final one, with the time it was reached
+        self._stages: Dict[str, Tuple[str, float]] = {}
+        self._subscribed = False
+
+    @property
+    def tracer(self) -> RequestTracer:
+        """Get the tracer of the requests."""
+        return cast(RequestTracer, self.context.tracer)
+
+    def _on_stage(self, record: Dict) -> None:
+        """Record the span of the stage which a request has just left."""
+        nonce = record["nonce"]
+        previous = self._stages.pop(nonce, None)
+        reached = record["timestamps"][record["stage"]]
+        if previous is not None:
+            stage, since = previous
+            span = self.tracer.start(stage, STAGE_KIND, [nonce], now=since)
+            self.tracer.end(span, now=reached)
+        if not RequestStage(record["stage"]).is_final:
+            self._stages[nonce] = (record["stage"], reached)
+
+    def act(self) -> None:
+        """Close the span of the previous round and open the current one's, if the round has changed."""
+        if not self._subscribed:
+            cast(InBox, self.context.state.inbox).subscribe(self._on_stage)
+            self._subscribed = True
+
+        round_sequence = self.context.state.round_sequence
+        current = (
+            round_sequence.current_round_id,
+            round_sequence.current_round_height,
+        )
+        if current == self._round:
+            return
+
+        nonces = list(round_sequence.latest_synchronized_data.db.get("requests", {}))
+        if self._round_span is not None:
+            self._round_span["nonces"] = sorted({*self._round_span["nonces"], *nonces})
+            if self._round_span["nonces"]:
+                self.tracer.end(self._round_span)
+        round_id, height = current
+        self._round = current
+        self._round_span = self.tracer.start(
+            round_id, ROUND_KIND, nonces, height=height
+        )
+
+
 class TxMultiplexerBehaviour(BaseBehaviour, ABC):
     """
     The post transaction settlement behaviour.
@@ -70,11 +207,22 @@ class TxMultiplexerBehaviour(BaseBehaviour, ABC):
         """Return the synchronized data."""
         return cast(SynchronizedData, super().synchronized_data)
 
+    @property
+    def metrics(self) -> Metrics:
+        """Get the agent's metrics."""
+        return cast(Metrics, self.context.metrics)
+
+    def count_settlement(self, outcome: str) -> None:
+        """Count the outcome of the settlement of the submitted transaction."""
+        submitter = self.synchronized_data.tx_submitter
+        self.metrics.tx_settlements.labels(submitter, outcome).inc()
+
     def async_act(self) -> Generator:
         """Simply log that a tx is settled and wait for round end."""
         self.context.logger.info(
             f"The transaction submitted by {self.synchronized_data.tx_submitter} was successfully settled."
         )
+        self.count_settlement("settled")
         yield from self.wait_until_round_end()
         self.set_done()
 
@@ -94,6 +242,7 @@ class FailedTxMultiplexerBehaviour(TxMultiplexerBehaviour):
         self.context.logger.info(
             f"The transaction submitted by {self.synchronized_data.tx_submitter} could not be settled."
         )
+        self.count_settlement("failed")
         yield from self.wait_until_round_end()
         self.set_done()
 
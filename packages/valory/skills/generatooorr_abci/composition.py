@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2024 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -46,6 +46,7 @@ from packages.valory.skills.termination_abci.rounds import (
 abci_app_transition_mapping: AbciAppTransitionMapping = {
     RegistrationAbci.FinishedRegistrationRound: InboxAbci.WaitRound,
     InboxAbci.FinishedInboxWaitingRound: MechRequestStates.MechRequestRound,
+    InboxAbci.FinishedInboxCachedRound: NftMintAbci.NftMintRound,
     MechFinalStates.FinishedMechTxSubmitterRound: TxSettlementAbci.RandomnessTransactionSubmissionRound,
     TxMultiplexerAbci.FinishedMechTxRound: MechResponseStates.MechResponseRound,
     MechFinalStates.FinishedMechResponseRound: NftMintAbci.NftMintRound,
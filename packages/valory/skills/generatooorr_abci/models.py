@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -20,21 +20,29 @@
 """This module contains the shared state for the abci skill of GeneratooorrAbciApp."""
 
 from packages.valory.skills.abstract_round_abci.models import ApiSpecs
-from packages.valory.skills.abstract_round_abci.models import (
-    BenchmarkTool as BaseBenchmarkTool,
-)
 from packages.valory.skills.abstract_round_abci.models import Requests as BaseRequests
 from packages.valory.skills.abstract_round_abci.models import (
     SharedState as BaseSharedState,
 )
 from packages.valory.skills.generatooorr_abci.composition import GeneratooorrAbciApp
 from packages.valory.skills.inbox_abci.models import Params as BaseInboxAbciParams
+from packages.valory.skills.mech_interact_abci.models import (
+    BenchmarkTool as BaseBenchmarkTool,
+)
+from packages.valory.skills.mech_interact_abci.models import HttpPool as BaseHttpPool
 from packages.valory.skills.mech_interact_abci.models import (
     MechResponseSpecs as BaseMechResponseSpecs,
 )
+from packages.valory.skills.mech_interact_abci.models import (
+    MechRouter as BaseMechRouter,
+)
+from packages.valory.skills.mech_interact_abci.models import Metrics as BaseMetrics
 from packages.valory.skills.mech_interact_abci.models import (
     Params as BaseMechInteractAbciParams,
 )
+from packages.valory.skills.mech_interact_abci.models import (
+    RequestTracer as BaseRequestTracer,
+)
 from packages.valory.skills.mech_interact_abci.rounds import Event as MechInteractEvent
 from packages.valory.skills.nft_mint_abci.models import Params as BaseNFTMintParams
 from packages.valory.skills.outbox_abci.models import Params as BaseOutboxAbciParams
@@ -57,6 +65,10 @@ NFTMintParams = BaseNFTMintParams
 Requests = BaseRequests
 BenchmarkTool = BaseBenchmarkTool
 MechResponseSpecs = BaseMechResponseSpecs
+MechRouter = BaseMechRouter
+HttpPool = BaseHttpPool
+RequestTracer = BaseRequestTracer
+Metrics = BaseMetrics
 
 MARGIN = 5
 MULTIPLIER = 2
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the behaviours.py module of the Generatooorr."""
+
+import json
+import logging
+import types
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+import pytest
+
+from packages.valory.skills.abstract_round_abci.base import AbciAppDB
+from packages.valory.skills.generatooorr_abci.behaviours import RequestStageBehaviour
+from packages.valory.skills.inbox_abci.handlers import InBox, RequestStage
+from packages.valory.skills.mech_interact_abci.states.response import MechResponseRound
+from packages.valory.skills.nft_mint_abci.rounds import NftMintRound
+from packages.valory.skills.outbox_abci.rounds import PushNotificationRound
+from packages.valory.skills.registration_abci.rounds import RegistrationRound
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TestRequestStageBehaviour:
+    """Test RequestStageBehaviour of Generatooorr."""
+
+    def setup_method(self) -> None:
+        """Set up the test."""
+        self.context = mock.MagicMock()
+        self.behaviour = RequestStageBehaviour(name="", skill_context=self.context)
+
+    @pytest.fixture
+    def inbox(self, tmp_path: Path) -> InBox:
+        """The inbox, with two requests of the current period and one which is still queued."""
+        inbox = InBox(LOGGER, db=str(tmp_path / "db.json"))
+        self.nonces: List[str] = [
+            inbox.put({"prompt": "prompt", "tool": "short-maker", "address": "0x1"}),
+            inbox.put({"prompt": "prompt", "tool": "short-maker", "address": "0x2"}),
+            inbox.put({"prompt": "other", "tool": "short-maker", "address": "0x3"}),
+        ]
+        self.context.state.inbox = inbox
+        return inbox
+
+    def enter(self, round_id: str, **data: Any) -> None:
+        """Enter the given round, with the given synchronized data, and act."""
+        db = AbciAppDB(setup_data=AbciAppDB.data_to_lists(data))
+        self.context.state.round_sequence = types.SimpleNamespace(
+            current_round_id=round_id,
+            latest_synchronized_data=types.SimpleNamespace(db=db),
+        )
+        self.behaviour.act()
+
+    def stages(self, inbox: InBox) -> Dict[str, Any]:
+        """Get the stages of the requests."""
+        return {nonce: inbox.lifecycle(nonce)["stage"] for nonce in self.nonces}  # type: ignore
+
+    def test_act(self, inbox: InBox) -> None:
+        """Test that the requests of the period move to the stage of the round, with the settled tx."""
+        first, second, queued = self.nonces
+        requests = {first: "0x1", second: "0x2"}
+        self.enter(RegistrationRound.auto_round_id(), requests=requests)
+        assert set(self.stages(inbox).values()) == {RequestStage.QUEUED.value}
+
+        self.enter(
+            MechResponseRound.auto_round_id(), requests=requests, final_tx_hash="0xa"
+        )
+        record = inbox.lifecycle(first)
+        assert record is not None
+        assert record["stage"] == RequestStage.MECH_SUBMITTED.value
+        assert record["mech_tx_hash"] == "0xa"
+        assert self.stages(inbox)[queued] == RequestStage.QUEUED.value
+
+        token_ids = json.dumps({first: 1, second: 2})
+        self.enter(
+            PushNotificationRound.auto_round_id(),
+            requests=requests,
+            token_ids=token_ids,
+            final_tx_hash="0xb",
+        )
+        for nonce, token_id in ((first, 1), (second, 2)):
+            record = inbox.lifecycle(nonce)
+            assert record is not None
+            assert record["stage"] == RequestStage.MINTED.value
+            assert record["token_id"] == token_id
+            assert record["mint_tx_hash"] == "0xb"
+        assert self.stages(inbox)[queued] == RequestStage.QUEUED.value
+
+    @pytest.mark.parametrize(
+        "result, delivered",
+        (
+            (json.dumps({"image": "a", "video": "b"}), True),
+            (None, False),
+            ("not json", False),
+        ),
+    )
+    def test_delivered(
+        self, inbox: InBox, result: Optional[str], delivered: bool
+    ) -> None:
+        """Test that the requests are only delivered if the mech's response can be minted."""
+        first, second, _ = self.nonces
+        requests = {first: "0x1", second: "0x2"}
+        self.enter(MechResponseRound.auto_round_id(), requests=requests)
+        mech_responses = json.dumps([{"nonce": first, "result": result}])
+        self.enter(
+            NftMintRound.auto_round_id(),
+            requests=requests,
+            mech_responses=mech_responses,
+        )
+        stage = RequestStage.DELIVERED if delivered else RequestStage.MECH_SUBMITTED
+        assert self.stages(inbox)[first] == stage.value
+        assert self.stages(inbox)[second] == stage.value
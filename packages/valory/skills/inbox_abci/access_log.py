@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the access log of the inbox's http api."""
+
+import json
+import logging
+import os
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Optional
+
+
+class AccessLog:
+    """
+    Writes a json line per http request, with its method, route, status, latency and body sizes.
+
+    The lines are queued by the calling thread and written to the file by a background one,
+    so that the file's I/O does not add to the requests' latency.
+    The failed and the slow requests are always logged, the rest are sampled.
+    Every line carries the rate it was sampled at, so that the counts can be weighted back.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: float = 1.0,
+        slow_threshold: float = 1.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize object.
+
+        :param path: the path of the access log's file, which is opened on the first write.
+        :param sample_rate: the share of the successful, fast requests which are logged.
+        :param slow_threshold: the latency, in seconds, from which on a request is always logged.
+        :param seed: the seed of the sampling, for reproducibility.
+        """
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self._random = random.Random(seed)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = logging.FileHandler(path, delay=True)
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        queue: SimpleQueue = SimpleQueue()
+        # a logger of its own, so that the lines do not reach the agent's log
+        self.logger = logging.Logger("access")
+        self.logger.addHandler(QueueHandler(queue))
+        self._listener: Optional[QueueListener] = QueueListener(queue, file_handler)
+        self._listener.start()
+
+    def sampled(self, status: int, latency: float) -> bool:
+        """Check whether a request with the given status and latency is logged."""
+        if status >= 400 or latency >= self.slow_threshold:
+            return True
+        return self._random.random() < self.sample_rate
+
+    def record(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        route: str,
+        status: int,
+        latency: float,
+        request_size: int,
+        response_size: int,
+    ) -> bool:
+        """
+        Log a request, if it is sampled.
+
+        :param method: the request's method.
+        :param route: the route which handled the request, rather than its url, so that the lines can be grouped.
+        :param status: the response's status code.
+        :param latency: the time, in seconds, from receiving the request until responding to it.
+        :param request_size: the size of the request's body, in bytes.
+        :param response_size: the size of the response's body, in bytes.
+        :return: whether the request has been logged.
+        """
+        if self._listener is None or not self.sampled(status, latency):
+            return False
+        always = status >= 400 or latency >= self.slow_threshold
+        line = {
+            "time": round(time.time(), 3),
+            "method": method.upper(),
+            "route": route,
+            "status": status,
+            "latency_ms": round(latency * 1000, 3),
+            "request_bytes": request_size,
+            "response_bytes": response_size,
+            "sample_rate": 1.0 if always else self.sample_rate,
+        }
+        self.logger.info(json.dumps(line))
+        return True
+
+    def stop(self) -> None:
+        """Write the queued lines and stop the background thread. Later requests are not logged."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the admission control of the requests submitted to the inbox."""
+
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+class TokenBucket:
+    """A token bucket, which admits `burst` requests at once and `rate` requests per second on average."""
+
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        """Initialize object."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def is_full(self, now: float) -> bool:
+        """Whether the bucket has refilled completely, i.e., whether it is equivalent to a new one."""
+        self._refill(now)
+        return self.tokens >= self.burst
+
+    def wait_time(self, n: int, now: float) -> float:
+        """Get the time until the bucket has enough tokens for `n` requests. Infinite if it can never have."""
+        self._refill(now)
+        if n > self.burst:
+            return float("inf")
+        missing = n - self.tokens
+        return max(missing / self.rate, 0.0)
+
+    def take(self, n: int, now: float) -> None:
+        """Take the tokens of `n` requests."""
+        self._refill(now)
+        self.tokens -= n
+
+
+class AdmissionController:
+    """
+    Decides whether the inbox can admit new requests, protecting the agent's memory and the queue's latency.
+
+    A request is rejected if the queue is full, if the estimated queue time exceeds the target,
+    or if the global rate limit or the rate limit of its address is exceeded.
+    A zero limit disables the corresponding check.
+    The rejections come with the time after which the requests are expected to be admitted.
+    """
+
+    # the number of per-address buckets above which the full ones are dropped
+    max_idle_buckets = 10_000
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_queue_size: int,
+        queue_time_target: float,
+        address_rate: float,
+        address_burst: int,
+        global_rate: float,
+        global_burst: int,
+    ) -> None:
+        """Initialize object."""
+        self.max_queue_size = max_queue_size
+        self.queue_time_target = queue_time_target
+        self.address_rate = address_rate
+        self.address_burst = address_burst
+        self.global_rate = global_rate
+        self.global_burst = global_burst
+        self._global: Optional[TokenBucket] = None
+        self._addresses: Dict[str, TokenBucket] = {}
+        self.rejected: Counter = Counter()
+
+    def _address_bucket(self, address: str, now: float) -> TokenBucket:
+        """Get the bucket of the given address."""
+        bucket = self._addresses.get(address, None)
+        if bucket is None:
+            if len(self._addresses) >= self.max_idle_buckets:
+                self._addresses = {
+                    idle_address: idle_bucket
+                    for idle_address, idle_bucket in self._addresses.items()
+                    if not idle_bucket.is_full(now)
+                }
+            bucket = TokenBucket(self.address_rate, self.address_burst, now)
+            self._addresses[address] = bucket
+        return bucket
+
+    def _global_bucket(self, now: float) -> TokenBucket:
+        """Get the global bucket."""
+        if self._global is None:
+            self._global = TokenBucket(self.global_rate, self.global_burst, now)
+        return self._global
+
+    def admit(  # pylint: disable=too-many-arguments
+        self,
+        addresses: List[str],
+        queue_size: int,
+        queue_time: float,
+        drain_rate: float,
+        now: float,
+    ) -> Optional[float]:
+        """
+        Admit the given requests, either all or none of them.
+
+        :param addresses: the addresses of the requests, one per request.
+        :param queue_size: the number of the queued requests.
+        :param queue_time: the estimated time until a new request is processed, in seconds.
+        :param drain_rate: the measured number of requests processed per second.
+        :param now: the current time.
+        :return: `None` if the requests are admitted, otherwise the seconds after which they may be retried,
+            which are infinite if they exceed the size of the queue or the burst of a rate limit.
+        """
+        n_requests = len(addresses)
+        if self.max_queue_size and n_requests > self.max_queue_size:
+            # the requests would not fit even in an empty queue
+            self.rejected["queue_size"] += 1
+            return float("inf")
+
+        if self.max_queue_size and queue_size + n_requests > self.max_queue_size:
+            self.rejected["queue_size"] += 1
+            excess = queue_size + n_requests - self.max_queue_size
+            return excess / drain_rate
+
+        if self.queue_time_target and queue_time > self.queue_time_target:
+            self.rejected["queue_time"] += 1
+            return queue_time - self.queue_time_target
+
+        wait_time = 0.0
+        if self.global_rate:
+            bucket = self._global_bucket(now)
+            wait_time = max(wait_time, bucket.wait_time(n_requests, now))
+        if self.address_rate:
+            for address, count in Counter(addresses).items():
+                bucket = self._address_bucket(address, now)
+                wait_time = max(wait_time, bucket.wait_time(count, now))
+        if wait_time > 0:
+            self.rejected["rate"] += 1
+            return wait_time
+
+        # the tokens are only taken once all the limits are known to be met
+        if self.global_rate:
+            self._global_bucket(now).take(n_requests, now)
+        if self.address_rate:
+            for address, count in Counter(addresses).items():
+                self._address_bucket(address, now).take(count, now)
+        return None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get the number of rejections, per reason."""
+        return dict(self.rejected)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -20,9 +20,12 @@
 """This package contains round behaviours of InboxAbciApp."""
 
 import json
+import time
 from abc import ABC
 from typing import Generator, Set, Type, cast
 
+from aea.skills.behaviours import TickerBehaviour
+
 from packages.valory.skills.abstract_round_abci.base import AbstractRound
 from packages.valory.skills.abstract_round_abci.behaviours import (
     AbstractRoundBehaviour,
@@ -80,6 +83,14 @@ class WaitBehaviour(InboxAbciBaseBehaviour):
         self.set_done()
 
 
+class LongPollBehaviour(TickerBehaviour):
+    """Responds to the timed out long-poll requests."""
+
+    def act(self) -> None:
+        """Expire the timed out long-poll requests."""
+        self.context.handlers.http.expire_waiting(time.time())
+
+
 class InboxAbciRoundBehaviour(AbstractRoundBehaviour):
     """InboxAbciRoundBehaviour"""
 
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the memory diagnostics of the agent."""
+
+import sys
+import tracemalloc
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+
+GROUP_BY = ("lineno", "filename", "traceback")
+# the allocations of the diagnostics themselves are left out of the snapshots
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def deep_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Get the size of an object, including the containers and the objects it holds, counting each object once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    return size
+
+
+def approximate_size(collection: Any, sample: int = 100) -> int:
+    """
+    Approximate the deep size of a collection from a sample of its items, so that large collections are cheap to size.
+
+    :param collection: a dict or a sized iterable.
+    :param sample: the number of the sampled items.
+    :return: the approximate size, in bytes.
+    """
+    count = len(collection)
+    if count <= sample:
+        return deep_size(collection)
+    # the objects shared by the items, e.g., interned strings, are counted once
+    seen: Set[int] = set()
+    if isinstance(collection, dict):
+        pairs = islice(collection.items(), sample)
+        sampled = sum(deep_size(k, seen) + deep_size(v, seen) for k, v in pairs)
+    else:
+        if isinstance(collection, (list, tuple)):
+            # spread over the whole sequence, as the oldest items may differ from the latest ones
+            items: Iterable[Any] = collection[:: count // sample][:sample]
+        else:
+            items = islice(collection, sample)
+        sampled = sum(deep_size(item, seen) for item in items)
+    return sys.getsizeof(collection) + sampled * count // sample
+
+
+class MemoryDiagnostics:
+    """
+    Reports the allocation sites whose memory grew since the previous snapshot, and the sizes of the key structures.
+
+    The allocations are traced from the first snapshot on, until tracing is stopped,
+    as tracing slows down every allocation. Taking a snapshot blocks the calling thread while it walks the traces.
+    """
+
+    def __init__(self, frames: int = 1) -> None:
+        """Initialize object."""
+        self.frames = frames
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._structures: Dict[str, Callable[[], Any]] = {}
+
+    @property
+    def tracing(self) -> bool:
+        """Whether the allocations are traced."""
+        return tracemalloc.is_tracing()
+
+    def add_structure(self, name: str, getter: Callable[[], Any]) -> None:
+        """Add a structure to the census, given the getter of its current collection."""
+        self._structures[name] = getter
+
+    def census(self, structures: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Count and size the added structures and the given ones.
+
+        :param structures: the current collections of further structures, per name.
+        :return: the number of items and the approximate size of each structure, or the error getting it.
+        """
+        collections = dict(structures or {})
+        result: Dict[str, Any] = {}
+        for name, getter in self._structures.items():
+            try:
+                collections[name] = getter()
+            except Exception as e:  # pylint: disable=broad-except
+                result[name] = {"error": f"{type(e).__name__}: {e}"}
+        for name, collection in collections.items():
+            result[name] = {
+                "count": len(collection),
+                "size": approximate_size(collection),
+            }
+        return dict(sorted(result.items()))
+
+    def snapshot(self, limit: int = 20, group_by: str = "lineno") -> Dict[str, Any]:
+        """
+        Take a snapshot of the traced allocations and diff it against the previous one.
+
+        Tracing is started by the first snapshot, which has no previous one to be diffed against.
+
+        :param limit: the number of the reported allocation sites.
+        :param group_by: how the allocations are grouped, i.e., by `lineno`, `filename` or `traceback`.
+        :return: the traced memory and the top allocation sites, by their growth since the previous snapshot.
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(self.frames)
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        current, peak = tracemalloc.get_traced_memory()
+
+        sites = []
+        if self._previous is None:
+            for stat in snapshot.statistics(group_by)[:limit]:
+                sites.append(
+                    {
+                        "site": [str(frame) for frame in stat.traceback],
+                        "size": stat.size,
+                        "count": stat.count,
+                    }
+                )
+        else:
+            for diff in snapshot.compare_to(self._previous, group_by)[:limit]:
+                sites.append(
+                    {
+                        "site": [str(frame) for frame in diff.traceback],
+                        "size": diff.size,
+                        "size_diff": diff.size_diff,
+                        "count": diff.count,
+                        "count_diff": diff.count_diff,
+                    }
+                )
+        diffed = self._previous is not None
+        self._previous = snapshot
+        return {
+            "tracing_started": started,
+            "diffed": diffed,
+            "traced": {"current": current, "peak": peak},
+            "sites": sites,
+        }
+
+    def stop(self) -> None:
+        """Stop tracing the allocations and drop the previous snapshot."""
+        self._previous = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2024 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -19,12 +19,16 @@
 
 """This module contains the handlers for the skill of InboxAbciApp."""
 
+import hashlib
 import json
+import math
 import os
+import threading
+import time
+from collections import OrderedDict, deque
 from enum import Enum
 from logging import Logger
-from typing import Any, Callable, Dict, List, Optional, cast
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, cast
 from uuid import uuid4
 
 from aea.protocols.base import Message
@@ -55,8 +59,14 @@ from packages.valory.skills.abstract_round_abci.handlers import (
 from packages.valory.skills.abstract_round_abci.handlers import (
     TendermintHandler as BaseTendermintHandler,
 )
+from packages.valory.skills.inbox_abci.access_log import AccessLog
+from packages.valory.skills.inbox_abci.admission import AdmissionController
+from packages.valory.skills.inbox_abci.diagnostics import GROUP_BY, MemoryDiagnostics
 from packages.valory.skills.inbox_abci.dialogues import HttpDialogue, HttpDialogues
+from packages.valory.skills.inbox_abci.profiler import SamplingProfiler
 from packages.valory.skills.inbox_abci.rounds import SynchronizedData
+from packages.valory.skills.inbox_abci.routing import HttpRequest, Route, RouteTable
+from packages.valory.skills.inbox_abci.scheduler import ToolQueues
 
 
 ABCIRoundHandler = BaseABCIRoundHandler
@@ -68,28 +78,48 @@ IpfsHandler = BaseIpfsHandler
 
 
 JSON_MIME_HEADER = {"Content-Type": "application/json"}
+METRICS_MIME_HEADER = {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
 RESPONSE_HEADERS = {
     "Server": "Generatooorr/0.1.0.rc01",
-    "Connection": "Closed",
+    "Connection": "keep-alive",
     "Access-Control-Allow-Origin": "*",
 }
 CODE_TO_MESSAGE = {
     200: "Ok",
+    202: "Accepted",
     404: "Not Found",
     400: "Bad Request",
     401: "Unauthorized",
+    409: "Conflict",
+    429: "Too Many Requests",
 }
 
+# the assumed processing time of a request, until the actual ones have been measured
 REQUEST_TIME = 30 * 60  # 30 minutes in seconds
+LIFECYCLE_TTL = 24 * 60 * 60  # 1 day in seconds
+MIN_PROCESSING_TIME = 1.0
+# the fields of the mech metadata, excluding the nonce, which identify a request's result
+CACHE_KEY_FIELDS = ("prompt", "tool")
+# the fields which every request of a batch must specify
+REQUIRED_REQUEST_FIELDS = ("prompt", "tool", "address")
+
+PROFILE_PATH = "/debug/profile"
+PROFILE_FORMATS = ("collapsed", "speedscope")
+MAX_PROFILE_SECONDS = 300.0
+# the route of the access log's lines for the requests with no handler
+UNMATCHED_ROUTE = "unmatched"
 
 
 class HttpResponseCode(Enum):
     """Http response codes."""
 
     OK = 200
+    ACCEPTED = 202
     NOT_FOUND = 404
     BAD_REQUEST = 400
     UNAUTHORIZED = 401
+    CONFLICT = 409
+    TOO_MANY_REQUESTS = 429
 
     @property
     def message(self) -> str:
@@ -105,56 +135,220 @@ class HttpMethod(Enum):
     POST = "post"
 
 
-class TypedResponse(TypedDict):
-    """Typed response dict."""
+class RequestStage(Enum):
+    """The stages of a request's lifecycle, in order."""
+
+    QUEUED = "queued"
+    MECH_SUBMITTED = "mech_submitted"
+    DELIVERED = "delivered"
+    MINTED = "minted"
+    NOTIFIED = "notified"
+    FAILED = "failed"
+
+    @property
+    def is_final(self) -> bool:
+        """Whether the request can no longer change stage."""
+        return self in (RequestStage.NOTIFIED, RequestStage.FAILED)
+
+
+# the stages which a request reaches through the mech's single result are shared with its coalesced duplicates
+SHARED_STAGES = (RequestStage.MECH_SUBMITTED, RequestStage.DELIVERED)
+STAGES_ORDER = list(RequestStage)
+
+
+class _TypedResponseBase(TypedDict):
+    """The required fields of a typed response dict."""
 
     code: HttpResponseCode
     data: Optional[Dict]
 
 
+class TypedResponse(_TypedResponseBase, total=False):
+    """Typed response dict. A `text` body is sent as is, instead of the JSON of the `data`."""
+
+    headers: Dict[str, str]
+    text: str
+
+
 class HttpApplication:
     """Http Server class."""
 
-    authenticated_handlers = ["post_restore"]
-
-    def __init__(self, inbox: "InBox", auth: str) -> None:
+    authenticated_handlers = [
+        "post_restore",
+        "post_debug_profile",
+        "get_debug_profile",
+        "post_debug_memory",
+    ]
+    # the path parameters are passed to the routes' handlers as keyword arguments
+    routes = [
+        Route("post", "/generate", "post_generate"),
+        Route("post", "/generate/batch", "post_generate_batch"),
+        Route("post", "/restore", "post_restore"),
+        Route("get", "/responses", "get_responses"),
+        Route("get", "/queue_time", "get_queue_time"),
+        Route("get", "/queue/tools", "get_queue_tools"),
+        Route("get", "/admission/stats", "get_admission_stats"),
+        Route("get", "/cache/stats", "get_cache_stats"),
+        Route("get", "/http/pool", "get_http_pool"),
+        Route("get", "/requests/{nonce}", "get_request"),
+        Route("get", "/requests/{nonce}/wait", "get_request_wait"),
+        Route("get", "/requests/{nonce}/trace", "get_request_trace"),
+        Route("get", "/traces/breakdown", "get_traces_breakdown"),
+        Route("get", "/metrics", "get_metrics"),
+        Route("get", "/benchmarks", "get_benchmarks"),
+        Route("post", PROFILE_PATH, "post_debug_profile"),
+        Route("get", PROFILE_PATH + "/{profile_id}", "get_debug_profile"),
+        Route("post", "/debug/memory", "post_debug_memory"),
+    ]
+    route_patterns = {"nonce": "[0-9a-f]+", "profile_id": "[0-9a-f]+"}
+
+    def __init__(
+        self,
+        inbox: "InBox",
+        auth: str,
+        http_pool: Optional[Any] = None,
+        admission: Optional[AdmissionController] = None,
+        tracer: Optional[Any] = None,
+        metrics: Optional[Any] = None,
+        benchmark_tool: Optional[Any] = None,
+    ) -> None:
         """Initialize object."""
         self.inbox = inbox
         self.auth = auth
+        self.http_pool = http_pool
+        self.admission = admission
+        self.tracer = tracer
+        self.metrics = metrics
+        self.benchmark_tool = benchmark_tool
+        self.route_table = RouteTable(self.routes, self.route_patterns)
+        # the handlers are bound once, which also fails early on a route without a handler
+        self._handlers: Dict[str, Callable[..., Optional[TypedResponse]]] = {
+            route.handler: getattr(self, route.handler) for route in self.route_table
+        }
+        self.profiler = SamplingProfiler()
+        self.diagnostics = MemoryDiagnostics()
 
-    def handle(self, message: HttpMessage) -> TypedResponse:
-        """Handle incoming request."""
-        url_meta = urlparse(message.url)
-        handler_func = message.method + url_meta.path.replace("/", "_")
-        if message.method == "post":
-            headers = dict(
-                map(
-                    lambda x: x.split(": ", maxsplit=1),
-                    message.headers.strip().split("\n"),
-                )
+    def resolve(self, request: HttpRequest) -> None:
+        """Set the route of the given request, which is `None` if it has no handler, and the parameters in its path."""
+        request.route, request.params = self.route_table.resolve(
+            request.method, request.path
+        )
+
+    def handle(self, message: HttpMessage) -> Optional[TypedResponse]:
+        """Handle incoming request. `None` means that the response is deferred."""
+        return self.dispatch(HttpRequest(message))
+
+    def dispatch(self, request: HttpRequest) -> Optional[TypedResponse]:
+        """Handle the given request, resolving it first unless it already is. `None` means that the response is deferred."""
+        if request.route is None:
+            self.resolve(request)
+        if request.route is None:
+            return self._respond_404(request)
+        if (
+            request.route.handler in self.authenticated_handlers
+            and request.headers.get("Authorization", "") != self.auth
+        ):
+            return TypedResponse(
+                code=HttpResponseCode.UNAUTHORIZED,
+                data={"status": "REJECTED", "message": "Invalid authentication"},
             )
-            if (
-                headers.get("Authorization", "") != self.auth
-                and handler_func in self.authenticated_handlers
-            ):
-                return TypedResponse(
-                    code=HttpResponseCode.UNAUTHORIZED,
-                    data={"status": "REJECTED", "message": "Invalid authentication"},
-                )
-        handler: Callable[[HttpMessage, HttpDialogue], TypedResponse] = getattr(
-            self, handler_func, self._respond_404
+        return self._handlers[request.route.handler](request, **request.params)
+
+    def _admit(self, requests: List[Dict]) -> Optional[TypedResponse]:
+        """Apply the admission control to the given requests. `None` means that they are admitted."""
+        if self.admission is None:
+            return None
+        retry_after = self.admission.admit(
+            addresses=[str(request.get("address", "")) for request in requests],
+            queue_size=self.inbox.queue_size,
+            queue_time=self.inbox.eta(None, "")["p50"],
+            drain_rate=self.inbox.estimator.drain_rate(),
+            now=time.time(),
+        )
+        if retry_after is None:
+            return None
+        if math.isinf(retry_after):
+            return TypedResponse(
+                code=HttpResponseCode.BAD_REQUEST,
+                data={
+                    "status": "REJECTED",
+                    "message": "The requests exceed the size of the queue or the burst of the rate limits.",
+                },
+            )
+        return TypedResponse(
+            code=HttpResponseCode.TOO_MANY_REQUESTS,
+            data={"status": "REJECTED", "message": "The inbox is overloaded."},
+            headers={"Retry-After": str(math.ceil(retry_after))},
         )
-        return handler(message)
 
-    def post_generate(self, message: HttpMessage) -> TypedResponse:
+    def post_generate(self, message: HttpRequest) -> TypedResponse:
         """Handle POST /generate"""
-        self.inbox.put(json.loads(message.body.decode()))
+        request = json.loads(message.body.decode())
+        rejection = self._admit([request])
+        if rejection is not None:
+            return rejection
+        nonce = self.inbox.put(request)
+        # `id` is kept for the existing clients
         return TypedResponse(
             code=HttpResponseCode.OK,
-            data={"status": "CREATED", "id": "0x"},
+            data={"status": "CREATED", "id": nonce, "nonce": nonce},
         )
 
-    def post_restore(self, message: HttpMessage) -> TypedResponse:
+    @staticmethod
+    def _parse_batch(body: str) -> Tuple[List[Dict], List[str]]:
+        """
+        Parse and validate a batch of requests, given either as a JSON array or as NDJSON.
+
+        :param body: the body of the batch request.
+        :return: the parsed requests and the validation errors, if any.
+        """
+        try:
+            requests = json.loads(body)
+        except json.decoder.JSONDecodeError:
+            # not a single JSON document, therefore one request per line
+            try:
+                requests = [
+                    json.loads(line) for line in body.splitlines() if line.strip()
+                ]
+            except json.decoder.JSONDecodeError as e:
+                return [], [f"Invalid JSON: {e}"]
+        if not isinstance(requests, list):
+            requests = [requests]
+
+        errors = []
+        for i, request in enumerate(requests):
+            if not isinstance(request, dict):
+                errors.append(f"Request {i} is not an object.")
+                continue
+            missing = [
+                field for field in REQUIRED_REQUEST_FIELDS if field not in request
+            ]
+            if missing:
+                errors.append(f"Request {i} is missing {', '.join(missing)}.")
+        return requests, errors
+
+    def post_generate_batch(self, message: HttpRequest) -> TypedResponse:
+        """Handle POST /generate/batch"""
+        requests, errors = self._parse_batch(message.body.decode())
+        if errors or not requests:
+            return TypedResponse(
+                code=HttpResponseCode.BAD_REQUEST,
+                data={
+                    "status": "REJECTED",
+                    "errors": errors or ["The batch is empty."],
+                },
+            )
+        rejection = self._admit(requests)
+        if rejection is not None:
+            return rejection
+        # all the requests are validated before any of them is queued, so the batch is all or nothing
+        nonces = self.inbox.put_many(requests)
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data={"status": "CREATED", "nonces": nonces},
+        )
+
+    def post_restore(self, message: HttpRequest) -> TypedResponse:
         """Handle /restore"""
         self.inbox.restore(json.loads(message.body.decode()))
         return TypedResponse(
@@ -162,10 +356,10 @@ class HttpApplication:
             data={"status": "OK", "id": "0x"},
         )
 
-    def get_responses(self, message: HttpMessage) -> TypedResponse:
+    def get_responses(self, message: HttpRequest) -> TypedResponse:
         """Handle GET /responses with optional pagination."""
         # Parse query parameters from the URL
-        query_params = parse_qs(urlparse(message.url).query)
+        query_params = message.query
 
         # Get all responses
         all_responses = self.inbox.get_responses()
@@ -183,8 +377,10 @@ class HttpApplication:
         # Apply sorting if sort_key is provided
         try:
             if sort_key:
+                # responses missing the key (e.g. failed requests without a token id) are kept apart
                 all_responses.sort(
-                    key=lambda x: x.get(sort_key, None), reverse=(sort_order == "desc")
+                    key=lambda x: (x.get(sort_key, None) is not None, x.get(sort_key)),
+                    reverse=(sort_order == "desc"),
                 )
         except Exception as e:
             return TypedResponse(
@@ -228,37 +424,505 @@ class HttpApplication:
                 data={"data": all_responses},
             )
 
-    def get_queue_time(self, message: HttpMessage) -> TypedResponse:
-        """Get queue time"""
-        queue = len(self.inbox._queue) + 1
-        time = queue * REQUEST_TIME
+    def get_queue_time(self, message: HttpRequest) -> TypedResponse:
+        """
+        Handle GET /queue_time
+
+        Estimates the time until a request is processed, either a new one for the `?tool=` given,
+        or the queued one with the given `?nonce=`.
+
+        :param message: the request's message.
+        :return: the estimated p50 and p90 times, in seconds.
+        """
+        query_params = message.query
+        nonce = query_params.get("nonce", [None])[0]
+        tool = query_params.get("tool", [""])[0]
+        eta = self.inbox.eta(nonce, tool)
+        if eta is None:
+            return TypedResponse(
+                code=HttpResponseCode.NOT_FOUND,
+                data={"error": f"Request {nonce} is not queued."},
+            )
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data={"queue_time_in_seconds": eta["p50"], **eta},
+        )
+
+    def get_queue_tools(self, message: HttpRequest) -> TypedResponse:
+        """Handle GET /queue/tools"""
         return TypedResponse(
             code=HttpResponseCode.OK,
-            data={
-                "queue_time_in_seconds": time,
-            },
+            data=self.inbox.tool_stats(),
+        )
+
+    def get_admission_stats(self, message: HttpRequest) -> TypedResponse:
+        """Handle GET /admission/stats"""
+        if self.admission is None:
+            return self._respond_404(message)
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data={"rejected": self.admission.stats},
+        )
+
+    def get_cache_stats(self, message: HttpRequest) -> TypedResponse:
+        """Handle GET /cache/stats"""
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data=self.inbox.cache.stats,
+        )
+
+    def get_http_pool(self, message: HttpRequest) -> TypedResponse:
+        """Handle GET /http/pool"""
+        # the pool is only available when the skill is composed with the mech interaction
+        if self.http_pool is None:
+            return self._respond_404(message)
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data=self.http_pool.stats,
+        )
+
+    def get_request(self, message: HttpRequest, nonce: str) -> TypedResponse:
+        """Handle GET /requests/{nonce}"""
+        record = self.inbox.lifecycle(nonce)
+        if record is None:
+            return self._respond_404(message)
+        return TypedResponse(code=HttpResponseCode.OK, data=record)
+
+    def get_request_trace(self, message: HttpRequest, nonce: str) -> TypedResponse:
+        """Handle GET /requests/{nonce}/trace"""
+        # the tracer is only available when the skill is composed with the rest of the FSM
+        if self.tracer is None:
+            return self._respond_404(message)
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data={"nonce": nonce, "spans": self.tracer.trace(nonce)},
+        )
+
+    def get_traces_breakdown(self, message: HttpRequest) -> TypedResponse:
+        """Handle GET /traces/breakdown"""
+        if self.tracer is None:
+            return self._respond_404(message)
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data=self.tracer.breakdown(),
+        )
+
+    def get_metrics(self, message: HttpRequest) -> TypedResponse:
+        """Handle GET /metrics"""
+        # the metrics are only available when the skill is composed with the rest of the FSM
+        if self.metrics is None:
+            return self._respond_404(message)
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data={},
+            headers=METRICS_MIME_HEADER.copy(),
+            text=self.metrics.render(),
+        )
+
+    def get_benchmarks(self, message: HttpRequest) -> TypedResponse:
+        """
+        Handle GET /benchmarks
+
+        Reports the percentiles of the behaviours' local and consensus times,
+        over the windows overlapping the period between the unix timestamps given as `?since=` and `?until=`,
+        optionally only for the `?behaviour=` given.
+
+        :param message: the request's message.
+        :return: the percentiles, per behaviour and block.
+        """
+        # the histograms are only kept by the benchmark tool of the composed skill
+        if getattr(self.benchmark_tool, "query", None) is None:
+            return self._respond_404(message)
+        query_params = message.query
+        try:
+            since, until = (
+                float(query_params[key][0]) if key in query_params else None
+                for key in ("since", "until")
+            )
+        except ValueError as e:
+            return TypedResponse(
+                code=HttpResponseCode.BAD_REQUEST,
+                data={"status": "ERROR", "message": "Invalid period", "error": str(e)},
+            )
+        behaviour = query_params.get("behaviour", [None])[0]
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data=self.benchmark_tool.query(since, until, behaviour),
+        )
+
+    @property
+    def profile_id(self) -> Optional[str]:
+        """Get the id of the latest profile, from the time it was started."""
+        if self.profiler.started is None:
+            return None
+        return f"{int(self.profiler.started * 1000):x}"
+
+    def post_debug_profile(self, message: HttpRequest) -> TypedResponse:
+        """
+        Handle POST /debug/profile
+
+        Starts profiling the agent's main loop, which runs the behaviours and the handlers, for `?seconds=`.
+        The response is immediate, as the http server times out the responses after a few seconds,
+        and holds the id of the profile, whose samples are got from `GET /debug/profile/{profile_id}` once it is finished.
+
+        :param message: the request's message.
+        :return: the id of the started profile, or an error response.
+        """
+        query_params = message.query
+        try:
+            seconds = float(query_params.get("seconds", ["10"])[0])
+        except ValueError as e:
+            return TypedResponse(
+                code=HttpResponseCode.BAD_REQUEST,
+                data={"status": "ERROR", "message": "Invalid seconds", "error": str(e)},
+            )
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            return TypedResponse(
+                code=HttpResponseCode.BAD_REQUEST,
+                data={
+                    "status": "ERROR",
+                    "message": f"The seconds must be in (0, {MAX_PROFILE_SECONDS}].",
+                },
+            )
+        # the requests are handled by the agent's main loop, which is the profiled thread
+        if not self.profiler.start(seconds, threading.get_ident()):
+            return TypedResponse(
+                code=HttpResponseCode.CONFLICT,
+                data={"status": "REJECTED", "message": "A profile is already running."},
+            )
+        return TypedResponse(
+            code=HttpResponseCode.ACCEPTED,
+            data={"status": "STARTED", "id": self.profile_id, "seconds": seconds},
+        )
+
+    def get_debug_profile(self, message: HttpRequest, profile_id: str) -> TypedResponse:
+        """
+        Handle GET /debug/profile/{profile_id}
+
+        Gets the samples of a finished profile as collapsed stacks or in speedscope's format, as given by `?format=`.
+        Only the latest profile is kept.
+
+        :param message: the request's message.
+        :param profile_id: the id of the profile, as returned when it was started.
+        :return: the samples, or the status of the profile if it is still running.
+        """
+        if profile_id != self.profile_id:
+            return TypedResponse(
+                code=HttpResponseCode.NOT_FOUND,
+                data={"error": f"Profile {profile_id} is not the latest one."},
+            )
+        if self.profiler.running:
+            return TypedResponse(
+                code=HttpResponseCode.ACCEPTED,
+                data={"status": "RUNNING", "id": profile_id},
+            )
+        profile_format = message.query.get("format", [PROFILE_FORMATS[0]])[0]
+        if profile_format not in PROFILE_FORMATS:
+            return TypedResponse(
+                code=HttpResponseCode.BAD_REQUEST,
+                data={
+                    "status": "ERROR",
+                    "message": f"The format must be one of {PROFILE_FORMATS}.",
+                },
+            )
+        return self.profile_result(message)
+
+    def post_debug_memory(self, message: HttpRequest) -> TypedResponse:
+        """
+        Handle POST /debug/memory
+
+        Reports the sizes of the key structures, e.g., the queue, the processed list and the abci db,
+        and the top `?limit=` allocation sites grouped by `?group_by=`, by their growth since the previous call.
+        The allocations are traced from the first call on, until a call with `?stop=true`.
+
+        :param message: the request's message.
+        :return: the census of the structures and the allocation sites.
+        """
+        query_params = message.query
+        group_by = query_params.get("group_by", [GROUP_BY[0]])[0]
+        try:
+            limit = int(query_params.get("limit", ["20"])[0])
+        except ValueError as e:
+            return TypedResponse(
+                code=HttpResponseCode.BAD_REQUEST,
+                data={"status": "ERROR", "message": "Invalid limit", "error": str(e)},
+            )
+        if group_by not in GROUP_BY:
+            return TypedResponse(
+                code=HttpResponseCode.BAD_REQUEST,
+                data={
+                    "status": "ERROR",
+                    "message": f"The grouping must be one of {GROUP_BY}.",
+                },
+            )
+
+        census = self.diagnostics.census(self.inbox.structures())
+        data: Dict[str, Any] = {"census": census}
+        if query_params.get("stop", ["false"])[0].lower() == "true":
+            self.diagnostics.stop()
+        else:
+            data["allocations"] = self.diagnostics.snapshot(limit, group_by)
+        data["tracing"] = self.diagnostics.tracing
+        return TypedResponse(code=HttpResponseCode.OK, data=data)
+
+    def profile_result(self, message: HttpRequest) -> TypedResponse:
+        """Get the latest profile, in the format requested by the given message."""
+        query_params = message.query
+        profile_format = query_params.get("format", [PROFILE_FORMATS[0]])[0]
+        if profile_format == "speedscope":
+            return TypedResponse(
+                code=HttpResponseCode.OK,
+                data=self.profiler.speedscope(f"profile-{self.profiler.started}"),
+            )
+        return TypedResponse(
+            code=HttpResponseCode.OK,
+            data={},
+            headers={"Content-Type": "text/plain"},
+            text=self.profiler.collapsed(),
         )
 
-    def _respond_404(self, message: HttpMessage) -> TypedResponse:
+    def get_request_wait(
+        self, message: HttpRequest, nonce: str
+    ) -> Optional[TypedResponse]:
+        """
+        Handle GET /requests/{nonce}/wait
+
+        Long-polls the lifecycle stage of a request.
+        The response is deferred until the request moves past the stage given as `?stage=`,
+        which defaults to its current one, or until the long-poll times out.
+
+        :param message: the request's message.
+        :param nonce: the nonce of the polled request.
+        :return: the request's lifecycle record, or `None` if the response is deferred.
+        """
+        record = self.inbox.lifecycle(nonce)
+        if record is None:
+            return self._respond_404(message)
+        query_params = message.query
+        since = query_params.get("stage", [record["stage"]])[0]
+        if since != record["stage"] or RequestStage(record["stage"]).is_final:
+            return TypedResponse(code=HttpResponseCode.OK, data=record)
+        return None
+
+    def _respond_404(self, message: HttpRequest) -> TypedResponse:
         """Send an OK response with the provided data"""
         return TypedResponse(
             code=HttpResponseCode.NOT_FOUND,
             data={
-                "error": f"No route implementation found for {message.method.upper()} {urlparse(message.url).path}"
+                "error": f"No route implementation found for {message.method.upper()} {message.path}"
             },
         )
 
 
+class ResultCache:
+    """
+    A content-addressed cache of mech results.
+
+    The results are keyed by the hash of the canonical mech metadata without the nonce,
+    so that identical prompt and tool pairs share an entry.
+    Entries expire after `ttl` seconds and the least recently used ones are evicted
+    once the cache holds more than `max_size` entries.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Initialize object."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    @staticmethod
+    def key(request: Dict) -> str:
+        """Get the cache key of the given request."""
+        metadata = {field: request.get(field, None) for field in CACHE_KEY_FIELDS}
+        canonical = json.dumps(metadata, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, request: Dict) -> Optional[str]:
+        """Get the cached result of the given request, if any."""
+        key = self.key(request)
+        entry = self._entries.get(key, None)
+        if entry is None or time.time() - entry[1] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, request: Dict, result: str) -> None:
+        """Cache the result of the given request."""
+        now = time.time()
+        key = self.key(request)
+        entry = self._entries.get(key, None)
+        # re-caching the same result, e.g., after a hit, does not extend its lifetime
+        timestamp = entry[1] if entry is not None and entry[0] == result else now
+        self._entries[key] = (result, timestamp)
+        self._entries.move_to_end(key)
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Evict the expired entries and the least recently used ones which do not fit."""
+        expired = [
+            key
+            for key, (_, timestamp) in self._entries.items()
+            if now - timestamp > self.ttl
+        ]
+        for key in expired:
+            del self._entries[key]
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def load(self, entries: List[List]) -> None:
+        """Load the serialized entries."""
+        for key, result, timestamp in entries:
+            self._entries[key] = (result, timestamp)
+        self._evict(time.time())
+
+    def serialize(self) -> List[List]:
+        """Serialize the entries, from the least to the most recently used."""
+        return [
+            [key, result, timestamp]
+            for key, (result, timestamp) in self._entries.items()
+        ]
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache's statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Get the nearest-rank percentile of the given samples."""
+    ordered = sorted(samples)
+    rank = max(math.ceil(q * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+class QueueTimeEstimator:
+    """
+    Estimates how long the queued requests will take to be processed.
+
+    The processing times of the requests are measured per tool, from their dequeueing to their response,
+    and summarised by their median and their 90th percentile over a window of the latest ones.
+    The estimate of a queued request adds up the medians of the requests ahead of it, of the one in flight and its own.
+    The spreads between the percentiles and the medians are added up in quadrature on top, for the 90th percentile.
+    """
+
+    def __init__(self, prior: float, window: int = 100) -> None:
+        """Initialize object."""
+        self.prior = prior
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, tool: str, duration: float) -> None:
+        """Record the processing time of a request for the given tool."""
+        samples = self._samples.setdefault(tool, deque(maxlen=self.window))
+        samples.append(duration)
+
+    def _all_samples(self) -> List[float]:
+        """Get the measurements of all the tools."""
+        return [
+            sample for tool_samples in self._samples.values() for sample in tool_samples
+        ]
+
+    def service_time(self, tool: str) -> Tuple[float, float]:
+        """Get the median and the 90th percentile of the processing times of the given tool's requests."""
+        samples = list(self._samples.get(tool, []))
+        if not samples:
+            # tools without measurements fall back to the measurements of all the tools
+            samples = self._all_samples()
+        if not samples:
+            return self.prior, self.prior
+        return percentile(samples, 0.5), percentile(samples, 0.9)
+
+    def eta(
+        self,
+        ahead: Dict[str, float],
+        tool: str,
+        in_flight: Optional[Tuple[str, float]] = None,
+    ) -> Dict[str, float]:
+        """
+        Estimate the time until a request is processed.
+
+        :param ahead: the number of requests ahead of the request, per tool.
+        :param tool: the request's tool.
+        :param in_flight: the tool of the request being processed and the time it has been processing for, if any.
+        :return: the estimated p50 and p90 times, in seconds.
+        """
+        p50, p90 = self.service_time(tool)
+        median, variance = p50, (p90 - p50) ** 2
+        for ahead_tool, count in ahead.items():
+            p50, p90 = self.service_time(ahead_tool)
+            median += count * p50
+            variance += count * (p90 - p50) ** 2
+        if in_flight is not None:
+            in_flight_tool, elapsed = in_flight
+            p50, p90 = self.service_time(in_flight_tool)
+            remaining_p50 = max(p50 - elapsed, 0.0)
+            remaining_p90 = max(p90 - elapsed, 0.0)
+            median += remaining_p50
+            variance += (remaining_p90 - remaining_p50) ** 2
+        return {"p50": median, "p90": median + math.sqrt(variance)}
+
+    def load(self, samples: Dict[str, List[float]]) -> None:
+        """Load the persisted measurements."""
+        for tool, tool_samples in samples.items():
+            for sample in tool_samples:
+                self.record(tool, sample)
+
+    def drain_rate(self) -> float:
+        """Get the number of requests processed per second, based on the median processing time of all the tools."""
+        samples = self._all_samples()
+        p50 = percentile(samples, 0.5) if samples else self.prior
+        return 1 / max(p50, MIN_PROCESSING_TIME)
+
+    def serialize(self) -> Dict[str, List[float]]:
+        """Serialize the measurements, to be persisted."""
+        return {tool: list(samples) for tool, samples in self._samples.items()}
+
+
 class InBox:
     """InBox for requests."""
 
-    _queue: List[Dict]
+    _queue: ToolQueues
     _processed: List[Dict]
 
-    def __init__(self, logger: Logger, db: Optional[str] = None) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        logger: Logger,
+        db: Optional[str] = None,
+        max_retries: int = 0,
+        cache_size: int = 0,
+        cache_ttl: float = 0.0,
+        lifecycle_ttl: float = LIFECYCLE_TTL,
+        address_weights: Optional[Dict[str, float]] = None,
+        tool_batch_sizes: Optional[Dict[str, int]] = None,
+    ) -> None:
         """Initialize object."""
         self.logger = logger
         self._db = db or "/logs/db.json"
+        self.max_retries = max_retries
+        self.lifecycle_ttl = lifecycle_ttl
+        self.address_weights = address_weights or {}
+        self.tool_batch_sizes = tool_batch_sizes or {}
+        self.cache = ResultCache(cache_size, cache_ttl)
+        self.estimator = QueueTimeEstimator(prior=REQUEST_TIME)
+        self._in_flight: Dict[str, Dict] = {}
+        # the times the latest dispatched requests waited in the queue, per tool
+        self._wait_times: Dict[str, Deque[float]] = {}
+        self._processing_started: Optional[float] = None
+        # the lifecycle records, indexed by nonce
+        self._lifecycles: Dict[str, Dict] = {}
+        self._stage_listeners: List[Callable[[Dict], None]] = []
         self._deserialize_state()
 
     def _serialize_state(self, state: Dict[str, Any]) -> None:
@@ -269,7 +933,7 @@ class InBox:
     def _deserialize_state(self) -> None:
         """Deserialize the state from the db."""
         self._processed = []
-        self._queue = []
+        self._queue = ToolQueues(self.address_weights, self.tool_batch_sizes)
         self._processing_req = None
 
         if not os.path.exists(self._db):
@@ -283,11 +947,20 @@ class InBox:
             try:
                 file_json = json.load(file)
                 self._processed = file_json["processed"]
-                # if a request was being processed, add it back to the front of the queue
+                # if a request was being processed, add it back to the queue, where it keeps its place
                 self._processing_req = file_json.get("processing", None)
+                queued = file_json.get("queue", [])
                 if self._processing_req is not None:
-                    self._queue.append(self._processing_req)
-                self._queue = self._queue + file_json.get("queue", [])
+                    queued.insert(0, self._processing_req)
+                self._queue.load(file_json.get("scheduler", {}))
+                self.cache.load(file_json.get("cache", []))
+                self.estimator.load(file_json.get("processing_times", {}))
+                self._lifecycles = file_json.get("lifecycles", {})
+                for request in queued:
+                    self._queue.restore(request)
+                    self._on_enqueued(request)
+                    for nonce in self._nonces_of(request):
+                        self.set_stage(nonce, RequestStage.QUEUED)
             except (json.decoder.JSONDecodeError, KeyError) as e:
                 self.logger.error(
                     f"Error deserializing state: {e}. Starting with empty state."
@@ -295,24 +968,334 @@ class InBox:
 
     def get(self) -> Optional[Dict]:
         """Get request from inbox."""
-        if len(self._queue) == 0:
+        request = self._queue.pop()
+        if request is None:
             return None
-        self._processing_req = self._queue.pop(0)
-        return self._processing_req
+        self._processing_req = request
+        self._processing_started = time.time()
+        self._record_wait(request)
+        if self._processing_req.get("cache", True) is False:
+            return self._processing_req
+
+        result = self.cache.get(self._processing_req)
+        if result is None:
+            return self._processing_req
+        self.logger.info(
+            f"Reusing the cached result for request {self._processing_req['nonce']}."
+        )
+        self.set_stage(self._processing_req["nonce"], RequestStage.DELIVERED)
+        return {**self._processing_req, "result": result}
+
+    def put(self, request: Dict) -> str:
+        """
+        Put request into inbox.
 
-    def put(self, request: Dict) -> None:
-        """Put request into inbox."""
+        A request identical to a queued one, or to the one waiting on the mech, is coalesced into it:
+        it keeps its own nonce, but it is served by that request's mech result.
+        Once the result is available, the later duplicates are queued, to be served by the result cache.
+
+        :param request: the request.
+        :return: the nonce assigned to the request.
+        """
         request["nonce"] = uuid4().hex
-        self._queue.append(request)
+        primary = self._coalescing_target(request)
+        if primary is not None:
+            self.logger.info(
+                f"Coalescing request {request['nonce']} into request {primary['nonce']}."
+            )
+            coalesced = {"nonce": request["nonce"], "address": request.get("address")}
+            primary.setdefault("coalesced", []).append(coalesced)
+            self.set_stage(
+                request["nonce"], RequestStage.QUEUED, tool=request.get("tool")
+            )
+            if primary is not self._processing_req:
+                self._queue.alias(request["nonce"], primary["nonce"])
+                return request["nonce"]
+            # a duplicate of the request waiting on the mech catches up with it
+            primary_stage = self._lifecycles.get(primary["nonce"], {}).get("stage")
+            if primary_stage in (stage.value for stage in SHARED_STAGES):
+                self.set_stage(request["nonce"], RequestStage(primary_stage))
+            return request["nonce"]
+        self._queue.push(request)
+        self._on_enqueued(request)
+        self.set_stage(request["nonce"], RequestStage.QUEUED, tool=request.get("tool"))
+        return request["nonce"]
+
+    def put_many(self, requests: List[Dict]) -> List[str]:
+        """Put a batch of requests into the inbox and persist them with a single write."""
+        nonces = [self.put(request) for request in requests]
+        self._persist()
+        return nonces
+
+    def _on_enqueued(self, request: Dict) -> None:
+        """Track a request which has been queued."""
+        self._track_in_flight(request)
+        for coalesced in request.get("coalesced", []):
+            self._queue.alias(coalesced["nonce"], request["nonce"])
+
+    def _record_wait(self, request: Dict) -> None:
+        """Record the time a dispatched request waited in the queue, since it was last queued."""
+        record = self._lifecycles.get(request["nonce"], {})
+        queued_at = record.get("timestamps", {}).get(RequestStage.QUEUED.value, None)
+        if queued_at is None:
+            return
+        tool = request.get("tool", "")
+        wait_times = self._wait_times.setdefault(
+            tool, deque(maxlen=self.estimator.window)
+        )
+        wait_times.append(time.time() - queued_at)
+
+    @staticmethod
+    def _nonces_of(request: Dict) -> List[str]:
+        """Get the nonces of a request and of the duplicates coalesced into it."""
+        return [request["nonce"]] + [
+            coalesced["nonce"] for coalesced in request.get("coalesced", [])
+        ]
+
+    def requests_of(self, nonce: str) -> Dict[str, str]:
+        """
+        Get the addresses of the request being processed and of the duplicates coalesced into it, by nonce.
+
+        These include the duplicates which have been coalesced into it while it was waiting on the mech,
+        which the period's requests, agreed on when it was dequeued, do not.
+
+        :param nonce: the nonce of the request being processed.
+        :return: the addresses by nonce, or an empty dict if the request is not being processed.
+        """
+        request = self._processing_req
+        if request is None or request.get("nonce") != nonce:
+            return {}
+        requests = {request["nonce"]: request.get("address")}
+        for coalesced in request.get("coalesced", []):
+            requests[coalesced["nonce"]] = coalesced.get("address")
+        return requests
+
+    @property
+    def queue_size(self) -> int:
+        """Get the number of the queued requests."""
+        return len(self._queue)
+
+    def queue_position(self, nonce: str) -> Optional[int]:
+        """Get the position of the request with the given nonce in the queue, or `None` if it is not queued."""
+        return self._queue.position(nonce)
+
+    def lifecycle(self, nonce: str) -> Optional[Dict]:
+        """
+        Get the lifecycle record of the request with the given nonce, if known.
+
+        The record holds the request's current stage, the time it reached each stage,
+        its queue position while it is queued and the details recorded along the way,
+        e.g., the tx hashes, the token id or the error.
+        The record of a request which has reached a final stage is kept for `lifecycle_ttl` seconds.
+
+        :param nonce: the nonce of the request.
+        :return: the lifecycle record.
+        """
+        record = self._lifecycles.get(nonce, None)
+        if record is None:
+            return None
+        return {
+            **record,
+            "queue_position": self.queue_position(nonce),
+            "eta": self.eta(nonce, record.get("tool", "")),
+        }
+
+    def eta(self, nonce: Optional[str], tool: str) -> Optional[Dict[str, float]]:
+        """
+        Estimate the time until a request is processed.
+
+        :param nonce: the nonce of a queued request, or `None` for a new request.
+        :param tool: the request's tool.
+        :return: the estimated p50 and p90 times, in seconds, or `None` if the given request is not queued.
+        """
+        ahead = self._queue.ahead(nonce, tool)
+        if ahead is None:
+            return None
+        in_flight = None
+        if self._processing_req is not None and self._processing_started is not None:
+            elapsed = time.time() - self._processing_started
+            in_flight = (self._processing_req.get("tool", ""), elapsed)
+        return self.estimator.eta(ahead, tool, in_flight)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Get the number of the queued requests, per tool, including the tools which have been drained."""
+        tools = set(self._queue.tools) | set(self._wait_times)
+        return {tool: self._queue.depth(tool) for tool in sorted(tools)}
+
+    def tool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the state of each tool's sub-queue.
+
+        The stats hold the number of the queued requests, the tool's batch size,
+        the median and 90th percentile of the times the latest dispatched requests waited in the queue,
+        and the estimated time until a new request for the tool is processed.
+
+        :return: the stats, per tool.
+        """
+        stats = {}
+        for tool, depth in self.queue_depths().items():
+            wait_times = list(self._wait_times.get(tool, []))
+            waited = None
+            if wait_times:
+                waited = {
+                    "p50": percentile(wait_times, 0.5),
+                    "p90": percentile(wait_times, 0.9),
+                }
+            stats[tool] = {
+                "queued": depth,
+                "batch_size": self._queue.batch_size(tool),
+                "wait_time": waited,
+                "eta": self.eta(None, tool),
+            }
+        return stats
+
+    def subscribe(self, listener: Callable[[Dict], None]) -> None:
+        """Subscribe a listener to the stage transitions of the requests."""
+        self._stage_listeners.append(listener)
+
+    def set_stage(self, nonce: str, stage: RequestStage, **details: Any) -> None:
+        """
+        Move a request to the given stage of its lifecycle and notify the listeners.
+
+        The stages only move forward, except for re-queueing a failed request for a retry.
+        Stages reached through the mech's result are applied to the coalesced duplicates too.
+
+        :param nonce: the nonce of the request.
+        :param stage: the stage.
+        :param details: details to record, e.g., the token id.
+        """
+        nonces = [nonce]
+        request = self._processing_req
+        if stage in SHARED_STAGES and request is not None and request["nonce"] == nonce:
+            nonces = self._nonces_of(request)
+
+        for stage_nonce in nonces:
+            record = self._lifecycles.setdefault(
+                stage_nonce, {"nonce": stage_nonce, "stage": None, "timestamps": {}}
+            )
+            current = record["stage"]
+            if current == stage.value:
+                continue
+            is_regression = current is not None and STAGES_ORDER.index(
+                RequestStage(current)
+            ) > STAGES_ORDER.index(stage)
+            if is_regression and stage != RequestStage.QUEUED:
+                continue
+            record["stage"] = stage.value
+            record["timestamps"][stage.value] = time.time()
+            record.update(details)
+            for listener in self._stage_listeners:
+                listener(record)
+
+    def _coalescing_target(self, request: Dict) -> Optional[Dict]:
+        """Get the queued or the processing request which the given request can be coalesced into, if any."""
+        if request.get("cache", True) is False:
+            return None
+        return self._in_flight.get(ResultCache.key(request), None)
+
+    def _track_in_flight(self, request: Dict) -> None:
+        """Track a queued request, so that later duplicates can be coalesced into it until its result is available."""
+        if request.get("cache", True) is False:
+            return
+        self._in_flight.setdefault(ResultCache.key(request), request)
+
+    def _untrack_in_flight(self, request: Dict) -> None:
+        """Stop coalescing duplicates into the given request."""
+        key = ResultCache.key(request)
+        if self._in_flight.get(key, None) is request:
+            del self._in_flight[key]
 
     def add_response(self, response: Dict) -> None:
         """Add response to processed list."""
         self._processed.append(response)
+        # the coalesced duplicates' responses are added after the request's own one, which is measured
+        if self._processing_req is not None and self._processing_started is not None:
+            duration = time.time() - self._processing_started
+            self.estimator.record(self._processing_req.get("tool", ""), duration)
+        if self._processing_req is not None:
+            self._untrack_in_flight(self._processing_req)
         self._processing_req = None
+        self._processing_started = None
+        self._persist()
+
+    def cache_result(self, nonce: str, result: str) -> None:
+        """Cache the mech's result for the request being processed, unless it has opted out."""
+        request = self._processing_req
+        if request is None or request.get("nonce") != nonce:
+            return
+        if request.get("cache", True) is False:
+            return
+        # the duplicates arriving from now on are served by the cache, as the mint of this one is being prepared
+        self._untrack_in_flight(request)
+        self.cache.put(request, result)
+        self._persist()
+
+    def fail(self, nonce: str, error: str) -> None:
+        """
+        Handle a request which could not be processed.
+
+        The request is re-queued at the back of its address's flow if it has retries left,
+        otherwise the error is added to the processed list.
+        Calling this more than once for the same request has no effect.
+
+        :param nonce: the nonce of the failed request.
+        :param error: the reason of the failure.
+        """
+        request = self._processing_req
+        if request is None or request.get("nonce") != nonce:
+            return
+
+        self._untrack_in_flight(request)
+        retries = request.get("retries", 0)
+        if retries < self.max_retries:
+            self.logger.warning(
+                f"Request {nonce} failed: {error}. Re-queueing it ({retries + 1}/{self.max_retries})."
+            )
+            request["retries"] = retries + 1
+            self._queue.push(request)
+            self._on_enqueued(request)
+            self._processing_req = None
+            self._processing_started = None
+            for queued_nonce in self._nonces_of(request):
+                self.set_stage(queued_nonce, RequestStage.QUEUED)
+            self._persist()
+            return
+
+        self.logger.error(f"Request {nonce} failed: {error}. Giving up.")
+        for failed_nonce in self._nonces_of(request):
+            self.set_stage(failed_nonce, RequestStage.FAILED, error=error)
+            self.add_response(
+                {
+                    "nonce": failed_nonce,
+                    "prompt": request.get("prompt"),
+                    "tool": request.get("tool"),
+                    "error": error,
+                }
+            )
+
+    def _prune_lifecycles(self, now: float) -> None:
+        """Drop the lifecycle records of the requests which reached a final stage more than `lifecycle_ttl` seconds ago."""
+        expired = [
+            nonce
+            for nonce, record in self._lifecycles.items()
+            if RequestStage(record["stage"]).is_final
+            and now - record["timestamps"][record["stage"]] > self.lifecycle_ttl
+        ]
+        for nonce in expired:
+            del self._lifecycles[nonce]
+
+    def _persist(self) -> None:
+        """Persist the current state to the db."""
+        # the records are pruned before they are written, so the db does not grow with every request ever served
+        self._prune_lifecycles(time.time())
         state = {
-            "queue": self._queue,
+            "queue": self._queue.requests(),
+            "scheduler": self._queue.serialize(),
             "processed": self._processed,
             "processing": self._processing_req,
+            "cache": self.cache.serialize(),
+            "lifecycles": self._lifecycles,
+            "processing_times": self.estimator.serialize(),
         }
         self._serialize_state(state)
 
@@ -320,6 +1303,16 @@ class InBox:
         """Return the available responses."""
         return self._processed
 
+    def structures(self) -> Dict[str, Any]:
+        """Get the inbox's structures which grow with the number of the requests, for the memory diagnostics."""
+        return {
+            "queue": self._queue.requests(),
+            "processed": self._processed,
+            "lifecycles": self._lifecycles,
+            "in_flight": self._in_flight,
+            "result_cache": self.cache.serialize(),
+        }
+
     def restore(self, processed: List) -> None:
         """Restore responses"""
         self._processed = processed
@@ -329,6 +1322,11 @@ class InBox:
         """Get the next response id"""
         return len(self._processed) + 1
 
+    @property
+    def db_size(self) -> int:
+        """Get the size of the db file, in bytes."""
+        return os.path.getsize(self._db) if os.path.exists(self._db) else 0
+
 
 class HttpHandler(BaseHttpHandler):
     """This implements the echo handler."""
@@ -340,11 +1338,45 @@ class HttpHandler(BaseHttpHandler):
     def setup(self) -> None:
         """Setup class."""
         super().setup()
-        self.context.state.inbox = InBox(logger=self.context.logger)
+        self.context.state.inbox = InBox(
+            logger=self.context.logger,
+            max_retries=self.context.params.inbox_max_retries,
+            cache_size=self.context.params.result_cache_size,
+            cache_ttl=self.context.params.result_cache_ttl,
+            lifecycle_ttl=self.context.params.lifecycle_ttl,
+            address_weights=self.context.params.inbox_address_weights,
+            tool_batch_sizes=self.context.params.inbox_tool_batch_sizes,
+        )
         self.app = HttpApplication(
             inbox=self.context.state.inbox,
             auth=self.context.params.inbox_auth,
+            http_pool=getattr(self.context, "http_pool", None),
+            admission=AdmissionController(
+                max_queue_size=self.context.params.inbox_max_queue_size,
+                queue_time_target=self.context.params.inbox_queue_time_target,
+                address_rate=self.context.params.inbox_address_rate,
+                address_burst=self.context.params.inbox_address_burst,
+                global_rate=self.context.params.inbox_global_rate,
+                global_burst=self.context.params.inbox_global_burst,
+            ),
+            tracer=getattr(self.context, "tracer", None),
+            metrics=getattr(self.context, "metrics", None),
+            benchmark_tool=getattr(self.context, "benchmark_tool", None),
         )
+        # the deferred long-poll requests, per nonce, with their deadlines
+        self._waiting: Dict[str, List[Tuple[HttpMessage, HttpDialogue, float]]] = {}
+        self.access_log = AccessLog(
+            self.context.params.access_log_path,
+            sample_rate=self.context.params.access_log_sample_rate,
+            slow_threshold=self.context.params.access_log_slow_threshold,
+        )
+        # the route and the arrival time of the requests which have not been responded to, per message id
+        self._received: Dict[int, Tuple[str, float]] = {}
+        self.context.state.inbox.subscribe(self._on_stage)
+        self.app.diagnostics.add_structure("abci_db", self._abci_db_entries)
+        if self.app.metrics is not None:
+            self.app.metrics.add_collector(self._collect_metrics)
+            self.context.state.inbox.subscribe(self._observe_stage)
 
     @property
     def synchronized_data(self) -> SynchronizedData:
@@ -353,6 +1385,18 @@ class HttpHandler(BaseHttpHandler):
             db=self.context.state.round_sequence.latest_synchronized_data.db
         )
 
+    def _abci_db_entries(self) -> List[Any]:
+        """Get the values stored in the abci app's db, across all the periods and the keys' histories."""
+        db = self.synchronized_data.db
+        # the db does not expose the histories of all the periods
+        data = db._data  # pylint: disable=protected-access
+        return [
+            value
+            for period in data.values()
+            for history in period.values()
+            for value in history
+        ]
+
     @staticmethod
     def response_headers(extra: Optional[Dict[str, str]] = None) -> str:
         """Generate response headers string"""
@@ -392,7 +1436,12 @@ class HttpHandler(BaseHttpHandler):
             return
 
         # Handle message
-        self.context.logger.info(
+        start = time.perf_counter()
+        request = HttpRequest(message)
+        self.app.resolve(request)
+        route = UNMATCHED_ROUTE if request.route is None else request.route.template
+        self._received[id(message)] = (route, start)
+        self.context.logger.debug(
             "Received http request with method={}, url={} and body={!r}".format(
                 message.method,
                 message.url,
@@ -400,13 +1449,88 @@ class HttpHandler(BaseHttpHandler):
             )
         )
 
-        response = self.app.handle(message=message)
+        response = self.app.dispatch(request)
+        if response is None:
+            self._defer(request, dialogue)
+            return
+        self._respond(message, dialogue, response)
+
+    def _defer(self, request: HttpRequest, dialogue: HttpDialogue) -> None:
+        """Defer the response to a long-poll request until its request changes stage or it times out."""
+        nonce = request.params["nonce"]
+        deadline = time.time() + self.context.params.long_poll_timeout
+        self._waiting.setdefault(nonce, []).append(
+            (request.message, dialogue, deadline)
+        )
+
+    def _on_stage(self, record: Dict) -> None:
+        """Respond to the long-poll requests waiting for the given request to change stage."""
+        waiting = self._waiting.pop(record["nonce"], [])
+        if not waiting:
+            return
+        lifecycle = self.context.state.inbox.lifecycle(record["nonce"])
+        for message, dialogue, _ in waiting:
+            self._respond(
+                message,
+                dialogue,
+                TypedResponse(code=HttpResponseCode.OK, data=lifecycle),
+            )
+
+    def _collect_metrics(self) -> None:
+        """Update the inbox's metrics which are read on demand."""
+        inbox = self.context.state.inbox
+        metrics = self.app.metrics
+        for tool, depth in inbox.queue_depths().items():
+            metrics.queue_depth.labels(tool).set(depth)
+        metrics.processed.labels().set(len(inbox.get_responses()))
+        metrics.db_size.labels().set(inbox.db_size)
+
+    def _observe_stage(self, record: Dict) -> None:
+        """Observe the time the given request spent in the stage it has just left."""
+        timestamps = record["timestamps"]
+        entered = timestamps[record["stage"]]
+        # the stage it has left is the latest one it entered, as a retry may have re-queued it
+        previous = [
+            (timestamp, stage)
+            for stage, timestamp in timestamps.items()
+            if stage != record["stage"]
+        ]
+        if not previous:
+            return
+        left, stage = max(previous)
+        self.app.metrics.stage_latency.labels(stage).observe(entered - left)
+
+    def expire_waiting(self, now: float) -> None:
+        """Respond with the current stage to the long-poll requests which have timed out."""
+        for nonce, waiting in list(self._waiting.items()):
+            expired = [wait for wait in waiting if wait[2] <= now]
+            if not expired:
+                continue
+            self._waiting[nonce] = [wait for wait in waiting if wait[2] > now]
+            if not self._waiting[nonce]:
+                del self._waiting[nonce]
+            record = self.context.state.inbox.lifecycle(nonce)
+            for message, dialogue, _ in expired:
+                self._respond(
+                    message,
+                    dialogue,
+                    TypedResponse(code=HttpResponseCode.OK, data=record),
+                )
+
+    def _respond(
+        self, message: HttpMessage, dialogue: HttpDialogue, response: TypedResponse
+    ) -> None:
+        """Reply to the given request."""
         body = b""
         extra = {}
         data = response.get("data", {})
-        if len(data) > 0:
+        text = response.get("text", None)
+        if text is not None:
+            body = text.encode("utf-8")
+        elif len(data) > 0:
             body = json.dumps(data).encode("utf-8")
             extra = JSON_MIME_HEADER.copy()
+        extra.update(response.get("headers", {}))
         headers = self.response_headers(extra=extra)
         status = response["code"]
         http_response = dialogue.reply(
@@ -420,5 +1544,21 @@ class HttpHandler(BaseHttpHandler):
         )
 
         # Send response
-        self.context.logger.info("Responding with: {}".format(http_response))
+        self.context.logger.debug("Responding with: {}".format(http_response))
         self.context.outbox.put_message(message=http_response)
+        received = self._received.pop(id(message), None)
+        if received is not None:
+            route, start = received
+            self.access_log.record(
+                message.method,
+                route,
+                status.value,
+                time.perf_counter() - start,
+                len(message.body),
+                len(body),
+            )
+
+    def teardown(self) -> None:
+        """Teardown the handler."""
+        self.access_log.stop()
+        super().teardown()
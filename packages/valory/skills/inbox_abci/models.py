@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -19,7 +19,7 @@
 
 """This module contains the shared state for the abci skill of InboxAbciApp."""
 
-from typing import Any
+from typing import Any, Dict
 
 from packages.valory.skills.abstract_round_abci.models import BaseParams
 from packages.valory.skills.abstract_round_abci.models import (
@@ -42,10 +42,70 @@ class Params(BaseParams):
     """Parameters."""
 
     inbox_auth: str
+    inbox_max_retries: int
+    result_cache_size: int
+    result_cache_ttl: float
+    long_poll_timeout: float
+    lifecycle_ttl: float
+    inbox_max_queue_size: int
+    inbox_queue_time_target: float
+    inbox_address_rate: float
+    inbox_address_burst: int
+    inbox_global_rate: float
+    inbox_global_burst: int
+    inbox_address_weights: Dict[str, float]
+    inbox_tool_batch_sizes: Dict[str, int]
+    access_log_path: str
+    access_log_sample_rate: float
+    access_log_slow_threshold: float
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Initialize parameters."""
         self.inbox_auth = self._ensure("inbox_auth", kwargs=kwargs, type_=str)
+        self.inbox_max_retries = self._ensure(
+            "inbox_max_retries", kwargs=kwargs, type_=int
+        )
+        self.result_cache_size = self._ensure(
+            "result_cache_size", kwargs=kwargs, type_=int
+        )
+        self.result_cache_ttl = self._ensure(
+            "result_cache_ttl", kwargs=kwargs, type_=float
+        )
+        self.long_poll_timeout = self._ensure(
+            "long_poll_timeout", kwargs=kwargs, type_=float
+        )
+        self.lifecycle_ttl = self._ensure("lifecycle_ttl", kwargs=kwargs, type_=float)
+        self.inbox_max_queue_size = self._ensure(
+            "inbox_max_queue_size", kwargs=kwargs, type_=int
+        )
+        self.inbox_queue_time_target = self._ensure(
+            "inbox_queue_time_target", kwargs=kwargs, type_=float
+        )
+        self.inbox_address_rate = self._ensure(
+            "inbox_address_rate", kwargs=kwargs, type_=float
+        )
+        self.inbox_address_burst = self._ensure(
+            "inbox_address_burst", kwargs=kwargs, type_=int
+        )
+        self.inbox_global_rate = self._ensure(
+            "inbox_global_rate", kwargs=kwargs, type_=float
+        )
+        self.inbox_global_burst = self._ensure(
+            "inbox_global_burst", kwargs=kwargs, type_=int
+        )
+        self.inbox_address_weights = self._ensure(
+            "inbox_address_weights", kwargs=kwargs, type_=Dict[str, float]
+        )
+        self.inbox_tool_batch_sizes = self._ensure(
+            "inbox_tool_batch_sizes", kwargs=kwargs, type_=Dict[str, int]
+        )
+        self.access_log_path = self._ensure("access_log_path", kwargs=kwargs, type_=str)
+        self.access_log_sample_rate = self._ensure(
+            "access_log_sample_rate", kwargs=kwargs, type_=float
+        )
+        self.access_log_slow_threshold = self._ensure(
+            "access_log_slow_threshold", kwargs=kwargs, type_=float
+        )
         super().__init__(*args, **kwargs)
 
 
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the sampling profiler of the agent's main loop."""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional
+
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+# the part of the paths of the repository's packages which is kept in the frames' names
+PACKAGES_DIR = f"{os.sep}packages{os.sep}"
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of a thread, e.g., the agent's main loop, at a fixed interval, from a background thread.
+
+    The behaviours are generators resumed by the main loop, so their frames are sampled as part of its stack.
+    The sampled thread is not instrumented and nothing runs while no profile is running,
+    so the profiler has no overhead when inactive. While active, every sample only walks the thread's frames.
+    The samples are aggregated per stack of functions.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """Initialize object."""
+        self.interval = interval
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self._stacks: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Whether a profile is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def samples(self) -> int:
+        """Get the number of the samples of the latest profile."""
+        return sum(self._stacks.values())
+
+    def start(self, seconds: float, thread_id: Optional[int] = None) -> bool:
+        """
+        Start profiling a thread in the background, discarding the previous profile.
+
+        :param seconds: the duration of the profile.
+        :param thread_id: the id of the profiled thread, defaults to the calling one.
+        :return: whether the profile has been started, i.e., unless one is already running.
+        """
+        if self.running:
+            return False
+        target = threading.get_ident() if thread_id is None else thread_id
+        self._stacks = Counter()
+        self._stop.clear()
+        self.started = time.time()
+        self.ended = None
+        self._thread = threading.Thread(
+            target=self._sample,
+            args=(target, time.monotonic() + seconds),
+            name="sampling-profiler",
+            daemon=True,
+        )
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop the running profile, if any."""
+        self._stop.set()
+
+    def _sample(self, thread_id: int, deadline: float) -> None:
+        """Sample the stack of the given thread until the deadline."""
+        while time.monotonic() < deadline and not self._stop.is_set():
+            frames = sys._current_frames()  # pylint: disable=protected-access
+            frame: Optional[FrameType] = frames.get(thread_id, None)
+            del frames
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            # from the root to the leaf
+            self._stacks[tuple(reversed(stack))] += 1
+            self._stop.wait(self.interval)
+        self.ended = time.time()
+
+    @staticmethod
+    def _frame(code: CodeType) -> Dict[str, Any]:
+        """Get a function's frame, with its path relative to the repository's packages, if it is one of theirs."""
+        path = code.co_filename
+        index = path.rfind(PACKAGES_DIR)
+        if index >= 0:
+            path = path[index + 1 :]
+        return {
+            "name": f"{code.co_name} ({path}:{code.co_firstlineno})",
+            "file": path,
+            "line": code.co_firstlineno,
+        }
+
+    def collapsed(self) -> str:
+        """Get the latest profile as collapsed stacks, i.e., a line per stack with its number of samples."""
+        names: Dict[CodeType, str] = {}
+        lines = []
+        for stack, count in self._stacks.items():
+            for code in stack:
+                if code not in names:
+                    names[code] = self._frame(code)["name"]
+            lines.append(f"{';'.join(names[code] for code in stack)} {count}")
+        return "\n".join(sorted(lines)) + "\n"
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """Get the latest profile in speedscope's file format, with the samples weighted in seconds."""
+        indices: Dict[CodeType, int] = {}
+        frames: List[Dict[str, Any]] = []
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self._stacks.items():
+            for code in stack:
+                if code not in indices:
+                    indices[code] = len(frames)
+                    frames.append(self._frame(code))
+            samples.append([indices[code] for code in stack])
+            weights.append(count * self.interval)
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -38,6 +38,8 @@ from packages.valory.skills.inbox_abci.payloads import InboxPayload
 
 
 MAX_TOKEN_EVENT_RETRIES = 3
+# the fields of a request which make up the mech metadata
+MECH_REQUEST_FIELDS = ("prompt", "tool", "nonce")
 
 
 class Event(Enum):
@@ -47,6 +49,7 @@ class Event(Enum):
     DONE = "done"
     ROUND_TIMEOUT = "round_timeout"
     NO_REQUEST = "no_request"
+    CACHE_HIT = "cache_hit"
 
 
 class SynchronizedData(BaseSynchronizedData):
@@ -68,6 +71,13 @@ class SynchronizedData(BaseSynchronizedData):
         """Get the mech requests."""
         return self.db.get("requests", {})
 
+    @property
+    def mech_responses(self) -> List:
+        """Get the mech responses."""
+        serialized = self.db.get("mech_responses", "[]")
+        # TOFIX: Match this with SynchronizedData.mech_responses in mech_interact_abci
+        return json.loads(serialized)
+
 
 class WaitRound(CollectSameUntilThresholdRound):
     """Wait for request."""
@@ -84,18 +94,37 @@ class WaitRound(CollectSameUntilThresholdRound):
             )
             # If no requeest - WaitRound.no_request # noqa: E800
             # Else - {"address": "...", "prompt": "...", "tool": "...", "nonce": ...} # noqa: E800
+            # A cached result may also be included - {..., "result": "..."} # noqa: E800
+            # Coalesced duplicates too - {..., "coalesced": [{"nonce": "...", "address": "..."}]} # noqa: E800
             if payload == WaitRound.no_request:
                 return self.synchronized_data, Event.NO_REQUEST
 
             address = payload.pop("address")
+            # drop the fields which are not part of the mech metadata, e.g., `cache`
+            mech_request = {field: payload.get(field) for field in MECH_REQUEST_FIELDS}
+            nonce = mech_request["nonce"]
+            # every requester gets a mint from the single mech result
+            requests = {nonce: address}
+            for coalesced in payload.get("coalesced", []):
+                requests[coalesced["nonce"]] = coalesced["address"]
+            updates = {
+                get_name(SynchronizedData.mech_requests): json.dumps([mech_request]),
+                get_name(SynchronizedData.requests): requests,
+            }
+            event = Event.DONE
+            result = payload.get("result", None)
+            if result is not None:
+                mech_response = {"nonce": nonce, "result": result}
+                updates[get_name(SynchronizedData.mech_responses)] = json.dumps(
+                    [mech_response]
+                )
+                event = Event.CACHE_HIT
+
             synchronized_data = self.synchronized_data.update(
                 synchronized_data_class=SynchronizedData,
-                **{
-                    get_name(SynchronizedData.mech_requests): json.dumps([payload]),
-                    get_name(SynchronizedData.requests): {payload["nonce"]: address},
-                }
+                **updates,
             )
-            return (synchronized_data, Event.DONE)
+            return (synchronized_data, event)
         if not self.is_majority_possible(
             self.collection, self.synchronized_data.nb_participants
         ):
@@ -107,6 +136,10 @@ class FinishedInboxWaitingRound(DegenerateRound, ABC):
     """FinishedTokenTrackRound"""
 
 
+class FinishedInboxCachedRound(DegenerateRound, ABC):
+    """FinishedInboxCachedRound"""
+
+
 class InboxAbciApp(AbciApp[Event]):
     """InboxAbciApp"""
 
@@ -115,14 +148,17 @@ class InboxAbciApp(AbciApp[Event]):
     transition_function: AbciAppTransitionFunction = {
         WaitRound: {
             Event.DONE: FinishedInboxWaitingRound,
+            Event.CACHE_HIT: FinishedInboxCachedRound,
             Event.NO_REQUEST: WaitRound,
             Event.NO_MAJORITY: WaitRound,
             Event.ROUND_TIMEOUT: WaitRound,
         },
         FinishedInboxWaitingRound: {},
+        FinishedInboxCachedRound: {},
     }
     final_states: Set[AppState] = {
         FinishedInboxWaitingRound,
+        FinishedInboxCachedRound,
     }
     event_to_timeout: EventToTimeout = {
         Event.ROUND_TIMEOUT: 30.0,
@@ -132,5 +168,6 @@ class InboxAbciApp(AbciApp[Event]):
     }
     db_post_conditions: Dict[AppState, Set[str]] = {
         FinishedInboxWaitingRound: set(),
+        FinishedInboxCachedRound: {get_name(SynchronizedData.mech_responses)},
     }
     cross_period_persisted_keys: FrozenSet[str] = frozenset([])
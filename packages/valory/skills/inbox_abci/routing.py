@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the routing of the inbox's http api."""
+
+import re
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+from urllib.parse import parse_qs, urlsplit
+
+
+# a path parameter, e.g., `{nonce}`
+PARAMETER = re.compile(r"{(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)}")
+DEFAULT_PARAMETER_PATTERN = "[^/]+"
+
+
+class Route(NamedTuple):
+    """A route of the http api, given by its method and its path's template, and the name of its handler."""
+
+    method: str
+    template: str
+    handler: str
+
+
+def compile_template(
+    template: str, patterns: Optional[Dict[str, str]] = None
+) -> Pattern:
+    """
+    Compile the template of a path into a pattern matching the whole path, with a named group per parameter.
+
+    :param template: the path's template, e.g., `/requests/{nonce}`.
+    :param patterns: the patterns of the parameters, per name. A parameter matches a path segment by default.
+    :return: the compiled pattern.
+    """
+    literals = PARAMETER.sub("", template)
+    if "{" in literals or "}" in literals:
+        raise ValueError(f"Invalid path parameter in {template!r}.")
+    patterns = patterns or {}
+    pattern, end = "", 0
+    for match in PARAMETER.finditer(template):
+        name = match.group("name")
+        pattern += re.escape(template[end : match.start()])
+        pattern += f"(?P<{name}>{patterns.get(name, DEFAULT_PARAMETER_PATTERN)})"
+        end = match.end()
+    pattern += re.escape(template[end:])
+    return re.compile(pattern)
+
+
+class RouteTable:
+    """
+    The routes of the http api, compiled once.
+
+    The routes without parameters are looked up by their method and path,
+    the rest are matched against the compiled templates of their method, in the order they are given.
+    """
+
+    def __init__(
+        self, routes: Iterable[Route], patterns: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Initialize object.
+
+        :param routes: the routes.
+        :param patterns: the patterns of the path parameters, per name.
+        """
+        self._static: Dict[Tuple[str, str], Route] = {}
+        self._parametrized: Dict[str, List[Tuple[Pattern, Route]]] = {}
+        for route in routes:
+            pattern = compile_template(route.template, patterns)
+            if pattern.groups == 0:
+                self._static[(route.method, route.template)] = route
+                continue
+            self._parametrized.setdefault(route.method, []).append((pattern, route))
+
+    def __iter__(self) -> Iterator[Route]:
+        """Iterate over the routes."""
+        yield from self._static.values()
+        for routes in self._parametrized.values():
+            for _, route in routes:
+                yield route
+
+    def resolve(self, method: str, path: str) -> Tuple[Optional[Route], Dict[str, str]]:
+        """Get the route of the given method and path, if any, and the parameters in its path."""
+        route = self._static.get((method, path), None)
+        if route is not None:
+            return route, {}
+        for pattern, route in self._parametrized.get(method, ()):
+            match = pattern.fullmatch(path)
+            if match is not None:
+                return route, match.groupdict()
+        return None, {}
+
+
+class HttpRequest:
+    """
+    An http request message, whose url is split once, on arrival.
+
+    The query and the headers are only parsed if a handler reads them.
+    The route and its path parameters are set once the request is resolved.
+    """
+
+    __slots__ = (
+        "message",
+        "method",
+        "path",
+        "route",
+        "params",
+        "_query_string",
+        "_query",
+        "_headers",
+    )
+
+    def __init__(self, message: Any) -> None:
+        """Initialize object."""
+        self.message = message
+        self.method: str = message.method
+        url = urlsplit(message.url)
+        self.path: str = url.path
+        self._query_string = url.query
+        self._query: Optional[Dict[str, List[str]]] = None
+        self._headers: Optional[Dict[str, str]] = None
+        self.route: Optional[Route] = None
+        self.params: Dict[str, str] = {}
+
+    @property
+    def url(self) -> str:
+        """Get the request's url."""
+        return self.message.url
+
+    @property
+    def body(self) -> bytes:
+        """Get the request's body."""
+        return self.message.body
+
+    @property
+    def query(self) -> Dict[str, List[str]]:
+        """Get the request's query parameters, with their values in the order they are given."""
+        if self._query is None:
+            self._query = parse_qs(self._query_string)
+        return self._query
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Get the request's headers. The lines which are not headers are skipped."""
+        if self._headers is None:
+            self._headers = {}
+            for line in self.message.headers.splitlines():
+                key, separator, value = line.partition(": ")
+                if separator:
+                    self._headers[key] = value
+        return self._headers
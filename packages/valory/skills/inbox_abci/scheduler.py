@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the fair scheduling of the requests queued in the inbox."""
+
+import heapq
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, cast
+
+
+TAG_KEY = "start_tag"
+DEFAULT_WEIGHT = 1.0
+
+Key = Tuple[float, int]
+
+
+class FairQueue:
+    """
+    A queue which shares the processing of the requests fairly among the addresses that submitted them.
+
+    Every address has its own FIFO flow. The requests are tagged with a virtual start time on arrival,
+    which is the later of the queue's virtual time and the finish time of the previous request of the same flow,
+    and each request advances its flow's finish time by the inverse of the address's weight.
+    The request with the earliest tag is served first, so the flows are served in a weighted round-robin,
+    as with deficit round-robin, and an address which submits many requests only delays the others by one request per round.
+    The next request is selected among the heads of the active flows in O(log k), for k active addresses,
+    and the position of any request is found in O(log n), for n queued requests.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None) -> None:
+        """Initialize object."""
+        self.weights = weights or {}
+        self.virtual_time = 0.0
+        self._finish_tags: Dict[str, float] = {}
+        self._flows: Dict[str, Deque[Dict]] = {}
+        # the heads of the active flows
+        self._heads: List[Tuple[float, int, str]] = []
+        # the keys of all the queued requests, in service order
+        self._order: List[Key] = []
+        self._keys: Dict[str, Key] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        """Get the number of the queued requests."""
+        return len(self._order)
+
+    def _weight(self, address: str) -> float:
+        """Get the weight of the given address."""
+        weight = self.weights.get(address, DEFAULT_WEIGHT)
+        return weight if weight > 0 else DEFAULT_WEIGHT
+
+    def _enqueue(self, request: Dict, tag: float) -> None:
+        """Append a tagged request to its flow."""
+        address = str(request.get("address", ""))
+        request[TAG_KEY] = tag
+        key = (tag, self._seq)
+        self._seq += 1
+        self._keys[request["nonce"]] = key
+        insort(self._order, key)
+        flow = self._flows.setdefault(address, deque())
+        flow.append(request)
+        if len(flow) == 1:
+            heapq.heappush(self._heads, (*key, address))
+
+    def push(self, request: Dict) -> None:
+        """Queue a request at the back of its address's flow."""
+        address = str(request.get("address", ""))
+        tag = max(self.virtual_time, self._finish_tags.get(address, 0.0))
+        self._finish_tags[address] = tag + 1 / self._weight(address)
+        self._enqueue(request, tag)
+
+    def restore(self, request: Dict) -> None:
+        """Queue a request which was queued before a restart, keeping its place."""
+        tag = request.get(TAG_KEY, None)
+        if tag is None:
+            self.push(request)
+            return
+        self._enqueue(request, tag)
+
+    def alias(self, nonce: str, primary_nonce: str) -> None:
+        """Give the request with the given nonce the place of the queued one it has been coalesced into."""
+        self._keys[nonce] = self._keys[primary_nonce]
+
+    def pop(self) -> Optional[Dict]:
+        """Dequeue the request with the earliest tag."""
+        if not self._heads:
+            return None
+        tag, _, address = heapq.heappop(self._heads)
+        flow = self._flows[address]
+        request = flow.popleft()
+        self.virtual_time = max(self.virtual_time, tag)
+        del self._order[bisect_left(self._order, self._keys[request["nonce"]])]
+        for coalesced in request.get("coalesced", []):
+            self._keys.pop(coalesced["nonce"], None)
+        self._keys.pop(request["nonce"], None)
+        if flow:
+            heapq.heappush(self._heads, (*self._keys[flow[0]["nonce"]], address))
+        else:
+            del self._flows[address]
+        return request
+
+    def position(self, nonce: str) -> Optional[int]:
+        """Get the number of the requests which will be served before the one with the given nonce, if queued."""
+        key = self._keys.get(nonce, None)
+        if key is None:
+            return None
+        return bisect_left(self._order, key)
+
+    def requests(self) -> List[Dict]:
+        """Get the queued requests, in service order."""
+        queued = [request for flow in self._flows.values() for request in flow]
+        return sorted(queued, key=lambda request: self._keys[request["nonce"]])
+
+    def serialize(self) -> Dict[str, Any]:
+        """Serialize the scheduling state, to be persisted along with the requests."""
+        # the finish tags which are behind the virtual time have no effect on the next tags
+        self._finish_tags = {
+            address: tag
+            for address, tag in self._finish_tags.items()
+            if tag > self.virtual_time
+        }
+        return {"virtual_time": self.virtual_time, "finish_tags": self._finish_tags}
+
+    def load(self, state: Dict[str, Any]) -> None:
+        """Load the persisted scheduling state."""
+        self.virtual_time = state.get("virtual_time", 0.0)
+        self._finish_tags = state.get("finish_tags", {})
+
+
+class ToolQueues:
+    """
+    Per-tool sub-queues, which keep the requests for quick tools from waiting behind the ones for slow tools.
+
+    Every tool has its own fair queue of requests. The tools with queued requests take turns in a round-robin,
+    and each turn dispatches up to the tool's batch size of requests in a row, so the batch sizes set the tools' shares.
+    It has the same interface as a single `FairQueue`.
+    """
+
+    def __init__(
+        self,
+        address_weights: Optional[Dict[str, float]] = None,
+        batch_sizes: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """Initialize object."""
+        self.address_weights = address_weights or {}
+        self.batch_sizes = batch_sizes or {}
+        self._queues: Dict[str, FairQueue] = {}
+        # the tools with queued requests, in the order of their turns, with the current one first
+        self._turns: Deque[str] = deque()
+        # the requests which the current tool may still dispatch in its turn
+        self._credit = 0
+        self._tools: Dict[str, str] = {}
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Get the number of the queued requests."""
+        return self._size
+
+    def batch_size(self, tool: str) -> int:
+        """Get the number of the requests the given tool may dispatch in a row."""
+        return max(self.batch_sizes.get(tool, 1), 1)
+
+    def depth(self, tool: str) -> int:
+        """Get the number of the queued requests for the given tool."""
+        queue = self._queues.get(tool, None)
+        return 0 if queue is None else len(queue)
+
+    @property
+    def tools(self) -> List[str]:
+        """Get the tools with queued requests."""
+        return list(self._turns)
+
+    def _queue(self, tool: str) -> FairQueue:
+        """Get the queue of the given tool, activating it."""
+        queue = self._queues.get(tool, None)
+        if queue is None:
+            queue = FairQueue(self.address_weights)
+            # a tool which has been idle continues from its persisted scheduling state, if any
+            queue.load(self._states.pop(tool, {}))
+            self._queues[tool] = queue
+        if not self._turns:
+            self._credit = self.batch_size(tool)
+        if len(queue) == 0:
+            self._turns.append(tool)
+        return queue
+
+    def push(self, request: Dict) -> None:
+        """Queue a request in its tool's queue."""
+        tool = str(request.get("tool", ""))
+        self._queue(tool).push(request)
+        self._tools[request["nonce"]] = tool
+        self._size += 1
+
+    def restore(self, request: Dict) -> None:
+        """Queue a request which was queued before a restart, keeping its place."""
+        tool = str(request.get("tool", ""))
+        self._queue(tool).restore(request)
+        self._tools[request["nonce"]] = tool
+        self._size += 1
+
+    def alias(self, nonce: str, primary_nonce: str) -> None:
+        """Give the request with the given nonce the place of the queued one it has been coalesced into."""
+        tool = self._tools[primary_nonce]
+        self._queues[tool].alias(nonce, primary_nonce)
+        self._tools[nonce] = tool
+
+    def pop(self) -> Optional[Dict]:
+        """Dequeue the next request of the tool whose turn it is."""
+        if not self._turns:
+            return None
+        tool = self._turns[0]
+        queue = self._queues[tool]
+        request = cast(Dict, queue.pop())
+        self._size -= 1
+        self._tools.pop(request["nonce"], None)
+        for coalesced in request.get("coalesced", []):
+            self._tools.pop(coalesced["nonce"], None)
+        self._credit -= 1
+        if len(queue) == 0:
+            self._turns.popleft()
+            # the idle tool's queue is dropped, keeping its scheduling state
+            self._states[tool] = self._queues.pop(tool).serialize()
+        elif self._credit == 0:
+            self._turns.rotate(-1)
+        if self._turns and (len(queue) == 0 or self._credit == 0):
+            self._credit = self.batch_size(self._turns[0])
+        return request
+
+    def ahead(self, nonce: Optional[str], tool: str) -> Optional[Dict[str, int]]:
+        """
+        Get the number of the requests which will be dispatched before a request, per tool.
+
+        The count assumes that no other requests are queued in the meantime.
+
+        :param nonce: the nonce of a queued request, or `None` for a new request of the given tool.
+        :param tool: the request's tool, used for a new request.
+        :return: the requests ahead per tool, or `None` if the given request is not queued.
+        """
+        if nonce is not None:
+            tool = self._tools.get(nonce, "")
+            position = self._queues[tool].position(nonce) if tool else None
+            if position is None:
+                return None
+        else:
+            position = self.depth(tool)
+
+        turns = list(self._turns)
+        if tool not in turns:
+            # a new request for an idle tool waits for its tool's turn, at the end of the current round
+            turns.append(tool)
+
+        def first_turn(turn_tool: str) -> int:
+            """Get the number of the requests the given tool dispatches in its first turn."""
+            if self._turns and turn_tool == self._turns[0]:
+                return self._credit
+            return self.batch_size(turn_tool)
+
+        # the number of turns the request's tool takes before the one the request is dispatched in
+        first = first_turn(tool)
+        full_turns = (
+            0 if position < first else 1 + (position - first) // self.batch_size(tool)
+        )
+        index = turns.index(tool)
+        ahead = {tool: position} if position else {}
+        for turn_index, turn_tool in enumerate(turns):
+            if turn_tool == tool:
+                continue
+            # the tools before the request's one in the round take one more turn
+            n_turns = full_turns + 1 if turn_index < index else full_turns
+            if n_turns == 0:
+                continue
+            quota = first_turn(turn_tool) + (n_turns - 1) * self.batch_size(turn_tool)
+            count = min(self.depth(turn_tool), quota)
+            if count:
+                ahead[turn_tool] = count
+        return ahead
+
+    def position(self, nonce: str) -> Optional[int]:
+        """Get the number of the requests which will be dispatched before the one with the given nonce, if queued."""
+        ahead = self.ahead(nonce, "")
+        return None if ahead is None else sum(ahead.values())
+
+    def requests(self) -> List[Dict]:
+        """
+        Get the queued requests, per tool, in the order of the tools' turns.
+
+        Restoring them in this order gives the tools their turns in the same order.
+
+        :return: the queued requests.
+        """
+        return [
+            request for tool in self._turns for request in self._queues[tool].requests()
+        ]
+
+    def serialize(self) -> Dict[str, Any]:
+        """Serialize the scheduling state of the tools' queues."""
+        tools = {tool: queue.serialize() for tool, queue in self._queues.items()}
+        return {"tools": {**self._states, **tools}}
+
+    def load(self, state: Dict[str, Any]) -> None:
+        """Load the persisted scheduling state, before restoring the requests."""
+        self._states = dict(state.get("tools", {}))
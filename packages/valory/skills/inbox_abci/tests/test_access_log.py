@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the access_log.py module of the Inbox."""
+
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from packages.valory.skills.inbox_abci.access_log import AccessLog
+
+
+def read_lines(path: Path) -> List[Dict]:
+    """Read the json lines of an access log."""
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestAccessLog:
+    """Test AccessLog of Inbox."""
+
+    def test_record(self, tmp_path: Path) -> None:
+        """Test that a line is written per request, with its route rather than its url."""
+        path = tmp_path / "logs" / "access.log"
+        access_log = AccessLog(str(path))
+        assert access_log.record("get", "get_request", 200, 0.0012, 0, 42)
+        access_log.stop()
+
+        (line,) = read_lines(path)
+        assert line["method"] == "GET"
+        assert line["route"] == "get_request"
+        assert line["status"] == 200
+        assert line["latency_ms"] == 1.2
+        assert line["request_bytes"] == 0
+        assert line["response_bytes"] == 42
+        assert line["sample_rate"] == 1.0
+
+    def test_sampling(self, tmp_path: Path) -> None:
+        """Test that the successful, fast requests are sampled, while the failed and the slow ones are always logged."""
+        path = tmp_path / "access.log"
+        access_log = AccessLog(str(path), sample_rate=0.1, slow_threshold=1.0, seed=0)
+        logged = sum(
+            access_log.record("get", "get_responses", 200, 0.01, 0, 10)
+            for _ in range(1000)
+        )
+        assert 50 < logged < 150
+        assert access_log.record("post", "post_requests", 429, 0.01, 10, 10)
+        assert access_log.record("get", "get_responses", 200, 2.0, 0, 10)
+        access_log.stop()
+
+        lines = read_lines(path)
+        assert len(lines) == logged + 2
+        assert [line["sample_rate"] for line in lines[-3:]] == [0.1, 1.0, 1.0]
+
+    def test_stop(self, tmp_path: Path) -> None:
+        """Test that nothing is written once stopped, and that the file is only created on the first write."""
+        path = tmp_path / "access.log"
+        access_log = AccessLog(str(path))
+        access_log.stop()
+        access_log.stop()
+        assert not access_log.record("get", "get_responses", 500, 0.01, 0, 0)
+        assert not path.exists()
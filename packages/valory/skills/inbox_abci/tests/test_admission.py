@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the admission.py module of the Inbox."""
+
+import math
+from typing import Any
+
+import pytest
+
+from packages.valory.skills.inbox_abci.admission import AdmissionController, TokenBucket
+
+
+def controller(**kwargs: Any) -> AdmissionController:
+    """An admission controller, with all the checks disabled unless given."""
+    limits = {
+        "max_queue_size": 0,
+        "queue_time_target": 0.0,
+        "address_rate": 0.0,
+        "address_burst": 0,
+        "global_rate": 0.0,
+        "global_burst": 0,
+    }
+    return AdmissionController(**{**limits, **kwargs})
+
+
+def admit(admission: AdmissionController, *addresses: str, **kwargs: Any) -> Any:
+    """Admit requests from the given addresses, into an empty and idle queue unless given otherwise."""
+    state = {"queue_size": 0, "queue_time": 0.0, "drain_rate": 1.0, "now": 0.0}
+    return admission.admit(list(addresses), **{**state, **kwargs})
+
+
+class TestTokenBucket:
+    """Test TokenBucket of Inbox."""
+
+    def test_wait_time(self) -> None:
+        """Test that the bucket starts full and refills at its rate, up to its burst."""
+        bucket = TokenBucket(rate=2.0, burst=4, now=0.0)
+        assert bucket.is_full(0.0)
+        assert bucket.wait_time(4, 0.0) == 0.0
+        bucket.take(3, now=0.0)
+        assert not bucket.is_full(0.0)
+        assert bucket.wait_time(1, 0.0) == 0.0
+        assert bucket.wait_time(3, 0.0) == 1.0
+        assert bucket.wait_time(3, 0.5) == 0.5
+        assert bucket.is_full(10.0)
+        assert bucket.tokens == 4
+
+    def test_exceeding_burst(self) -> None:
+        """Test that more requests than the burst can never be admitted at once."""
+        bucket = TokenBucket(rate=2.0, burst=4, now=0.0)
+        assert math.isinf(bucket.wait_time(5, 0.0))
+
+
+class TestAdmissionController:
+    """Test AdmissionController of Inbox."""
+
+    def test_disabled(self) -> None:
+        """Test that the zero limits admit everything."""
+        admission = controller()
+        for _ in range(100):
+            assert (
+                admit(admission, "0x1", "0x1", queue_size=10**6, queue_time=1e6)
+                is None
+            )
+        assert admission.stats == {}
+
+    def test_queue_size(self) -> None:
+        """Test that the requests overflowing the queue are rejected until the excess is drained."""
+        admission = controller(max_queue_size=10)
+        assert admit(admission, "0x1", queue_size=9) is None
+        assert (
+            admit(admission, "0x1", "0x2", "0x3", queue_size=9, drain_rate=0.5) == 4.0
+        )
+        assert admission.stats == {"queue_size": 1}
+
+    def test_exceeding_queue_size(self) -> None:
+        """Test that more requests than the size of the queue can never be admitted at once."""
+        admission = controller(max_queue_size=2)
+        assert math.isinf(admit(admission, "0x1", "0x2", "0x3"))
+        assert admission.stats == {"queue_size": 1}
+
+    def test_queue_time(self) -> None:
+        """Test that the requests are rejected while the queue time exceeds the target."""
+        admission = controller(queue_time_target=10.0)
+        assert admit(admission, "0x1", queue_time=10.0) is None
+        assert admit(admission, "0x1", queue_time=15.0) == 5.0
+        assert admission.stats == {"queue_time": 1}
+
+    def test_global_rate(self) -> None:
+        """Test that the requests of all the addresses share the global rate limit."""
+        admission = controller(global_rate=1.0, global_burst=2)
+        assert admit(admission, "0x1") is None
+        assert admit(admission, "0x2") is None
+        assert admit(admission, "0x3") == 1.0
+        assert admit(admission, "0x3", now=1.0) is None
+        assert math.isinf(admit(admission, "0x1", "0x2", "0x3", now=10.0))
+        assert admission.stats == {"rate": 2}
+
+    def test_address_rate(self) -> None:
+        """Test that each address has its own rate limit."""
+        admission = controller(address_rate=0.5, address_burst=1)
+        assert admit(admission, "0x1") is None
+        assert admit(admission, "0x1") == 2.0
+        assert admit(admission, "0x2") is None
+        assert math.isinf(admit(admission, "0x3", "0x3"))
+        assert admission.stats == {"rate": 2}
+
+    def test_all_or_nothing(self) -> None:
+        """Test that the tokens of a batch are only taken if the whole batch is admitted."""
+        admission = controller(
+            global_rate=1.0, global_burst=3, address_rate=1.0, address_burst=1
+        )
+        assert admit(admission, "0x1") is None
+        assert admit(admission, "0x1", "0x2") == 1.0
+        # the rejected batch has not taken the tokens of the global limit, nor of the address which had some
+        assert admit(admission, "0x2", "0x3") is None
+        assert admit(admission, "0x4") == 1.0
+
+    @pytest.mark.parametrize("idle", (True, False))
+    def test_idle_buckets(self, idle: bool) -> None:
+        """Test that the buckets of the addresses are dropped once they have refilled, when there are too many."""
+        admission = controller(address_rate=1.0, address_burst=1)
+        admission.max_idle_buckets = 2
+        assert admit(admission, "0x1") is None
+        assert admit(admission, "0x2") is None
+        assert admit(admission, "0x3", now=1.0 if idle else 0.5) is None
+        assert len(admission._addresses) == (1 if idle else 3)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark the hot paths of the Inbox.
+
+The benchmarks are parametrised by the size of the history of processed responses and by the mix of the requests.
+Save a baseline with `tox -e benchmarks-baseline` and compare against it with `tox -e benchmarks`,
+which fails on the regressions beyond the threshold.
+The benchmarks are skipped outside of these envs, which set `BENCHMARKS`.
+"""
+
+import logging
+import os
+import types
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+from packages.valory.skills.inbox_abci.handlers import (
+    HttpApplication,
+    HttpHandler,
+    InBox,
+)
+
+
+HISTORY_SIZES = (1_000, 10_000, 100_000)
+# the number of requests put into or got from the inbox per round
+BATCH = 100
+# the rounds of the benchmarks whose every round needs a fresh inbox or writes the whole history
+ROUNDS = 5
+
+LOGGER = logging.getLogger(__name__)
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("BENCHMARKS"),
+        reason="the benchmarks only run in the benchmarks envs",
+    ),
+]
+
+
+def unique(i: int) -> Dict:
+    """A request with a distinct prompt, for a single tool."""
+    return {"prompt": f"prompt {i}", "tool": "short-maker", "address": f"0x{i % 20}"}
+
+
+def duplicates(i: int) -> Dict:
+    """A request repeating one of a few prompts, which is coalesced into the queued one."""
+    return {"prompt": f"prompt {i % 5}", "tool": "short-maker", "address": f"0x{i}"}
+
+
+def tools(i: int) -> Dict:
+    """A request with a distinct prompt, for one of a few tools."""
+    return {"prompt": f"prompt {i}", "tool": f"tool-{i % 5}", "address": f"0x{i % 20}"}
+
+
+MIXES: Dict[str, Callable[[int], Dict]] = {
+    "unique": unique,
+    "duplicates": duplicates,
+    "tools": tools,
+}
+
+QUERIES = {
+    "page": "sortBy=id&sortOrder=desc&pageNum=3&limit=20",
+    "filter": "id={id_}",
+    "all": "",
+}
+
+# requests with cheap handlers, whose cost is mostly the parsing, the routing and the authentication
+ROUTES = {
+    "static": ("get", "/cache/stats", ""),
+    "parametrized": ("get", f"/requests/{0:032x}/trace", ""),
+    "unmatched": ("get", "/unknown/route", ""),
+    "authenticated": ("post", "/restore", "Content-Type: application/json\n"),
+}
+
+
+def history(size: int) -> List[Dict]:
+    """Generate a history of processed responses, with a failed request in every hundred."""
+    responses: List[Dict] = []
+    for token_id in range(1, size + 1):
+        nonce = f"{token_id:032x}"
+        if token_id % 100 == 0:
+            failed = {"nonce": nonce, "prompt": "prompt", "tool": "short-maker"}
+            responses.append({**failed, "error": "failed"})
+            continue
+        responses.append(
+            {
+                "image": f"bafy{token_id:012x}",
+                "video": f"bafy{token_id:012x}",
+                "id": token_id,
+                "nonce": nonce,
+            }
+        )
+    return responses
+
+
+@pytest.fixture(
+    scope="module", params=HISTORY_SIZES, ids=lambda size: f"history={size}"
+)
+def processed(request: Any) -> List[Dict]:
+    """The history of processed responses."""
+    return history(request.param)
+
+
+def new_inbox(tmp_path: Path, processed: List[Dict]) -> InBox:
+    """Create an inbox with a copy of the given history."""
+    inbox = InBox(LOGGER, db=str(tmp_path / "db.json"))
+    inbox.restore(list(processed))
+    return inbox
+
+
+@pytest.mark.parametrize("mix", MIXES)
+def test_put(benchmark: Any, tmp_path: Path, mix: str) -> None:
+    """Benchmark putting a batch of requests into the inbox."""
+
+    def setup() -> Tuple[Tuple, Dict]:
+        """Create an empty inbox and the requests to put."""
+        requests = [MIXES[mix](i) for i in range(BATCH)]
+        return (InBox(LOGGER, db=str(tmp_path / "db.json")), requests), {}
+
+    def put(inbox: InBox, requests: List[Dict]) -> None:
+        """Put the requests."""
+        for request in requests:
+            inbox.put(request)
+
+    benchmark.pedantic(put, setup=setup, rounds=ROUNDS * 20)
+
+
+@pytest.mark.parametrize("mix", MIXES)
+def test_get(benchmark: Any, tmp_path: Path, mix: str) -> None:
+    """Benchmark draining a batch of requests from the inbox."""
+
+    def setup() -> Tuple[Tuple, Dict]:
+        """Create an inbox with the queued requests."""
+        inbox = InBox(LOGGER, db=str(tmp_path / "db.json"))
+        for i in range(BATCH):
+            inbox.put(MIXES[mix](i))
+        return (inbox,), {}
+
+    def drain(inbox: InBox) -> None:
+        """Get the requests until the queue is empty."""
+        while inbox.get() is not None:
+            pass
+
+    benchmark.pedantic(drain, setup=setup, rounds=ROUNDS * 20)
+
+
+def test_add_response(benchmark: Any, tmp_path: Path, processed: List[Dict]) -> None:
+    """Benchmark adding a response, which persists the whole history."""
+
+    def setup() -> Tuple[Tuple, Dict]:
+        """Create an inbox with the history and a request being processed."""
+        inbox = new_inbox(tmp_path, processed)
+        nonce = inbox.put(unique(0))
+        inbox.get()
+        response = {"image": "bafy", "video": "bafy", "id": len(processed) + 1}
+        return (inbox, {**response, "nonce": nonce}), {}
+
+    benchmark.pedantic(InBox.add_response, setup=setup, rounds=ROUNDS)
+
+
+def test_deserialize_state(
+    benchmark: Any, tmp_path: Path, processed: List[Dict]
+) -> None:
+    """Benchmark loading the persisted state, with the history and queued requests."""
+    inbox = new_inbox(tmp_path, processed)
+    for i in range(BATCH):
+        inbox.put(tools(i))
+    inbox._persist()
+
+    benchmark.pedantic(inbox._deserialize_state, rounds=ROUNDS)
+    assert len(inbox.get_responses()) == len(processed)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_get_responses(
+    benchmark: Any, tmp_path: Path, processed: List[Dict], query: str
+) -> None:
+    """Benchmark `GET /responses`, with pagination, an id filter or the whole history."""
+    app = HttpApplication(inbox=new_inbox(tmp_path, processed), auth="")
+    query_string = QUERIES[query].format(id_=len(processed) // 2)
+    message = types.SimpleNamespace(
+        method="get",
+        url=f"http://localhost:8000/responses?{query_string}",
+        headers="",
+        body=b"",
+    )
+
+    response = benchmark(app.handle, message)
+    assert response["code"].value == 200
+
+
+@pytest.mark.parametrize("route", ROUTES)
+def test_dispatch(benchmark: Any, tmp_path: Path, route: str) -> None:
+    """Benchmark the per-request overhead of handling a request, with a handler which does little work."""
+    app = HttpApplication(inbox=new_inbox(tmp_path, []), auth="secret")
+    method, path, headers = ROUTES[route]
+    message = types.SimpleNamespace(
+        method=method,
+        url=f"http://localhost:8000{path}",
+        headers=headers,
+        body=b"[]",
+    )
+
+    response = benchmark(app.handle, message)
+    assert response["code"].value in (200, 401, 404)
+
+
+@pytest.mark.parametrize("extra", ({}, {"Retry-After": "10"}), ids=("none", "extra"))
+def test_response_headers(benchmark: Any, extra: Dict[str, str]) -> None:
+    """Benchmark generating the response headers."""
+    headers = benchmark(HttpHandler.response_headers, extra)
+    assert headers.endswith("\n")
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the diagnostics.py module of the Inbox."""
+
+import sys
+from typing import Generator, List
+
+import pytest
+
+from packages.valory.skills.inbox_abci.diagnostics import (
+    MemoryDiagnostics,
+    approximate_size,
+    deep_size,
+)
+
+
+@pytest.fixture
+def diagnostics() -> Generator[MemoryDiagnostics, None, None]:
+    """Memory diagnostics, whose tracing is stopped after the test."""
+    diagnostics = MemoryDiagnostics()
+    yield diagnostics
+    diagnostics.stop()
+
+
+def test_deep_size() -> None:
+    """Test that the held objects are counted once."""
+    item = "x" * 1000
+    assert deep_size([item, item]) == sys.getsizeof([item, item]) + sys.getsizeof(item)
+    assert deep_size({"a": [item]}) > deep_size({"a": []}) + 1000
+
+
+def test_approximate_size() -> None:
+    """Test that the size of a large collection is approximated from a sample of its items."""
+    responses = [{"id": i, "image": f"bafy{i:012x}"} for i in range(10_000)]
+    exact = deep_size(responses)
+    assert approximate_size(responses) == pytest.approx(exact, rel=0.1)
+    mapping = {str(i): {"stage": "queued"} for i in range(10_000)}
+    assert approximate_size(mapping) == pytest.approx(deep_size(mapping), rel=0.1)
+    assert approximate_size(responses[:10]) == deep_size(responses[:10])
+
+
+class TestMemoryDiagnostics:
+    """Test MemoryDiagnostics of Inbox."""
+
+    def test_census(self, diagnostics: MemoryDiagnostics) -> None:
+        """Test that the added and the given structures are counted, reporting the errors getting them."""
+        processed = [{"id": 1}, {"id": 2}]
+        diagnostics.add_structure("processed", lambda: processed)
+        diagnostics.add_structure("db", lambda: {}["missing"])
+        census = diagnostics.census({"queue": []})
+        assert list(census) == ["db", "processed", "queue"]
+        assert census["processed"]["count"] == 2
+        assert census["processed"]["size"] == deep_size(processed)
+        assert census["queue"] == {"count": 0, "size": sys.getsizeof([])}
+        assert census["db"] == {"error": "KeyError: 'missing'"}
+
+    def test_snapshots(self, diagnostics: MemoryDiagnostics) -> None:
+        """Test that tracing is started by the first snapshot and the growth since the previous one is reported."""
+        first = diagnostics.snapshot()
+        assert first["tracing_started"]
+        assert not first["diffed"]
+        assert diagnostics.tracing
+
+        leaked: List[bytearray] = [bytearray(1000) for _ in range(1000)]
+        second = diagnostics.snapshot(limit=1)
+        assert not second["tracing_started"]
+        assert second["diffed"]
+        top = second["sites"][0]
+        assert top["site"][0].startswith(__file__)
+        assert top["size_diff"] >= 1000 * len(leaked)
+
+        diagnostics.stop()
+        assert not diagnostics.tracing
+        assert diagnostics.snapshot()["tracing_started"]
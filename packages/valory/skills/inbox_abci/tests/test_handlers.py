@@ -0,0 +1,522 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the handlers.py module of the Inbox."""
+
+import json
+import logging
+import math
+import types
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional
+from unittest import mock
+
+import pytest
+
+from packages.valory.skills.inbox_abci import handlers
+from packages.valory.skills.inbox_abci.admission import AdmissionController
+from packages.valory.skills.inbox_abci.handlers import (
+    HttpApplication,
+    HttpHandler,
+    HttpResponseCode,
+    InBox,
+    QueueTimeEstimator,
+    REQUEST_TIME,
+    RequestStage,
+    percentile,
+)
+from packages.valory.skills.inbox_abci.routing import HttpRequest
+
+
+LOGGER = logging.getLogger(__name__)
+LONG_POLL_TIMEOUT = 4.0
+REQUEST = {"prompt": "prompt", "tool": "short-maker", "address": "0x1"}
+
+
+def message(
+    method: str, path: str, body: bytes = b"", headers: str = ""
+) -> types.SimpleNamespace:
+    """An http request message."""
+    return types.SimpleNamespace(
+        method=method, url=f"http://localhost:8000{path}", headers=headers, body=body
+    )
+
+
+def params(tmp_path: Path) -> types.SimpleNamespace:
+    """The inbox's parameters."""
+    return types.SimpleNamespace(
+        inbox_auth="auth",
+        inbox_max_retries=0,
+        result_cache_size=0,
+        result_cache_ttl=0.0,
+        long_poll_timeout=LONG_POLL_TIMEOUT,
+        lifecycle_ttl=60.0,
+        inbox_max_queue_size=100,
+        inbox_queue_time_target=0.0,
+        inbox_address_rate=0.0,
+        inbox_address_burst=0,
+        inbox_global_rate=0.0,
+        inbox_global_burst=0,
+        inbox_address_weights={},
+        inbox_tool_batch_sizes={},
+        access_log_path=str(tmp_path / "access.log"),
+        access_log_sample_rate=1.0,
+        access_log_slow_threshold=1.0,
+    )
+
+
+@pytest.fixture
+def inbox(tmp_path: Path) -> InBox:
+    """An empty inbox."""
+    return InBox(LOGGER, db=str(tmp_path / "db.json"))
+
+
+@pytest.fixture
+def handler(tmp_path: Path) -> Generator[HttpHandler, None, None]:
+    """An http handler, with its inbox persisted in the temporary directory, which records its responses."""
+    context = mock.MagicMock()
+    context.params = params(tmp_path)
+    context.state = types.SimpleNamespace()
+    inbox_cls = partial(InBox, db=str(tmp_path / "db.json"))
+    http_handler = HttpHandler(name="http", skill_context=context)
+    with mock.patch.object(handlers, "InBox", inbox_cls):
+        http_handler.setup()
+    with mock.patch.object(http_handler, "_respond"):
+        yield http_handler
+    http_handler.access_log.stop()
+
+
+def responses(handler: HttpHandler) -> List[Optional[dict]]:
+    """Get the data of the responses which the given handler has sent."""
+    respond = handler._respond
+    return [call.args[2]["data"] for call in respond.call_args_list]  # type: ignore
+
+
+def wait(handler: HttpHandler, nonce: str, query: str = "") -> Optional[dict]:
+    """Long-poll the stage of the given request, deferring the response like the handler does."""
+    request = HttpRequest(message("get", f"/requests/{nonce}/wait{query}"))
+    handler.app.resolve(request)
+    response = handler.app.dispatch(request)
+    if response is None:
+        handler._defer(request, mock.MagicMock())
+        return None
+    return response
+
+
+def test_percentile() -> None:
+    """Test that the nearest-rank percentiles are one of the samples."""
+    samples = [float(sample) for sample in range(10, 0, -1)]
+    assert percentile(samples, 0.5) == 5.0
+    assert percentile(samples, 0.9) == 9.0
+    assert percentile(samples, 0.0) == 1.0
+    assert percentile([3.0], 0.9) == 3.0
+
+
+class TestQueueTimeEstimator:
+    """Test QueueTimeEstimator of Inbox."""
+
+    def setup_method(self) -> None:
+        """Set up the test."""
+        self.estimator = QueueTimeEstimator(prior=100.0, window=10)
+        # a median of 5 and a 90th percentile of 9 seconds
+        for duration in range(1, 11):
+            self.estimator.record("a", float(duration))
+        self.estimator.record("b", 2.0)
+
+    def test_prior(self) -> None:
+        """Test that the prior is used until there are measurements, and that the tools without any fall back to all of them."""
+        estimator = QueueTimeEstimator(prior=100.0)
+        assert estimator.eta({}, "a") == {"p50": 100.0, "p90": 100.0}
+        assert estimator.drain_rate() == 1 / 100.0
+        estimator.record("a", 0.5)
+        assert estimator.service_time("a") == (0.5, 0.5)
+        assert estimator.service_time("c") == (0.5, 0.5)
+        # a request is not assumed to be processed faster than the minimum processing time
+        assert estimator.drain_rate() == 1.0
+        assert self.estimator.service_time("c") == (5.0, 9.0)
+
+    def test_eta(self) -> None:
+        """Test that the medians of the requests ahead are added up, with their spreads added up in quadrature."""
+        assert self.estimator.eta({}, "a") == {"p50": 5.0, "p90": 9.0}
+        eta = self.estimator.eta({"a": 2, "b": 1}, "a")
+        assert eta["p50"] == 5.0 + 2 * 5.0 + 2.0
+        assert eta["p90"] == eta["p50"] + math.sqrt(3 * (9.0 - 5.0) ** 2)
+
+    def test_in_flight(self) -> None:
+        """Test that only the remaining time of the request in flight is added."""
+        assert self.estimator.eta({}, "b", ("a", 3.0)) == {"p50": 4.0, "p90": 8.0}
+        assert self.estimator.eta({}, "b", ("a", 7.0)) == {"p50": 2.0, "p90": 4.0}
+        assert self.estimator.eta({}, "b", ("a", 20.0)) == {"p50": 2.0, "p90": 2.0}
+
+    def test_window_and_persistence(self) -> None:
+        """Test that only the latest measurements are kept, and that they are persisted."""
+        self.estimator.record("a", 11.0)
+        serialized = self.estimator.serialize()
+        assert serialized["a"] == [float(duration) for duration in range(2, 12)]
+        estimator = QueueTimeEstimator(prior=100.0, window=10)
+        estimator.load(serialized)
+        assert estimator.serialize() == serialized
+        assert estimator.service_time("a") == (6.0, 10.0)
+
+
+def test_post_generate(inbox: InBox) -> None:
+    """Test that the nonce of a queued request is returned both as its `id` and as its `nonce`."""
+    app = HttpApplication(inbox=inbox, auth="")
+    body = json.dumps(REQUEST).encode()
+    response = app.handle(message("post", "/generate", body))  # type: ignore
+    assert response is not None
+    assert response["code"] == HttpResponseCode.OK
+    nonce = response["data"]["nonce"]
+    assert response["data"]["id"] == nonce
+    assert inbox.queue_position(nonce) == 0
+
+
+class TestBatch:
+    """Test the submission of a batch of requests."""
+
+    @pytest.mark.parametrize(
+        "body",
+        (
+            json.dumps([REQUEST, {**REQUEST, "prompt": "other"}]),
+            "\n".join(
+                (json.dumps(REQUEST), "", json.dumps({**REQUEST, "prompt": "other"}))
+            ),
+        ),
+        ids=("json", "ndjson"),
+    )
+    def test_post_generate_batch(self, inbox: InBox, body: str) -> None:
+        """Test that a batch given either as a JSON array or as NDJSON is queued in order, with a single write."""
+        app = HttpApplication(inbox=inbox, auth="")
+        with mock.patch.object(inbox, "_persist", wraps=inbox._persist) as persist:
+            response = app.handle(message("post", "/generate/batch", body.encode()))  # type: ignore
+        assert response is not None
+        assert response["code"] == HttpResponseCode.OK
+        nonces = response["data"]["nonces"]
+        assert len(nonces) == 2
+        persist.assert_called_once()
+        assert [inbox.queue_position(nonce) for nonce in nonces] == [0, 1]
+        queued = inbox.get()
+        assert queued is not None
+        assert queued["nonce"] == nonces[0]
+
+    @pytest.mark.parametrize(
+        ("body", "errors"),
+        (
+            ("", ["The batch is empty."]),
+            ("[]", ["The batch is empty."]),
+            ('{"prompt": "a"\n', ["Invalid JSON: "]),
+            (
+                json.dumps([REQUEST, 1, {"prompt": "a", "tool": "t"}]),
+                ["Request 1 is not an object.", "Request 2 is missing address."],
+            ),
+        ),
+    )
+    def test_invalid_batch(self, inbox: InBox, body: str, errors: List[str]) -> None:
+        """Test that a batch with an invalid entry is rejected as a whole, with the errors of all the entries."""
+        app = HttpApplication(inbox=inbox, auth="")
+        response = app.handle(message("post", "/generate/batch", body.encode()))  # type: ignore
+        assert response is not None
+        assert response["code"] == HttpResponseCode.BAD_REQUEST
+        assert response["data"]["status"] == "REJECTED"
+        received = response["data"]["errors"]
+        assert len(received) == len(errors)
+        assert all(error.startswith(prefix) for error, prefix in zip(received, errors))
+        assert inbox.get() is None
+
+    def test_single_object(self, inbox: InBox) -> None:
+        """Test that a single JSON object is a batch of one request."""
+        app = HttpApplication(inbox=inbox, auth="")
+        body = json.dumps(REQUEST).encode()
+        response = app.handle(message("post", "/generate/batch", body))  # type: ignore
+        assert response is not None
+        assert len(response["data"]["nonces"]) == 1
+
+
+class TestAdmission:
+    """Test the admission control of the submitted requests."""
+
+    @staticmethod
+    def app(inbox: InBox, **limits: Any) -> HttpApplication:
+        """An application admitting the requests within the given limits."""
+        disabled = {
+            "max_queue_size": 0,
+            "queue_time_target": 0.0,
+            "address_rate": 0.0,
+            "address_burst": 0,
+            "global_rate": 0.0,
+            "global_burst": 0,
+        }
+        admission = AdmissionController(**{**disabled, **limits})
+        return HttpApplication(inbox=inbox, auth="", admission=admission)
+
+    def test_too_many_requests(self, inbox: InBox) -> None:
+        """Test that the requests overflowing the queue are rejected with the time after which they may be retried."""
+        app = self.app(inbox, max_queue_size=2)
+        body = json.dumps(REQUEST).encode()
+        for _ in range(2):
+            response = app.handle(message("post", "/generate", body))  # type: ignore
+            assert response is not None
+            assert response["code"] == HttpResponseCode.OK
+        assert inbox.queue_size == 1
+        batch = json.dumps([REQUEST, {**REQUEST, "prompt": "other"}]).encode()
+        response = app.handle(message("post", "/generate/batch", batch))  # type: ignore
+        assert response is not None
+        assert response["code"] == HttpResponseCode.TOO_MANY_REQUESTS
+        # without any measurement, a request is assumed to take the prior processing time
+        assert response["headers"] == {"Retry-After": str(REQUEST_TIME)}
+        assert inbox.queue_size == 1
+        assert app.admission is not None
+        assert app.admission.stats == {"queue_size": 1}
+
+    @pytest.mark.parametrize(
+        "limits",
+        ({"address_rate": 1.0, "address_burst": 1}, {"max_queue_size": 1}),
+        ids=("burst", "queue_size"),
+    )
+    def test_never_admitted(self, inbox: InBox, limits: Dict[str, Any]) -> None:
+        """Test that a batch which can never be admitted is rejected as a bad request."""
+        app = self.app(inbox, **limits)
+        batch = json.dumps([REQUEST, {**REQUEST, "prompt": "other"}]).encode()
+        response = app.handle(message("post", "/generate/batch", batch))  # type: ignore
+        assert response is not None
+        assert response["code"] == HttpResponseCode.BAD_REQUEST
+        assert "headers" not in response
+        assert inbox.queue_size == 0
+
+
+class TestProfile:
+    """Test the profiling of the agent's main loop through the http api."""
+
+    def test_profile(self, inbox: InBox) -> None:
+        """Test that a profile is started at once and its samples are got once it is finished."""
+        app = HttpApplication(inbox=inbox, auth="")
+        response = app.handle(message("post", "/debug/profile?seconds=0.2"))  # type: ignore
+        assert response is not None
+        assert response["code"] == HttpResponseCode.ACCEPTED
+        data = response["data"]
+        assert data is not None
+        assert data["status"] == "STARTED"
+        path = f"/debug/profile/{data['id']}"
+
+        running = app.handle(message("get", path))  # type: ignore
+        assert running is not None
+        assert running["code"] == HttpResponseCode.ACCEPTED
+        conflict = app.handle(message("post", "/debug/profile?seconds=1"))  # type: ignore
+        assert conflict is not None
+        assert conflict["code"] == HttpResponseCode.CONFLICT
+
+        assert app.profiler._thread is not None
+        app.profiler._thread.join()
+        collapsed = app.handle(message("get", path))  # type: ignore
+        assert collapsed is not None
+        assert collapsed["code"] == HttpResponseCode.OK
+        assert collapsed["headers"] == {"Content-Type": "text/plain"}
+        speedscope = app.handle(message("get", f"{path}?format=speedscope"))  # type: ignore
+        assert speedscope is not None
+        assert speedscope["code"] == HttpResponseCode.OK
+        assert speedscope["data"] is not None
+        assert "$schema" in speedscope["data"]
+
+    @pytest.mark.parametrize(
+        "method, path, code",
+        (
+            ("post", "/debug/profile?seconds=301", HttpResponseCode.BAD_REQUEST),
+            ("post", "/debug/profile?seconds=a", HttpResponseCode.BAD_REQUEST),
+            ("get", "/debug/profile/abc", HttpResponseCode.NOT_FOUND),
+        ),
+    )
+    def test_invalid(
+        self, inbox: InBox, method: str, path: str, code: HttpResponseCode
+    ) -> None:
+        """Test the profiles which cannot be started or got."""
+        app = HttpApplication(inbox=inbox, auth="")
+        response = app.handle(message(method, path))  # type: ignore
+        assert response is not None
+        assert response["code"] == code
+        assert not app.profiler.running
+
+
+class TestLifecycle:
+    """Test the lifecycle records of the requests."""
+
+    def test_lifecycle(self, inbox: InBox) -> None:
+        """Test that the stages only move forward, with the time each one was reached, and that the duplicates share the mech's stages."""
+        nonce = inbox.put(dict(REQUEST))
+        duplicate = inbox.put({**REQUEST, "address": "0x2"})
+        record = inbox.lifecycle(nonce)
+        assert record is not None
+        assert record["stage"] == RequestStage.QUEUED.value
+        assert record["tool"] == REQUEST["tool"]
+        assert record["queue_position"] == 0
+        assert set(record["eta"]) == {"p50", "p90"}
+        assert inbox.lifecycle("unknown") is None
+
+        inbox.get()
+        inbox.set_stage(nonce, RequestStage.MECH_SUBMITTED, mech_tx_hash="0x")
+        inbox.set_stage(nonce, RequestStage.QUEUED)
+        inbox.set_stage(nonce, RequestStage.MINTED, token_id=1)
+        inbox.set_stage(nonce, RequestStage.DELIVERED)
+        record = inbox.lifecycle(nonce)
+        assert record is not None
+        assert record["stage"] == RequestStage.MINTED.value
+        assert record["token_id"] == 1
+        assert record["queue_position"] is None
+        assert list(record["timestamps"]) == ["queued", "mech_submitted", "minted"]
+        # the re-queueing of a request for a retry is the only stage which moves back
+        assert record["timestamps"]["queued"] >= record["timestamps"]["mech_submitted"]
+        shared = inbox.lifecycle(duplicate)
+        assert shared is not None
+        assert shared["stage"] == RequestStage.DELIVERED.value
+
+    def test_prune(self, tmp_path: Path) -> None:
+        """Test that the records of the requests which have reached a final stage are dropped once they age out."""
+        inbox = InBox(LOGGER, db=str(tmp_path / "db.json"), lifecycle_ttl=60.0)
+        notified, failed, queued = (
+            inbox.put({**REQUEST, "prompt": prompt}) for prompt in "abc"
+        )
+        with mock.patch.object(handlers.time, "time", return_value=1000.0):
+            inbox.set_stage(notified, RequestStage.NOTIFIED)
+            inbox.set_stage(failed, RequestStage.FAILED, error="error")
+        with mock.patch.object(handlers.time, "time", return_value=1060.0):
+            inbox._persist()
+        assert inbox.lifecycle(notified) is not None
+
+        with mock.patch.object(handlers.time, "time", return_value=1061.0):
+            inbox._persist()
+        assert inbox.lifecycle(notified) is None
+        assert inbox.lifecycle(failed) is None
+        assert inbox.lifecycle(queued) is not None
+        persisted = json.loads((tmp_path / "db.json").read_text())
+        assert list(persisted["lifecycles"]) == [queued]
+
+
+class TestCoalescing:
+    """Test the coalescing of the duplicate requests."""
+
+    def test_processing(self, tmp_path: Path) -> None:
+        """Test that a duplicate of the request waiting on the mech is coalesced into it until its result is cached."""
+        inbox = InBox(
+            LOGGER, db=str(tmp_path / "db.json"), cache_size=1, cache_ttl=60.0
+        )
+        nonce = inbox.put(dict(REQUEST))
+        inbox.get()
+        inbox.set_stage(nonce, RequestStage.MECH_SUBMITTED)
+        duplicate = inbox.put({**REQUEST, "address": "0x2"})
+        assert inbox.queue_size == 0
+        assert inbox.requests_of(nonce) == {nonce: "0x1", duplicate: "0x2"}
+        record = inbox.lifecycle(duplicate)
+        assert record is not None
+        assert record["stage"] == RequestStage.MECH_SUBMITTED.value
+        assert inbox.requests_of(duplicate) == {}
+
+        # once the result is available, the duplicates are served by the cache
+        inbox.cache_result(nonce, "result")
+        late = inbox.put({**REQUEST, "address": "0x3"})
+        assert inbox.queue_size == 1
+        assert late not in inbox.requests_of(nonce)
+        inbox.add_response({"nonce": nonce})
+        served = inbox.get()
+        assert served is not None
+        assert served["nonce"] == late
+        assert served["result"] == "result"
+
+    def test_processing_failure(self, tmp_path: Path) -> None:
+        """Test that a duplicate coalesced into the request waiting on the mech is re-queued with it."""
+        inbox = InBox(LOGGER, db=str(tmp_path / "db.json"), max_retries=1)
+        nonce = inbox.put(dict(REQUEST))
+        inbox.get()
+        duplicate = inbox.put({**REQUEST, "address": "0x2"})
+        inbox.fail(nonce, "error")
+        assert inbox.queue_size == 1
+        retried = inbox.get()
+        assert retried is not None
+        assert retried["nonce"] == nonce
+        assert inbox.requests_of(nonce) == {nonce: "0x1", duplicate: "0x2"}
+
+
+class TestLongPolling:
+    """Test the long-polling of the requests' stages."""
+
+    def test_get_request_wait(self, inbox: InBox) -> None:
+        """Test that the response is deferred while the request is at the polled stage, and sent right away otherwise."""
+        app = HttpApplication(inbox=inbox, auth="")
+        nonce = inbox.put(dict(REQUEST))
+
+        def get(query: str = "") -> Optional[dict]:
+            """Long-poll the request."""
+            request = message("get", f"/requests/{nonce}/wait{query}")
+            return app.handle(request)  # type: ignore
+
+        assert get() is None
+        assert get("?stage=queued") is None
+        response = get("?stage=mech_submitted")
+        assert response is not None
+        assert response["code"] == HttpResponseCode.OK
+        assert response["data"]["stage"] == RequestStage.QUEUED.value
+
+        inbox.set_stage(nonce, RequestStage.FAILED, error="error")
+        response = get("?stage=failed")
+        assert response is not None
+        assert response["data"]["stage"] == RequestStage.FAILED.value
+
+        unknown = app.handle(message("get", f"/requests/{'0' * 32}/wait"))  # type: ignore
+        assert unknown is not None
+        assert unknown["code"] == HttpResponseCode.NOT_FOUND
+
+    def test_stage_change(self, handler: HttpHandler) -> None:
+        """Test that the deferred long-polls are responded to once their request changes stage."""
+        state = handler.context.state
+        nonce, other = state.inbox.put(dict(REQUEST)), state.inbox.put(
+            {**REQUEST, "tool": "t"}
+        )
+        assert wait(handler, nonce) is None
+        assert wait(handler, nonce, "?stage=queued") is None
+        assert wait(handler, other) is None
+
+        state.inbox.set_stage(nonce, RequestStage.MECH_SUBMITTED, mech_tx_hash="0x")
+        data = responses(handler)
+        assert len(data) == 2
+        assert all(record["stage"] == "mech_submitted" for record in data)
+        assert data[0]["mech_tx_hash"] == "0x"
+        assert list(handler._waiting) == [other]
+
+        # a stage change without any waiting long-poll does not respond
+        state.inbox.set_stage(nonce, RequestStage.DELIVERED)
+        assert len(responses(handler)) == 2
+
+    def test_expire_waiting(self, handler: HttpHandler) -> None:
+        """Test that the long-polls are responded to with the current stage once they time out."""
+        state = handler.context.state
+        nonce = state.inbox.put(dict(REQUEST))
+        with mock.patch.object(handlers.time, "time", return_value=0.0):
+            assert wait(handler, nonce) is None
+        with mock.patch.object(handlers.time, "time", return_value=1.0):
+            assert wait(handler, nonce) is None
+
+        handler.expire_waiting(LONG_POLL_TIMEOUT - 1)
+        assert responses(handler) == []
+        handler.expire_waiting(LONG_POLL_TIMEOUT)
+        (record,) = responses(handler)
+        assert record["stage"] == RequestStage.QUEUED.value
+        assert len(handler._waiting[nonce]) == 1
+
+        handler.expire_waiting(LONG_POLL_TIMEOUT + 1)
+        assert len(responses(handler)) == 2
+        assert handler._waiting == {}
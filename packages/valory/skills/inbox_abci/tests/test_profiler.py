@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the profiler.py module of the Inbox."""
+
+import threading
+import time
+from typing import Generator
+
+import pytest
+
+from packages.valory.skills.inbox_abci.profiler import (
+    SPEEDSCOPE_SCHEMA,
+    SamplingProfiler,
+)
+
+
+def busy_loop(stop: threading.Event) -> None:
+    """Keep the thread busy until stopped."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread() -> Generator[threading.Thread, None, None]:
+    """A thread running a busy loop."""
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), daemon=True)
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+def wait(profiler: SamplingProfiler, timeout: float = 5.0) -> None:
+    """Wait for the running profile to finish."""
+    deadline = time.monotonic() + timeout
+    while profiler.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not profiler.running
+
+
+class TestSamplingProfiler:
+    """Test SamplingProfiler of Inbox."""
+
+    def test_inactive(self) -> None:
+        """Test that nothing runs before a profile is started."""
+        profiler = SamplingProfiler()
+        assert not profiler.running
+        assert profiler.samples == 0
+        assert profiler.collapsed() == "\n"
+
+    def test_collapsed(self, busy_thread: threading.Thread) -> None:
+        """Test that the samples of the profiled thread are aggregated per stack, from the root to the leaf."""
+        profiler = SamplingProfiler(interval=0.001)
+        assert profiler.start(0.2, busy_thread.ident)
+        assert not profiler.start(0.2, busy_thread.ident)
+        wait(profiler)
+
+        assert profiler.samples > 0
+        lines = profiler.collapsed().splitlines()
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        stacks = [line.rsplit(" ", 1)[0].split(";") for line in lines]
+        assert all(
+            any(frame.startswith("busy_loop ") for frame in stack) for stack in stacks
+        )
+        assert all(stack[0].startswith("_bootstrap ") for stack in stacks)
+
+    def test_speedscope(self, busy_thread: threading.Thread) -> None:
+        """Test that the profile is exported in speedscope's format, weighted in seconds."""
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start(0.1, busy_thread.ident)
+        wait(profiler)
+
+        profile = profiler.speedscope("test")
+        assert profile["$schema"] == SPEEDSCOPE_SCHEMA
+        frames = profile["shared"]["frames"]
+        sampled = profile["profiles"][0]
+        assert sampled["type"] == "sampled"
+        assert len(sampled["samples"]) == len(sampled["weights"])
+        assert sum(sampled["weights"]) == pytest.approx(profiler.samples * 0.001)
+        assert all(
+            0 <= index < len(frames) for stack in sampled["samples"] for index in stack
+        )
+        assert any(frame["name"].startswith("busy_loop ") for frame in frames)
+
+    def test_stop(self, busy_thread: threading.Thread) -> None:
+        """Test that a running profile can be stopped and a new one started, discarding it."""
+        profiler = SamplingProfiler()
+        profiler.start(60, busy_thread.ident)
+        profiler.stop()
+        wait(profiler)
+        assert profiler.ended is not None
+        assert profiler.start(0.01, busy_thread.ident)
+        wait(profiler)
+
+    def test_missing_thread(self) -> None:
+        """Test that a profile of a thread which does not exist ends right away."""
+        profiler = SamplingProfiler()
+        profiler.start(60, thread_id=-1)
+        wait(profiler)
+        assert profiler.samples == 0
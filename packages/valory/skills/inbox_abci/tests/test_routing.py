@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the routing.py module of the Inbox."""
+
+import types
+
+import pytest
+
+from packages.valory.skills.inbox_abci.routing import (
+    HttpRequest,
+    Route,
+    RouteTable,
+    compile_template,
+)
+
+
+ROUTES = [
+    Route("get", "/responses", "get_responses"),
+    Route("post", "/generate", "post_generate"),
+    Route("get", "/requests/{nonce}", "get_request"),
+    Route("get", "/requests/{nonce}/wait", "get_request_wait"),
+]
+
+
+def message(url: str, headers: str = "") -> types.SimpleNamespace:
+    """An http request message."""
+    return types.SimpleNamespace(method="get", url=url, headers=headers, body=b"")
+
+
+def test_compile_template() -> None:
+    """Test that the parameters match a path segment, unless given their patterns, and the rest matches literally."""
+    pattern = compile_template("/requests/{nonce}.json")
+    assert pattern.fullmatch("/requests/ab/c.json") is None
+    assert pattern.fullmatch("/requests/abXjson") is None
+    assert pattern.fullmatch("/requests/ab.json").groupdict() == {"nonce": "ab"}
+    hex_pattern = compile_template("/requests/{nonce}", {"nonce": "[0-9a-f]+"})
+    assert hex_pattern.fullmatch("/requests/XYZ") is None
+    with pytest.raises(ValueError):
+        compile_template("/requests/{nonce")
+
+
+class TestRouteTable:
+    """Test RouteTable of Inbox."""
+
+    def test_resolve(self) -> None:
+        """Test that the routes are resolved by their method and path, with the parameters in the path."""
+        table = RouteTable(ROUTES, {"nonce": "[0-9a-f]+"})
+        assert table.resolve("get", "/responses") == (ROUTES[0], {})
+        assert table.resolve("get", "/requests/ab12") == (ROUTES[2], {"nonce": "ab12"})
+        assert table.resolve("get", "/requests/ab12/wait") == (
+            ROUTES[3],
+            {"nonce": "ab12"},
+        )
+        assert table.resolve("post", "/responses") == (None, {})
+        assert table.resolve("get", "/requests/XYZ") == (None, {})
+        assert table.resolve("get", "/requests/ab12/") == (None, {})
+        assert sorted(table, key=ROUTES.index) == ROUTES
+
+
+class TestHttpRequest:
+    """Test HttpRequest of Inbox."""
+
+    def test_lazy_parsing(self) -> None:
+        """Test that the url is split on arrival, while the query and the headers are parsed on first access."""
+        request = HttpRequest(
+            message(
+                "http://localhost:8000/responses?limit=2&sortBy=id&limit=3",
+                headers="Content-Type: application/json\nAuthorization: a: b\n",
+            )
+        )
+        assert request.path == "/responses"
+        assert request._query is None
+        assert request._headers is None
+        assert request.query == {"limit": ["2", "3"], "sortBy": ["id"]}
+        assert request.query is request.query
+        assert request.headers == {
+            "Content-Type": "application/json",
+            "Authorization": "a: b",
+        }
+
+    def test_malformed_headers(self) -> None:
+        """Test that the lines which are not headers are skipped."""
+        request = HttpRequest(message("http://localhost/", headers="\ninvalid\n"))
+        assert request.headers == {}
+        assert request.route is None
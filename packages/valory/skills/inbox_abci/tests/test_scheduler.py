@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the scheduler.py module of the Inbox."""
+
+import json
+import random
+from typing import Dict, List, Union
+
+from packages.valory.skills.inbox_abci.scheduler import FairQueue, ToolQueues
+
+
+def request(nonce: str, address: str, tool: str = "tool") -> Dict:
+    """Create a request submitted by the given address."""
+    return {"nonce": nonce, "address": address, "prompt": "prompt", "tool": tool}
+
+
+def drain(queue: Union[FairQueue, ToolQueues]) -> List[str]:
+    """Dequeue all the requests, returning their nonces in service order."""
+    served = []
+    while len(queue) > 0:
+        served.append(queue.pop()["nonce"])
+    return served
+
+
+class TestFairQueue:
+    """Test FairQueue of Inbox."""
+
+    def test_fifo_per_address(self) -> None:
+        """Test that the requests of a single address are served in order."""
+        queue = FairQueue()
+        for i in range(5):
+            queue.push(request(str(i), "heavy"))
+        assert drain(queue) == ["0", "1", "2", "3", "4"]
+        assert queue.pop() is None
+
+    def test_round_robin(self) -> None:
+        """Test that the addresses are served in turns, regardless of how many requests they queued."""
+        queue = FairQueue()
+        for i in range(3):
+            queue.push(request(f"a{i}", "a"))
+        queue.push(request("b0", "b"))
+        queue.push(request("b1", "b"))
+        assert drain(queue) == ["a0", "b0", "a1", "b1", "a2"]
+
+    def test_bounded_wait_for_light_users(self) -> None:
+        """
+        Simulate a heavy address flooding the queue while light users keep arriving.
+
+        With a FIFO, a light user arriving after the flood waits for all of it.
+        With the fair queue, the wait is bounded by the number of active addresses.
+        """
+        queue = FairQueue()
+        for i in range(500):
+            queue.push(request(f"heavy{i}", "heavy"))
+
+        waits = {}
+        arrivals = {}
+        for tick in range(600):
+            # a new light user arrives every 5 requests served
+            if tick % 5 == 0 and tick < 300:
+                nonce = f"light{tick}"
+                queue.push(request(nonce, f"light-address{tick}"))
+                arrivals[nonce] = tick
+                # at most the heavy flow and the light user which arrived before are ahead
+                assert queue.position(nonce) <= 2
+            if len(queue) == 0:
+                break
+            served = queue.pop()["nonce"]
+            if served in arrivals:
+                waits[served] = tick - arrivals[served]
+
+        assert len(waits) == len(arrivals)
+        assert max(waits.values()) <= 2
+
+    def test_weights(self) -> None:
+        """Test that an address with a double weight gets twice the share of the processing."""
+        queue = FairQueue(weights={"priority": 2.0})
+        for i in range(20):
+            queue.push(request(f"p{i}", "priority"))
+            queue.push(request(f"n{i}", "normal"))
+        first_served = drain(queue)[:15]
+        assert sum(nonce.startswith("p") for nonce in first_served) == 10
+
+    def test_idle_address_gets_no_credit(self) -> None:
+        """Test that an address cannot save up turns while it has nothing queued."""
+        queue = FairQueue()
+        queue.push(request("a0", "a"))
+        queue.pop()
+        for i in range(6):
+            queue.push(request(f"b{i}", "b"))
+        for _ in range(4):
+            queue.pop()
+        for i in range(1, 4):
+            queue.push(request(f"a{i}", "a"))
+        assert drain(queue) == ["a1", "b4", "a2", "b5", "a3"]
+
+    def test_positions(self) -> None:
+        """Test that the positions reflect the service order, including for coalesced requests."""
+        queue = FairQueue()
+        for i in range(3):
+            queue.push(request(f"a{i}", "a"))
+        primary = request("b0", "b")
+        queue.push(primary)
+        # the inbox records the coalesced requests on the queued one
+        primary["coalesced"] = [request("b0-duplicate", "c")]
+        queue.alias("b0-duplicate", "b0")
+        assert queue.position("a0") == 0
+        assert queue.position("b0") == 1
+        assert queue.position("b0-duplicate") == 1
+        assert queue.position("a2") == 3
+        assert queue.position("unknown") is None
+
+        queue.pop()
+        assert queue.position("b0") == 0
+        queue.pop()
+        assert queue.position("b0") is None
+        assert queue.position("b0-duplicate") is None
+
+    def test_persistence(self) -> None:
+        """Test that the queue keeps its order and state across a restart."""
+        queue = FairQueue()
+        for i in range(3):
+            queue.push(request(f"a{i}", "a"))
+        queue.push(request("b0", "b"))
+        queue.pop()
+        persisted = json.loads(
+            json.dumps({"queue": queue.requests(), "scheduler": queue.serialize()})
+        )
+        assert [r["nonce"] for r in persisted["queue"]] == ["b0", "a1", "a2"]
+
+        restored = FairQueue()
+        restored.load(persisted["scheduler"])
+        for queued in persisted["queue"]:
+            restored.restore(queued)
+        # the flows continue where they left off
+        restored.push(request("b1", "b"))
+        queue.push(request("b1", "b"))
+        assert drain(restored) == drain(queue) == ["b0", "a1", "b1", "a2"]
+
+
+class TestToolQueues:
+    """Test ToolQueues of Inbox."""
+
+    def test_quick_tools_do_not_wait_behind_slow_ones(self) -> None:
+        """Test that the tools take turns, instead of the requests being served in arrival order."""
+        queue = ToolQueues()
+        for i in range(10):
+            queue.push(request(f"video{i}", "a", "text-to-video"))
+        for i in range(3):
+            queue.push(request(f"text{i}", "b", "text-to-image"))
+        assert drain(queue)[:6] == [
+            "video0",
+            "text0",
+            "video1",
+            "text1",
+            "video2",
+            "text2",
+        ]
+
+    def test_batch_sizes(self) -> None:
+        """Test that each turn dispatches up to the tool's batch size of requests in a row."""
+        queue = ToolQueues(batch_sizes={"text-to-image": 3})
+        for i in range(4):
+            queue.push(request(f"video{i}", "a", "text-to-video"))
+            queue.push(request(f"text{i}", "a", "text-to-image"))
+        assert drain(queue) == [
+            "video0",
+            "text0",
+            "text1",
+            "text2",
+            "video1",
+            "text3",
+            "video2",
+            "video3",
+        ]
+        assert len(queue) == 0
+        assert queue.tools == []
+
+    def test_fair_within_tool(self) -> None:
+        """Test that the requests of each tool are still shared fairly among the addresses."""
+        queue = ToolQueues()
+        for i in range(3):
+            queue.push(request(f"a{i}", "a"))
+        queue.push(request("b0", "b"))
+        assert drain(queue) == ["a0", "b0", "a1", "a2"]
+
+    def test_ahead_matches_dispatch_order(self) -> None:
+        """Test that the requests ahead of every queued request match the actual dispatch order."""
+        rng = random.Random(0)
+        tools = ["video", "image", "text"]
+        queue = ToolQueues(batch_sizes={"image": 2, "text": 4})
+        for i in range(60):
+            queue.push(request(str(i), rng.choice("abc"), rng.choice(tools)))
+        # start in the middle of a turn
+        for _ in range(5):
+            queue.pop()
+
+        queued = {r["nonce"]: r["tool"] for r in queue.requests()}
+        positions = {nonce: queue.position(nonce) for nonce in queued}
+        new_request_ahead = {tool: queue.ahead(None, tool) for tool in tools}
+        order = drain(queue)
+        assert positions == {nonce: i for i, nonce in enumerate(order)}
+        # a new request from a busy address waits for all the queued requests of its tool
+        for tool, ahead in new_request_ahead.items():
+            assert ahead is not None
+            assert ahead[tool] == sum(
+                queued_tool == tool for queued_tool in queued.values()
+            )
+
+    def test_ahead_of_new_request_for_idle_tool(self) -> None:
+        """Test that a new request for an idle tool waits for the end of the current round only."""
+        queue = ToolQueues(batch_sizes={"text": 2})
+        for i in range(5):
+            queue.push(request(f"text{i}", "a", "text"))
+            queue.push(request(f"video{i}", "a", "video"))
+        assert queue.ahead(None, "image") == {"text": 2, "video": 1}
+        assert queue.ahead("unknown", "image") is None
+
+    def test_coalesced_positions(self) -> None:
+        """Test that a coalesced request shares the position of the queued one."""
+        queue = ToolQueues()
+        queue.push(request("video0", "a", "video"))
+        primary = request("text0", "a", "text")
+        queue.push(primary)
+        primary["coalesced"] = [request("text0-duplicate", "b", "text")]
+        queue.alias("text0-duplicate", "text0")
+        assert queue.position("text0-duplicate") == queue.position("text0") == 1
+        queue.pop()
+        queue.pop()
+        assert queue.position("text0-duplicate") is None
+
+    def test_persistence(self) -> None:
+        """Test that the tools' queues keep their order across a restart."""
+        queue = ToolQueues()
+        for i in range(3):
+            queue.push(request(f"video{i}", "a", "video"))
+            queue.push(request(f"text{i}", f"address{i}", "text"))
+        queue.pop()
+        persisted = json.loads(
+            json.dumps({"queue": queue.requests(), "scheduler": queue.serialize()})
+        )
+        restored = ToolQueues()
+        restored.load(persisted["scheduler"])
+        for queued in persisted["queue"]:
+            restored.restore(queued)
+        assert drain(restored) == drain(queue)
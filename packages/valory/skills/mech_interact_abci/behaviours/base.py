@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -23,25 +23,144 @@ import json
 from abc import ABC
 from dataclasses import asdict, is_dataclass
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any, Callable, Generator, List, Optional, cast
 
 from aea.configurations.data_types import PublicId
 
 from packages.valory.contracts.mech_shorts.contract import Mech
 from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.protocols.ledger_api import LedgerApiMessage
 from packages.valory.skills.abstract_round_abci.base import BaseTxPayload
 from packages.valory.skills.abstract_round_abci.behaviour_utils import (
     BaseBehaviour,
     TimeoutException,
 )
-from packages.valory.skills.mech_interact_abci.models import MechParams, MultisendBatch
+from packages.valory.skills.mech_interact_abci.models import (
+    HttpPool,
+    MechParams,
+    MechRouter,
+    Metrics,
+    MultisendBatch,
+    RequestTracer,
+)
 from packages.valory.skills.mech_interact_abci.states.base import SynchronizedData
 
 
 WaitableConditionType = Generator[None, None, bool]
 
 
-class MechInteractBaseBehaviour(BaseBehaviour, ABC):
+def condition_name(condition_gen: Callable) -> str:
+    """Get the name of a condition, unwrapping the partially applied ones."""
+    while isinstance(condition_gen, partial):
+        condition_gen = condition_gen.func
+    return getattr(condition_gen, "__name__", type(condition_gen).__name__)
+
+
+class TracedBehaviour(BaseBehaviour, ABC):
+    """A behaviour whose external calls are traced, as part of the requests of the current period."""
+
+    @property
+    def tracer(self) -> RequestTracer:
+        """Get the tracer of the requests."""
+        return cast(RequestTracer, self.context.tracer)
+
+    @property
+    def traced_nonces(self) -> List[str]:
+        """Get the nonces of the requests of the current period."""
+        return list(self.synchronized_data.db.get("requests", {}))
+
+    @property
+    def metrics(self) -> Metrics:
+        """Get the agent's metrics."""
+        return cast(Metrics, self.context.metrics)
+
+    def _count_call(self, kind: str, name: str, failed: bool) -> None:
+        """Count a call to an external service."""
+        self.metrics.external_calls.labels(kind, name).inc()
+        if failed:
+            self.metrics.external_call_errors.labels(kind, name).inc()
+
+    def get_contract_api_response(  # pylint: disable=too-many-arguments
+        self,
+        performative: ContractApiMessage.Performative,
+        contract_address: Optional[str],
+        contract_id: str,
+        contract_callable: str,
+        ledger_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Generator[None, None, ContractApiMessage]:
+        """Request the contract API, recording a span."""
+        with self.tracer.span(
+            contract_callable,
+            "contract_api",
+            self.traced_nonces,
+            contract_id=contract_id,
+        ) as span:
+            try:
+                response = yield from super().get_contract_api_response(
+                    performative,
+                    contract_address,
+                    contract_id,
+                    contract_callable,
+                    ledger_id,
+                    **kwargs,
+                )
+            except Exception:
+                self._count_call("contract_api", contract_callable, failed=True)
+                raise
+            span["attributes"]["performative"] = response.performative.value
+        failed = response.performative == ContractApiMessage.Performative.ERROR
+        self._count_call("contract_api", contract_callable, failed)
+        return response
+
+    def get_ledger_api_response(
+        self,
+        performative: LedgerApiMessage.Performative,
+        ledger_callable: str,
+        **kwargs: Any,
+    ) -> Generator[None, None, LedgerApiMessage]:
+        """Request the ledger API, recording a span."""
+        with self.tracer.span(
+            ledger_callable, "ledger_api", self.traced_nonces
+        ) as span:
+            try:
+                response = yield from super().get_ledger_api_response(
+                    performative, ledger_callable, **kwargs
+                )
+            except Exception:
+                self._count_call("ledger_api", ledger_callable, failed=True)
+                raise
+            span["attributes"]["performative"] = response.performative.value
+        failed = response.performative == LedgerApiMessage.Performative.ERROR
+        self._count_call("ledger_api", ledger_callable, failed)
+        return response
+
+    def send_to_ipfs(self, *args: Any, **kwargs: Any) -> Generator[None, None, Any]:
+        """Send an object to IPFS, recording a span."""
+        with self.tracer.span("send", "ipfs", self.traced_nonces) as span:
+            try:
+                ipfs_hash = yield from super().send_to_ipfs(*args, **kwargs)
+            except Exception:
+                self._count_call("ipfs", "send", failed=True)
+                raise
+            span["attributes"]["ipfs_hash"] = ipfs_hash
+        self._count_call("ipfs", "send", failed=ipfs_hash is None)
+        return ipfs_hash
+
+    def get_from_ipfs(self, *args: Any, **kwargs: Any) -> Generator[None, None, Any]:
+        """Get an object from IPFS, recording a span."""
+        with self.tracer.span("get", "ipfs", self.traced_nonces):
+            try:
+                result = yield from super().get_from_ipfs(*args, **kwargs)
+            except Exception:
+                self._count_call("ipfs", "get", failed=True)
+                raise
+        self._count_call("ipfs", "get", failed=result is None)
+        return result
+
+
+class MechInteractBaseBehaviour(TracedBehaviour, ABC):
     """Represents the base class for the mech interaction FSM behaviour."""
 
     def __init__(self, **kwargs: Any) -> None:
@@ -61,6 +180,22 @@ class MechInteractBaseBehaviour(BaseBehaviour, ABC):
         """Return the params."""
         return cast(MechParams, self.context.params)
 
+    @property
+    def router(self) -> MechRouter:
+        """Get the mech router."""
+        return cast(MechRouter, self.context.mech_router)
+
+    @property
+    def http_pool(self) -> HttpPool:
+        """Get the pool of keep-alive HTTP connections."""
+        return cast(HttpPool, self.context.http_pool)
+
+    @property
+    def now(self) -> float:
+        """Get the consensus time."""
+        round_sequence = self.context.state.round_sequence
+        return round_sequence.last_round_transition_timestamp.timestamp()
+
     def default_error(
         self, contract_id: str, contract_callable: str, response_msg: ContractApiMessage
     ) -> None:
@@ -127,12 +262,19 @@ class MechInteractBaseBehaviour(BaseBehaviour, ABC):
         return True
 
     def _mech_contract_interact(
-        self, contract_callable: str, data_key: str, placeholder: str, **kwargs: Any
+        self,
+        contract_callable: str,
+        data_key: str,
+        placeholder: str,
+        mech_address: Optional[str] = None,
+        **kwargs: Any,
     ) -> WaitableConditionType:
-        """Interact with the mech contract."""
+        """Interact with the given mech contract, defaulting to the configured mech."""
+        if not mech_address:
+            mech_address = self.params.mech_agent_address
         status = yield from self.contract_interact(
             performative=ContractApiMessage.Performative.GET_RAW_TRANSACTION,  # type: ignore
-            contract_address=self.params.mech_agent_address,
+            contract_address=mech_address,
             contract_public_id=Mech.contract_id,
             contract_callable=contract_callable,
             data_key=data_key,
@@ -162,13 +304,15 @@ class MechInteractBaseBehaviour(BaseBehaviour, ABC):
             if timeout is not None
             else datetime.max
         )
+        retries = self.metrics.condition_retries.labels(condition_name(condition_gen))
 
         while True:
             condition_satisfied = yield from condition_gen()
             if condition_satisfied:
                 break
-            if timeout is not None and datetime.now() > deadline:
+            if timeout is not None and datetime.now() >= deadline:
                 raise TimeoutException()
+            retries.inc()
             self.context.logger.info(f"Retrying in {self.params.sleep_time} seconds.")
             yield from self.sleep(self.params.sleep_time)
 
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -22,6 +22,7 @@
 import json
 from abc import ABC
 from dataclasses import asdict
+from functools import partial
 from pathlib import Path
 from tempfile import mkdtemp
 from typing import Any, Generator, List, Optional, cast
@@ -83,6 +84,8 @@ class MechRequestBehaviour(MechInteractBaseBehaviour):
         self._v1_hex_truncated: str = ""
         self._request_data: bytes = b""
         self._price: int = 0
+        self._quoted_price: int = 0
+        self._current_mech: str = ""
         self._mech_requests: List[MechMetadata] = []
         self._pending_responses: List[MechInteractionResponse] = []
 
@@ -111,6 +114,22 @@ class MechRequestBehaviour(MechInteractBaseBehaviour):
         """Set the price."""
         self._price = price
 
+    @property
+    def quoted_price(self) -> int:
+        """Get the latest price quoted by a mech."""
+        return self._quoted_price
+
+    @quoted_price.setter
+    def quoted_price(self, price: int) -> None:
+        """Set the latest price quoted by a mech."""
+        self._quoted_price = price
+
+    @property
+    def deadline(self) -> float:
+        """Get the deadline for the mech to deliver the responses of the requests being prepared."""
+        # use the consensus time so that all the agents agree on the deadline
+        return self.now + self.params.mech_response_timeout
+
     @property
     def safe_tx_hash(self) -> str:
         """Get the safe_tx_hash."""
@@ -226,6 +245,7 @@ class MechRequestBehaviour(MechInteractBaseBehaviour):
     def setup(self) -> None:
         """Set up the `MechRequest` behaviour."""
         self._mech_requests = self.synchronized_data.mech_requests
+        self.router.load(self.synchronized_data.mech_stats)
         self.context.logger.info(f"Processing mech requests: {self._mech_requests}")
 
     def _send_metadata_to_ipfs(
@@ -246,8 +266,17 @@ class MechRequestBehaviour(MechInteractBaseBehaviour):
         ipfs_link = self.params.ipfs_address + v1_file_hash_hex
         self.context.logger.info(f"Prompt uploaded: {ipfs_link}")
         mech_request_data = v1_file_hash_hex[9:]
+        candidates = self.params.mech_candidates(metadata.tool)
+        self._current_mech = self.router.route(metadata.nonce, candidates)
+        self.price += self.router.price(self._current_mech)
+        self.context.logger.info(
+            f"Routing request {metadata.nonce!r} to mech {self._current_mech}."
+        )
         pending_response = MechInteractionResponse(
-            nonce=metadata.nonce, data=mech_request_data
+            nonce=metadata.nonce,
+            data=mech_request_data,
+            mech=self._current_mech,
+            deadline=self.deadline,
         )
         self._v1_hex_truncated = Ox + mech_request_data
         self._pending_responses.append(pending_response)
@@ -259,13 +288,14 @@ class MechRequestBehaviour(MechInteractBaseBehaviour):
             "get_request_data",
             "data",
             get_name(MechRequestBehaviour.request_data),
+            mech_address=self._current_mech,
             request_data=self._v1_hex_truncated,
             chain_id=GNOSIS_CHAIN_ID,
         )
 
         if status:
             batch = MultisendBatch(
-                to=self.params.mech_agent_address,
+                to=self._current_mech,
                 data=HexBytes(self.request_data),
                 value=0,
             )
@@ -273,20 +303,36 @@ class MechRequestBehaviour(MechInteractBaseBehaviour):
 
         return status
 
-    def _get_price(self) -> WaitableConditionType:
-        """Get the price of the mech request."""
+    def _get_price(self, mech: str) -> WaitableConditionType:
+        """Get the price of the given mech's requests and cache it in the router."""
         result = yield from self._mech_contract_interact(
             "get_price",
             "price",
-            get_name(MechRequestBehaviour.price),
+            get_name(MechRequestBehaviour.quoted_price),
+            mech_address=mech,
             chain_id=GNOSIS_CHAIN_ID,
         )
+        if result:
+            self.router.update_price(mech, self.quoted_price, self.now)
         return result
 
+    def _stale_priced_mechs(self, n_iters: int) -> List[str]:
+        """Get the candidate mechs of the next requests whose cached price has expired."""
+        # the requests are popped from the end of the list
+        next_requests = self._mech_requests[len(self._mech_requests) - n_iters :]
+        mechs = []
+        for request in next_requests:
+            for mech in self.params.mech_candidates(request.tool):
+                if mech not in mechs and self.router.is_price_stale(mech, self.now):
+                    mechs.append(mech)
+        return mechs
+
     def _prepare_safe_tx(self) -> Generator:
-        """Prepare a multisend safe tx for sending requests to a mech and return the hex for the tx settlement skill."""
+        """Prepare a multisend safe tx for sending requests to the routed mechs and return the hex for the tx settlement skill."""
         n_iters = min(self.params.multisend_batch_size, len(self._mech_requests))
-        steps = (self._get_price,)
+        steps = tuple(
+            partial(self._get_price, mech) for mech in self._stale_priced_mechs(n_iters)
+        )
         steps += (self._send_metadata_to_ipfs, self._build_request_data) * n_iters
         steps += (self._build_multisend_data, self._build_multisend_safe_tx_hash)
 
@@ -298,7 +344,7 @@ class MechRequestBehaviour(MechInteractBaseBehaviour):
         with self.context.benchmark_tool.measure(self.behaviour_id).local():
             if not self._mech_requests:
                 payload = MechRequestPayload(
-                    self.context.agent_address, None, None, None, None
+                    self.context.agent_address, None, None, None, None, None
                 )
             else:
                 self.context.logger.info(
@@ -317,6 +363,7 @@ class MechRequestBehaviour(MechInteractBaseBehaviour):
                     self.tx_hex,
                     self.price,
                     *serialized_data,
+                    self.router.serialize(),
                 )
         yield from self.finish_behaviour(payload)
 
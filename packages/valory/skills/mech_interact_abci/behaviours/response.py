@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -20,13 +20,18 @@
 """This module contains the response state of the mech interaction abci app."""
 
 import json
+from datetime import datetime, timedelta
+from functools import partial
 from typing import Any, Dict, Generator, List, Optional
+from urllib.parse import urlencode
 
 from web3.constants import ADDRESS_ZERO
 
 from packages.valory.contracts.mech_shorts.contract import Mech
 from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.protocols.http.message import HttpMessage
 from packages.valory.skills.abstract_round_abci.base import get_name
+from packages.valory.skills.abstract_round_abci.behaviour_utils import TimeoutException
 from packages.valory.skills.mech_interact_abci.behaviours.base import (
     DataclassEncoder,
     MechInteractBaseBehaviour,
@@ -36,7 +41,10 @@ from packages.valory.skills.mech_interact_abci.behaviours.request import (
     GNOSIS_CHAIN_ID,
     V1_HEX_PREFIX,
 )
-from packages.valory.skills.mech_interact_abci.models import MechResponseSpecs
+from packages.valory.skills.mech_interact_abci.models import (
+    DeliverSubscription,
+    MechResponseSpecs,
+)
 from packages.valory.skills.mech_interact_abci.payloads import MechResponsePayload
 from packages.valory.skills.mech_interact_abci.states.base import (
     MechInteractionResponse,
@@ -58,7 +66,9 @@ class MechResponseBehaviour(MechInteractBaseBehaviour):
         super().__init__(**kwargs)
         self._from_block: int = 0
         self._requests: List[MechRequest] = []
+        self._routed_requests: List[MechRequest] = []
         self._response_hex: str = ""
+        self._delivered: Dict[str, Any] = {}
         self._mech_responses: List[
             MechInteractionResponse
         ] = self.synchronized_data.mech_responses
@@ -100,6 +110,44 @@ class MechResponseBehaviour(MechInteractBaseBehaviour):
             msg = f"Response hash {response_hash!r} is not valid hex bytes!"
             self.context.logger.error(msg)
 
+    @property
+    def mechs(self) -> List[str]:
+        """Get the addresses of the mechs which the pending responses have been routed to."""
+        mechs = []
+        for response in self._mech_responses:
+            mech = self._mech_of(response)
+            if mech not in mechs:
+                mechs.append(mech)
+        return mechs
+
+    def _mech_of(self, request: MechRequest) -> str:
+        """Get the address of the mech which the given request has been routed to."""
+        return request.mech or self.params.mech_agent_address
+
+    def get_subscription(self, mech: str) -> DeliverSubscription:
+        """Get the subscription to the given mech's `Deliver` events, shared across the round's retries."""
+        subscriptions = getattr(self.context.state, "deliver_subscriptions", None)
+        if subscriptions is None:
+            subscriptions = {}
+            self.context.state.deliver_subscriptions = subscriptions
+        return subscriptions.setdefault(mech, DeliverSubscription())
+
+    @property
+    def subscription(self) -> DeliverSubscription:
+        """Get the subscription to the `Deliver` events of the current response's mech."""
+        return self.get_subscription(self._mech_of(self._current_mech_response))
+
+    @property
+    def delivered(self) -> Dict[str, Any]:
+        """Get the result of the latest scan for `Deliver` events."""
+        return self._delivered
+
+    @delivered.setter
+    def delivered(self, delivered: Dict[str, Any]) -> None:
+        """Set the result of the latest scan for `Deliver` events and push them to the subscription."""
+        self._delivered = delivered
+        self.subscription.push(delivered["events"], delivered["to_block"])
+
     @property
     def mech_response_api(self) -> MechResponseSpecs:
         """Get the mech response api specs."""
@@ -113,6 +161,13 @@ class MechResponseBehaviour(MechInteractBaseBehaviour):
     def setup(self) -> None:
         """Set up the `MechResponse` behaviour."""
         self._mech_responses = self.synchronized_data.mech_responses
+        self.router.load(
+            self.synchronized_data.mech_stats,
+            {
+                response.nonce: self._mech_of(response)
+                for response in self._mech_responses
+            },
+        )
 
     def set_mech_response_specs(self, request_id: int) -> None:
         """Set the mech's response specs."""
@@ -139,38 +194,64 @@ class MechResponseBehaviour(MechInteractBaseBehaviour):
 
         return result
 
-    def _process_request_event(self) -> WaitableConditionType:
-        """Process the request event."""
+    def _process_request_event(self, mech: str) -> WaitableConditionType:
+        """Process the request events emitted by the given mech."""
+        expected_logs = sum(
+            1 for response in self._mech_responses if self._mech_of(response) == mech
+        )
         result = yield from self._mech_contract_interact(
             contract_callable="process_request_event",
             data_key="results",
             placeholder=get_name(MechResponseBehaviour.requests),
+            mech_address=mech,
             tx_hash=self.synchronized_data.final_tx_hash,
-            expected_logs=len(self._mech_responses),
+            expected_logs=expected_logs,
             chain_id=GNOSIS_CHAIN_ID,
         )
+        if result:
+            for request in self.requests:
+                request.mech = mech
+            self._routed_requests.extend(self.requests)
         return result
 
-    def _get_response_hash(self) -> WaitableConditionType:
-        """Get the hash of the response data."""
-        request_id = self._current_mech_response.requestId
+    def _poll_deliveries(self) -> WaitableConditionType:
+        """Scan the blocks mined since the previous scan for the `Deliver` events of all the pending requests."""
         self.context.logger.info(
-            f"Filtering the mech's events from block {self.from_block} "
-            f"for a response to our request with id {request_id!r}."
+            f"Filtering the mech's events from block {self.subscription.from_block} "
+            f"for responses to our pending requests {self.subscription.pending}."
         )
         result = yield from self._mech_contract_interact(
-            contract_callable="get_response",
-            data_key="data",
-            placeholder=get_name(MechResponseBehaviour.response_hex),
-            request_id=request_id,
-            from_block=self.from_block,
+            contract_callable="get_delivered",
+            data_key="delivered",
+            placeholder=get_name(MechResponseBehaviour.delivered),
+            mech_address=self._mech_of(self._current_mech_response),
+            request_ids=self.subscription.pending,
+            from_block=self.subscription.from_block,
             chain_id=GNOSIS_CHAIN_ID,
         )
+        return result
 
-        if result:
-            self.set_mech_response_specs(request_id)
+    def _get_response_hash(self) -> WaitableConditionType:
+        """Get the hash of the response data."""
+        request_id = self._current_mech_response.requestId
+        if request_id in self.subscription.pending:
+            polled = yield from self._poll_deliveries()
+            if not polled:
+                return False
+
+        latency = self.subscription.latency(request_id)
+        data = self.subscription.pop(request_id)
+        if data is None:
+            self.context.logger.info(
+                f"The mech has not delivered a response yet for request with id {request_id!r}."
+            )
+            return False
 
-        return result
+        mech = self._mech_of(self._current_mech_response)
+        self.router.record_delivery(self._current_mech_response.nonce, mech, latency)
+        self.response_hex = data
+        self.set_mech_response_specs(request_id)
+        return True
 
     def _handle_response(
         self,
@@ -191,11 +272,41 @@ class MechResponseBehaviour(MechInteractBaseBehaviour):
         self.mech_response_api.reset_retries()
         return res
 
+    def _fetch_response(self) -> Generator[None, None, Optional[HttpMessage]]:
+        """Fetch the response from IPFS over a pooled keep-alive connection."""
+        specs = self.mech_response_api.get_spec()
+        url = specs["url"]
+        if specs["parameters"]:
+            url += f"?{urlencode(specs['parameters'])}"
+        with self.tracer.span("mech_response", "http", self.traced_nonces) as span:
+            future = self.http_pool.submit(
+                specs["method"], url, headers=specs["headers"]
+            )
+            yield from self.wait_for_condition(future.done)
+            error = future.exception()
+            if error is not None:
+                span["attributes"]["error"] = str(error)
+
+        if error is not None:
+            self.context.logger.error(f"Could not fetch {url}: {error}")
+            return None
+
+        status_code, body = future.result()
+        return HttpMessage(
+            performative=HttpMessage.Performative.RESPONSE,  # type: ignore
+            version="",
+            status_code=status_code,
+            status_text="",
+            headers="",
+            body=body,
+        )
+
     def _get_response(self) -> WaitableConditionType:
         """Get the response data from IPFS."""
-        specs = self.mech_response_api.get_spec()
-        res_raw = yield from self.get_http_response(**specs)
-        res = self.mech_response_api.process_response(res_raw)
+        res_raw = yield from self._fetch_response()
+        res = None
+        if res_raw is not None:
+            res = self.mech_response_api.process_response(res_raw)
         res = self._handle_response(res)
 
         if self.mech_response_api.is_retries_exceeded():
@@ -217,6 +328,7 @@ class MechResponseBehaviour(MechInteractBaseBehaviour):
         for pending_response in self._mech_responses:
             if (
                 pending_response.data == request.data.hex()
+                and self._mech_of(pending_response) == request.mech
             ):  # TODO: why is request.data bytes now?
                 pending_response.requestId = request.requestId
                 self._current_mech_response = pending_response
@@ -226,17 +338,33 @@ class MechResponseBehaviour(MechInteractBaseBehaviour):
         self,
     ) -> Generator:
         """Get the response."""
-        for step in (
-            self._get_block_number,
-            self._process_request_event,
-        ):
-            yield from self.wait_for_condition_with_sleep(step)
+        # the deadlines are all measured from the same local time, so that each request's waits are bounded by its own
+        started = datetime.now()
+        yield from self.wait_for_condition_with_sleep(self._get_block_number)
+        for mech in self.mechs:
+            yield from self.wait_for_condition_with_sleep(
+                partial(self._process_request_event, mech)
+            )
 
-        for request in self.requests:
+        for request in self._routed_requests:
+            self.get_subscription(request.mech).track(
+                (request.requestId,), self.from_block
+            )
+        for request in self._routed_requests:
             self._set_current_response(request)
-
-            for step in (self._get_response_hash, self._get_response):
-                yield from self.wait_for_condition_with_sleep(step)
+            deadline = self._local_deadline(started)
+
+            try:
+                for step in (self._get_response_hash, self._get_response):
+                    yield from self.wait_for_condition_with_sleep(
+                        step, self._time_left(deadline)
+                    )
+            except TimeoutException:
+                self._current_mech_response.deadline_exceeded()
+                self.subscription.untrack(request.requestId)
+                self.router.record_failure(
+                    self._current_mech_response.nonce, request.mech
+                )
 
             self.context.logger.info(
                 f"Response has been received:\n{self._current_mech_response}"
@@ -246,6 +374,29 @@ class MechResponseBehaviour(MechInteractBaseBehaviour):
                     f"There was an error in the mech's response: {self._current_mech_response.error}"
                 )
 
+    def _time_to_deadline(self) -> Optional[float]:
+        """Get the seconds left until the deadline of the current mech response, if it has one."""
+        deadline = self._current_mech_response.deadline
+        if deadline is None:
+            return None
+        # the deadline is derived from the consensus time, so it is compared against it rather than the local clock,
+        # so that all the agents agree on whether it has been exceeded
+        return max(deadline - self.now, 0.0)
+
+    def _local_deadline(self, started: datetime) -> Optional[datetime]:
+        """Get the local time by which the current mech response must be received, from the local time the waits started."""
+        time_to_deadline = self._time_to_deadline()
+        if time_to_deadline is None:
+            return None
+        return started + timedelta(seconds=time_to_deadline)
+
+    @staticmethod
+    def _time_left(deadline: Optional[datetime]) -> Optional[float]:
+        """Get the seconds left until the given local deadline, if any."""
+        if deadline is None:
+            return None
+        return max((deadline - datetime.now()).total_seconds(), 0.0)
+
     def async_act(self) -> Generator:
         """Do the action."""
 
@@ -260,6 +411,7 @@ class MechResponseBehaviour(MechInteractBaseBehaviour):
             payload = MechResponsePayload(
                 self.context.agent_address,
                 self.serialized_responses,
+                self.router.serialize(),
             )
 
         yield from self.finish_behaviour(payload)
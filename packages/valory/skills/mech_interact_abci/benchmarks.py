@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the rolling histograms of the behaviours' benchmarks."""
+
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# the fixed range of the recorded times, in seconds
+LOWEST = 1e-4
+HIGHEST = 86_400.0
+FILE_SUFFIX = ".json"
+
+
+class LogHistogram:
+    """
+    A fixed-memory histogram with logarithmic buckets, in the spirit of HDR histograms.
+
+    Every bucket is `1 + 2 * precision` times wider than the previous one,
+    so the percentiles are reported within the given relative error, whatever the number of the recorded values.
+    The values outside the fixed range are clamped into its first or last bucket.
+    """
+
+    __slots__ = ("precision", "_log_base", "counts", "count", "sum", "max")
+
+    def __init__(self, precision: float = 0.01) -> None:
+        """Initialize object."""
+        self.precision = precision
+        self._log_base = math.log1p(2 * precision)
+        size = int(math.log(HIGHEST / LOWEST) / self._log_base) + 2
+        self.counts = [0] * size
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        """Get the index of the bucket of a value."""
+        if value <= LOWEST:
+            return 0
+        index = int(math.log(value / LOWEST) / self._log_base) + 1
+        return min(index, len(self.counts) - 1)
+
+    def _value(self, index: int) -> float:
+        """Get the value representing a bucket, i.e., the geometric midpoint of its bounds."""
+        if index == 0:
+            return LOWEST
+        return LOWEST * math.exp((index - 0.5) * self._log_base)
+
+    def record(self, value: float) -> None:
+        """Record a value."""
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Add the values of another histogram with the same precision."""
+        if other.precision != self.precision:
+            raise ValueError(
+                f"Cannot merge a histogram with precision {other.precision} into one with {self.precision}."
+            )
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Get the nearest-rank percentile of the recorded values, or `None` if there are none."""
+        if not self.count:
+            return None
+        rank = max(math.ceil(q * self.count), 1)
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            # the values above the range are clamped into the last bucket, whose only known bound is the max
+            if cumulative >= rank and index < len(self.counts) - 1:
+                return min(self._value(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Summarise the recorded values."""
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.max if self.count else None,
+        }
+
+    def serialize(self) -> Dict[str, Any]:
+        """Serialize the histogram, keeping only its non-empty buckets."""
+        return {
+            "precision": self.precision,
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "buckets": [[i, count] for i, count in enumerate(self.counts) if count],
+        }
+
+    @classmethod
+    def load(cls, data: Dict[str, Any]) -> "LogHistogram":
+        """Load a serialized histogram."""
+        histogram = cls(data["precision"])
+        for index, count in data["buckets"]:
+            histogram.counts[index] = count
+        histogram.count = data["count"]
+        histogram.sum = data["sum"]
+        histogram.max = data["max"]
+        return histogram
+
+
+# the histograms of a window, per behaviour and block, e.g., `local` or `consensus`
+Histograms = Dict[str, Dict[str, LogHistogram]]
+
+
+class RollingHistograms:
+    """
+    Keeps the histograms of the behaviours' times in windows of a fixed interval, e.g., an hour.
+
+    The current window is written to its own file whenever it is flushed, so that it survives restarts,
+    and a new window is started once the interval is over. Only the latest windows are kept on disk,
+    so the memory and the disk usage are bounded, whatever the uptime of the agent.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        interval: float = 3600.0,
+        retention: int = 720,
+        precision: float = 0.01,
+    ) -> None:
+        """Initialize object."""
+        self.path = Path(path)
+        self.interval = interval
+        self.retention = retention
+        self.precision = precision
+        self.window_start: Optional[float] = None
+        self._current: Histograms = {}
+
+    def _file(self, window_start: float) -> Path:
+        """Get the file of a window."""
+        return self.path / f"{int(window_start)}{FILE_SUFFIX}"
+
+    def _windows(self) -> Iterator[Tuple[float, Path]]:
+        """Iterate over the windows on disk, in order, with their files."""
+        if not self.path.is_dir():
+            return
+        starts = []
+        for file in self.path.iterdir():
+            if file.suffix == FILE_SUFFIX and file.stem.isdigit():
+                starts.append(int(file.stem))
+        for start in sorted(starts):
+            yield float(start), self._file(start)
+
+    def _read(self, file: Path) -> Histograms:
+        """Read the histograms of a window, skipping a corrupted file."""
+        try:
+            with open(file, "r", encoding="utf-8") as stream:
+                data = json.load(stream)
+            return {
+                behaviour: {
+                    block: LogHistogram.load(histogram)
+                    for block, histogram in blocks.items()
+                }
+                for behaviour, blocks in data["histograms"].items()
+            }
+        except (OSError, json.decoder.JSONDecodeError, KeyError, ValueError):
+            return {}
+
+    def _roll(self, now: float) -> None:
+        """Start the window of the given time, if it is not the current one, resuming it from disk if it exists."""
+        window_start = now - now % self.interval
+        if window_start == self.window_start:
+            return
+        self.window_start = window_start
+        self._current = self._read(self._file(window_start))
+
+    def record(
+        self, behaviour: str, block: str, value: float, now: Optional[float] = None
+    ) -> None:
+        """Record a behaviour's time, in seconds, in the current window."""
+        self._roll(time.time() if now is None else now)
+        blocks = self._current.setdefault(behaviour, {})
+        if block not in blocks:
+            blocks[block] = LogHistogram(self.precision)
+        blocks[block].record(value)
+
+    def flush(self) -> None:
+        """Write the current window to its file and remove the windows beyond the retention."""
+        if self.window_start is None or not self._current:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        data = {
+            "start": self.window_start,
+            "interval": self.interval,
+            "histograms": {
+                behaviour: {
+                    block: histogram.serialize() for block, histogram in blocks.items()
+                }
+                for behaviour, blocks in self._current.items()
+            },
+        }
+        file = self._file(self.window_start)
+        # written to a temporary file first, so that a crash cannot leave a truncated window behind
+        temporary = file.with_suffix(".tmp")
+        with open(temporary, "w", encoding="utf-8") as stream:
+            json.dump(data, stream, separators=(",", ":"))
+        os.replace(temporary, file)
+
+        windows = list(self._windows())
+        for _, expired in windows[: max(len(windows) - self.retention, 0)]:
+            expired.unlink()
+
+    def query(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        behaviour: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get the percentiles of the behaviours' times, over the windows overlapping the given period.
+
+        :param since: the start of the period, defaults to the oldest window.
+        :param until: the end of the period, defaults to now.
+        :param behaviour: the behaviour to report, defaults to all of them.
+        :return: the summaries of the times, per behaviour and block, and the windows they were merged from.
+        """
+        since = -math.inf if since is None else since
+        until = math.inf if until is None else until
+        merged: Histograms = {}
+        windows: List[float] = []
+        sources: Dict[float, Optional[Path]] = dict(self._windows())
+        if self.window_start is not None:
+            sources[self.window_start] = None
+        for start in sorted(sources):
+            if start + self.interval <= since or start > until:
+                continue
+            file = sources[start]
+            # the current window is fresher in memory than on disk
+            current = self._current if file is None else self._read(file)
+            windows.append(start)
+            for name, blocks in current.items():
+                if behaviour is not None and name != behaviour:
+                    continue
+                merged_blocks = merged.setdefault(name, {})
+                for block, histogram in blocks.items():
+                    if block not in merged_blocks:
+                        merged_blocks[block] = LogHistogram(histogram.precision)
+                    merged_blocks[block].merge(histogram)
+
+        return {
+            "windows": {
+                "count": len(windows),
+                "from": windows[0] if windows else None,
+                "to": windows[-1] + self.interval if windows else None,
+            },
+            "behaviours": {
+                name: {
+                    block: histogram.summary()
+                    for block, histogram in sorted(blocks.items())
+                }
+                for name, blocks in sorted(merged.items())
+            },
+        }
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains a pool of keep-alive HTTP connections."""
+
+import time
+from http.client import (
+    HTTPConnection,
+    HTTPException,
+    HTTPSConnection,
+    RemoteDisconnected,
+)
+from threading import Condition
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+HostKey = Tuple[str, str, Optional[int]]
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of keep-alive HTTP connections, per host.
+
+    Reusing a connection saves the TCP and TLS handshakes of every request after the first one.
+    At most `max_per_host` connections are open to each host,
+    and the connections which stay idle for longer than `idle_timeout` seconds are closed.
+    A request waits for a connection for at most its timeout.
+    """
+
+    def __init__(self, max_per_host: int, idle_timeout: float) -> None:
+        """Initialize object."""
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._condition = Condition()
+        self._idle: Dict[HostKey, List[Tuple[HTTPConnection, float]]] = {}
+        self._active: Dict[HostKey, int] = {}
+        self._counters = {
+            "requests": 0,
+            "created": 0,
+            "reused": 0,
+            "expired": 0,
+            "timeouts": 0,
+        }
+
+    @staticmethod
+    def _host_key(url: str) -> Tuple[HostKey, str]:
+        """Get the key of the host of the given url and the path to request on it."""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        return (parts.scheme, parts.hostname or "", parts.port), path
+
+    @staticmethod
+    def _connect(key: HostKey, timeout: float) -> HTTPConnection:
+        """Open a new connection to the given host."""
+        scheme, host, port = key
+        connection_cls = HTTPSConnection if scheme == "https" else HTTPConnection
+        return connection_cls(host, port, timeout=timeout)
+
+    def _close_expired(self, now: float) -> None:
+        """Close the idle connections which have expired. Must be called holding the lock."""
+        for key, idle in self._idle.items():
+            fresh = []
+            for connection, last_used in idle:
+                if now - last_used > self.idle_timeout:
+                    connection.close()
+                    self._counters["expired"] += 1
+                    continue
+                fresh.append((connection, last_used))
+            self._idle[key] = fresh
+
+    def _acquire(self, key: HostKey, timeout: float) -> Tuple[HTTPConnection, bool]:
+        """
+        Get an idle connection to the given host, or a new one if there is room, waiting otherwise.
+
+        :param key: the key of the host.
+        :param timeout: how long to wait for a connection to become available, which is also the new connections' timeout.
+        :return: the connection and whether it is being reused.
+        :raises TimeoutError: if no connection becomes available in time.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                self._close_expired(time.monotonic())
+                idle = self._idle.get(key, [])
+                active = self._active.get(key, 0)
+                if idle:
+                    connection, _ = idle.pop()
+                    self._active[key] = active + 1
+                    self._counters["reused"] += 1
+                    return connection, True
+                if active < self.max_per_host:
+                    self._active[key] = active + 1
+                    self._counters["created"] += 1
+                    return self._connect(key, timeout), False
+                # the pool is exhausted, e.g., by requests hanging on an unresponsive host
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise TimeoutError(
+                        f"No connection to {key[1]} became available in {timeout} seconds."
+                    )
+                self._condition.wait(remaining)
+
+    def _release(
+        self, key: HostKey, connection: HTTPConnection, reusable: bool
+    ) -> None:
+        """Return a connection to the pool, or close it if it cannot be reused."""
+        with self._condition:
+            self._active[key] -= 1
+            if reusable:
+                self._idle.setdefault(key, []).append((connection, time.monotonic()))
+            else:
+                connection.close()
+            self._condition.notify()
+
+    @staticmethod
+    def _closed_by_server(error: Exception, sent: bool) -> bool:
+        """
+        Check whether a request failed because the server had closed the connection before receiving it.
+
+        Only then can the request be retried safely.
+        Any other failure once the request has been written, e.g., a read timeout, is not retried,
+        as the server may have processed the request.
+
+        :param error: the error which the request failed with.
+        :param sent: whether the request had been written to the connection.
+        :return: whether the server had closed the connection.
+        """
+        if isinstance(error, RemoteDisconnected):
+            # the server closed the connection without responding, i.e., before reading the request
+            return True
+        return not sent and isinstance(error, (ConnectionError, HTTPException))
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0,
+    ) -> Tuple[int, bytes]:
+        """
+        Send a request over a pooled connection. This blocks, so it is meant to be run off the agent's main loop.
+
+        :param method: the request's method.
+        :param url: the request's url.
+        :param body: the request's body.
+        :param headers: the request's headers.
+        :param timeout: the timeout of the request, in seconds.
+        :return: the response's status code and body.
+        """
+        key, path = self._host_key(url)
+        with self._condition:
+            self._counters["requests"] += 1
+
+        while True:
+            connection, reused = self._acquire(key, timeout)
+            sent = False
+            try:
+                connection.request(method.upper(), path, body, headers or {})
+                sent = True
+                response = connection.getresponse()
+                content = response.read()
+            except (HTTPException, OSError) as error:
+                self._release(key, connection, reusable=False)
+                # the server may have closed an idle connection, in which case a fresh one is tried
+                if reused and self._closed_by_server(error, sent):
+                    continue
+                raise
+            self._release(key, connection, reusable=not response.will_close)
+            return response.status, content
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Get the pool's utilisation statistics."""
+        with self._condition:
+            hosts = {
+                f"{scheme}://{host}{f':{port}' if port else ''}": {
+                    "active": self._active.get((scheme, host, port), 0),
+                    "idle": len(self._idle.get((scheme, host, port), [])),
+                }
+                for scheme, host, port in set(self._active) | set(self._idle)
+            }
+            return {
+                **self._counters,
+                "max_per_host": self.max_per_host,
+                "hosts": hosts,
+            }
+
+    def close(self) -> None:
+        """Close all the idle connections."""
+        with self._condition:
+            for idle in self._idle.values():
+                for connection, _ in idle:
+                    connection.close()
+            self._idle.clear()
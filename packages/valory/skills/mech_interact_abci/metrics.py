@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains metrics rendered in the Prometheus text exposition format."""
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+INF = float("inf")
+
+
+def _quote(value: str) -> str:
+    """Escape and quote a label value."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return '"' + escaped + '"'
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format the labels of a sample."""
+    if not names:
+        return ""
+    pairs = ",".join(f"{name}={_quote(value)}" for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    """Format the value of a sample."""
+    if value != value:  # pylint: disable=comparison-with-itself
+        return "NaN"
+    if value == INF:
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class CounterChild:
+    """A single series of a counter."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the counter."""
+        self.value += amount
+
+
+class GaugeChild:
+    """A single series of a gauge."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self.value = value
+
+
+class HistogramChild:
+    """A single series of a histogram, with its bucket counts preallocated."""
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        """Initialize object."""
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Observe a value, counting it in the first bucket whose upper bound it does not exceed."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """
+    A metric family, i.e., a named metric with a series per combination of label values.
+
+    A series is allocated the first time its labels are used. Updating it is a plain increment of its preallocated value,
+    without any allocation or lock, and the hot paths can keep it to skip the lookup of its labels too.
+    The updates are meant to be made from the agent's main thread.
+    """
+
+    type_ = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str]) -> None:
+        """Initialize object."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._series: Dict[Tuple[str, ...], Any] = {}
+
+    def _new_child(self) -> Any:
+        """Allocate a new series."""
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """Get the series of the given label values, allocating it the first time."""
+        if len(values) != len(self.label_names):
+            raise ValueError(
+                f"{self.name} expects the labels {self.label_names}, got {values}."
+            )
+        key = tuple(str(value) for value in values)
+        child = self._series.get(key, None)
+        if child is None:
+            child = self._new_child()
+            self._series[key] = child
+        return child
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        """Get the samples of the metric, as their names, formatted labels and values."""
+        return [
+            (self.name, _format_labels(self.label_names, key), child.value)
+            for key, child in self._series.items()
+        ]
+
+    def render(self) -> str:
+        """Render the metric in the text exposition format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_}",
+        ]
+        for name, labels, value in self._samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """A counter, which only goes up."""
+
+    type_ = "counter"
+
+    def _new_child(self) -> CounterChild:
+        """Allocate a new series."""
+        return CounterChild()
+
+
+class Gauge(Metric):
+    """A gauge, which is set to the current value of something."""
+
+    type_ = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        """Allocate a new series."""
+        return GaugeChild()
+
+
+class Histogram(Metric):
+    """A histogram of observations, in buckets with the given upper bounds."""
+
+    type_ = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str],
+        buckets: Sequence[float],
+    ) -> None:
+        """Initialize object."""
+        super().__init__(name, documentation, labels)
+        bounds = sorted(set(buckets))
+        if not bounds or bounds[-1] != INF:
+            bounds.append(INF)
+        self.buckets = tuple(bounds)
+
+    def _new_child(self) -> HistogramChild:
+        """Allocate a new series."""
+        return HistogramChild(self.buckets)
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        """Get the cumulative bucket counts, the sum and the count of every series."""
+        samples: List[Tuple[str, str, float]] = []
+        label_names = (*self.label_names, "le")
+        for key, child in self._series.items():
+            cumulative = 0
+            for bound, count in zip(child.buckets, child.counts):
+                cumulative += count
+                labels = _format_labels(label_names, (*key, _format_value(bound)))
+                samples.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.label_names, key)
+            samples.append((f"{self.name}_sum", labels, child.sum))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class Registry:
+    """
+    A registry of metrics, rendered together.
+
+    The collectors are called before every rendering,
+    to update the gauges whose values are cheaper to read on demand than to track, e.g., queue depths.
+    """
+
+    def __init__(self) -> None:
+        """Initialize object."""
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: Metric) -> Any:
+        """Register a metric, ensuring that its name is unique."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> Counter:
+        """Register a counter."""
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        """Register a gauge."""
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labels: Sequence[str] = (),
+    ) -> Histogram:
+        """Register a histogram."""
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Add a collector, to be called before every rendering."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all the metrics in the text exposition format."""
+        for collector in self._collectors:
+            collector()
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
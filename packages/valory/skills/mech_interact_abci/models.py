@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -19,10 +19,14 @@
 
 """This module contains the models for the abci skill of MechInteractAbciApp."""
 
-from dataclasses import dataclass
-from typing import Any
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional
 
 from aea.exceptions import enforce
+from aea.skills.base import Model
 from hexbytes import HexBytes
 
 from packages.valory.contracts.multisend.contract import MultiSendOperation
@@ -34,11 +38,63 @@ from packages.valory.skills.abstract_round_abci.models import Requests as BaseRe
 from packages.valory.skills.abstract_round_abci.models import (
     SharedState as BaseSharedState,
 )
+from packages.valory.skills.mech_interact_abci.benchmarks import RollingHistograms
+from packages.valory.skills.mech_interact_abci.http_pool import ConnectionPool
+from packages.valory.skills.mech_interact_abci.metrics import Registry
 from packages.valory.skills.mech_interact_abci.rounds import MechInteractAbciApp
+from packages.valory.skills.mech_interact_abci.tracing import (
+    BACKUP_COUNT,
+    MAX_BYTES,
+    Tracer,
+)
 
 
 Requests = BaseRequests
-BenchmarkTool = BaseBenchmarkTool
+
+
+class BenchmarkTool(BaseBenchmarkTool):
+    """
+    Keeps rolling histograms of the behaviours' local and consensus times.
+
+    The measurements of every period are recorded into fixed-memory histograms, in hourly windows by default,
+    instead of being dumped to a file per period, unless `raw_logs` is enabled.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the benchmark tool."""
+        # the base tool is frozen once initialized, so everything is set upfront
+        self.raw_logs: bool = kwargs.pop("raw_logs", False)
+        self.histograms = RollingHistograms(
+            str(Path(kwargs.get("log_dir", "/logs")) / "benchmarks"),
+            interval=kwargs.pop("rotation_interval", 3600.0),
+            retention=kwargs.pop("retention", 720),
+            precision=kwargs.pop("precision", 0.01),
+        )
+        super().__init__(*args, **kwargs)
+
+    def save(self, period: int = 0, reset: bool = True) -> None:
+        """Record the period's measurements into the histograms, and dump them to a file too if enabled."""
+        for behaviour, measured in self.benchmark_data.items():
+            for block, benchmark in measured.local_data.items():
+                self.histograms.record(behaviour, block, benchmark.total_time)
+        try:
+            self.histograms.flush()
+        except OSError as e:
+            self.context.logger.error(f"Error saving the benchmark histograms: {e}")
+
+        if self.raw_logs:
+            super().save(period, reset)
+        elif reset:
+            self.reset()
+
+    def query(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        behaviour: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get the percentiles of the behaviours' times over the given period."""
+        return self.histograms.query(since, until, behaviour)
 
 
 class MechResponseSpecs(ApiSpecs):
@@ -63,6 +119,12 @@ class MechParams(BaseParams):
             "multisend_batch_size", kwargs, int
         )
         self.mech_agent_address: str = self._ensure("mech_agent_address", kwargs, str)
+        self.mech_tool_routes: Dict[str, List[str]] = self._ensure(
+            "mech_tool_routes", kwargs, Dict[str, List[str]]
+        )
+        self.mech_response_timeout: float = self._ensure(
+            "mech_response_timeout", kwargs, float
+        )
         self._ipfs_address: str = self._ensure("ipfs_address", kwargs, str)
         super().__init__(*args, **kwargs)
 
@@ -73,6 +135,10 @@ class MechParams(BaseParams):
             return self._ipfs_address
         return f"{self._ipfs_address}/"
 
+    def mech_candidates(self, tool: str) -> List[str]:
+        """Get the addresses of the mechs which can serve requests for the given tool."""
+        return self.mech_tool_routes.get(tool, None) or [self.mech_agent_address]
+
 
 Params = MechParams
 
@@ -85,3 +151,355 @@ class MultisendBatch:
     data: HexBytes
     value: int = 0
     operation: MultiSendOperation = MultiSendOperation.CALL
+
+
+class DeliverSubscription:
+    """
+    Tracks the pending mech requests and the `Deliver` events observed for them.
+
+    A single block cursor is shared by all the pending requests,
+    so every scan only covers the blocks mined since the previous one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the subscription."""
+        self.from_block: Optional[int] = None
+        self._pending: Dict[int, int] = {}
+        self._delivered: Dict[int, bytes] = {}
+        self._latencies: Dict[int, int] = {}
+
+    @property
+    def pending(self) -> List[int]:
+        """Get the ids of the requests which have not been delivered yet."""
+        return [
+            request_id
+            for request_id in self._pending
+            if request_id not in self._delivered
+        ]
+
+    def track(self, request_ids: Iterable[int], from_block: int) -> None:
+        """Track the given requests, which were settled in the given block."""
+        for request_id in request_ids:
+            if request_id in self._pending:
+                continue
+            self._pending[request_id] = from_block
+            # blocks scanned before a request was tracked need to be scanned again for it
+            if self.from_block is None or from_block < self.from_block:
+                self.from_block = from_block
+
+    def push(self, events: List[Dict[str, Any]], to_block: int) -> None:
+        """Push the `Deliver` events found up to the given block."""
+        for event in events:
+            request_id = int(event["requestId"])
+            if request_id in self._pending:
+                self._delivered[request_id] = event["data"]
+                self._latencies[request_id] = (
+                    int(event["block_number"]) - self._pending[request_id]
+                )
+        self.from_block = to_block + 1
+
+    def latency(self, request_id: int) -> Optional[int]:
+        """Get the number of blocks it took for the given request to be delivered, if it has been delivered."""
+        return self._latencies.get(request_id, None)
+
+    def untrack(self, request_id: int) -> None:
+        """Stop tracking the given request."""
+        self._pending.pop(request_id, None)
+        self._delivered.pop(request_id, None)
+        self._latencies.pop(request_id, None)
+        if not self._pending:
+            self.from_block = None
+
+    def pop(self, request_id: int) -> Optional[bytes]:
+        """Get the delivered data of the given request and stop tracking it, if it has been delivered."""
+        data = self._delivered.pop(request_id, None)
+        if data is not None:
+            self._pending.pop(request_id, None)
+            self._latencies.pop(request_id, None)
+        if not self._pending:
+            self.from_block = None
+        return data
+
+
+@dataclass
+class MechStats:
+    """The statistics used to score a mech."""
+
+    price: Optional[int] = None
+    price_timestamp: float = 0.0
+    latency: Optional[float] = None
+    failure_rate: float = 0.0
+
+
+class MechRouter(Model):
+    """
+    Routes the requests of each tool to one of its candidate mechs.
+
+    The candidates are scored using their cached price, an exponentially weighted moving average
+    of their delivery latency in blocks, a moving average of their failure rate
+    and the number of our requests which they are currently serving.
+    The latter spreads a batch over several mechs.
+
+    The agents need to route the requests identically to agree on the payloads,
+    so the statistics are loaded from the synchronized data at the start of every round,
+    and the updated ones are shared via the round's payload.
+    The requests in flight are only counted within the batch which is being routed.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the router."""
+        self.price_ttl: float = kwargs.pop("price_ttl", 3600.0)
+        self.smoothing: float = kwargs.pop("smoothing", 0.2)
+        self.price_weight: float = kwargs.pop("price_weight", 1.0)
+        self.latency_weight: float = kwargs.pop("latency_weight", 1.0)
+        self.failure_weight: float = kwargs.pop("failure_weight", 2.0)
+        self.queue_weight: float = kwargs.pop("queue_weight", 0.5)
+        super().__init__(*args, **kwargs)
+        self.stats: Dict[str, MechStats] = {}
+        self._in_flight: Dict[str, str] = {}
+
+    def load(self, serialized: str, in_flight: Optional[Dict[str, str]] = None) -> None:
+        """Load the statistics agreed upon by the agents and the mechs serving our requests, per nonce."""
+        self.stats = {
+            mech: MechStats(**stats) for mech, stats in json.loads(serialized).items()
+        }
+        self._in_flight = dict(in_flight or {})
+
+    def serialize(self) -> str:
+        """Serialize the statistics of the mechs deterministically, to be shared via a payload."""
+        return json.dumps(
+            {mech: asdict(stats) for mech, stats in self.stats.items()}, sort_keys=True
+        )
+
+    def _stats(self, mech: str) -> MechStats:
+        """Get the stats of the given mech."""
+        return self.stats.setdefault(mech, MechStats())
+
+    def is_price_stale(self, mech: str, now: float) -> bool:
+        """Check whether the cached price of the given mech needs to be updated."""
+        stats = self._stats(mech)
+        return stats.price is None or now - stats.price_timestamp > self.price_ttl
+
+    def update_price(self, mech: str, price: int, now: float) -> None:
+        """Cache the price of the given mech."""
+        stats = self._stats(mech)
+        stats.price = price
+        stats.price_timestamp = now
+
+    def price(self, mech: str) -> int:
+        """Get the cached price of the given mech."""
+        return self._stats(mech).price or 0
+
+    def in_flight(self, mech: str) -> int:
+        """Get the number of our requests which the given mech is serving."""
+        return sum(1 for assigned in self._in_flight.values() if assigned == mech)
+
+    @staticmethod
+    def _relative(value: Optional[float], best: Optional[float]) -> float:
+        """Get a value relative to the best one among the candidates, defaulting to a neutral `1`."""
+        if value is None or not best:
+            return 1.0
+        return value / best
+
+    def score(self, mech: str, candidates: List[str]) -> float:
+        """Score the given mech among the candidates. The lower the better."""
+        stats = [self._stats(candidate) for candidate in candidates]
+        prices = [s.price for s in stats if s.price]
+        latencies = [s.latency for s in stats if s.latency]
+        mech_stats = self._stats(mech)
+        return (
+            self.price_weight
+            * self._relative(mech_stats.price, min(prices, default=None))
+            + self.latency_weight
+            * self._relative(mech_stats.latency, min(latencies, default=None))
+            + self.failure_weight * mech_stats.failure_rate
+            + self.queue_weight * self.in_flight(mech)
+        )
+
+    def route(self, nonce: str, candidates: List[str]) -> str:
+        """Assign the request with the given nonce to the best scoring candidate."""
+        # the request may have been routed before, e.g., if the round was retried
+        self._in_flight.pop(nonce, None)
+        mech = min(
+            candidates,
+            key=lambda candidate: (
+                self.score(candidate, candidates),
+                candidates.index(candidate),
+            ),
+        )
+        self._in_flight[nonce] = mech
+        return mech
+
+    def record_delivery(self, nonce: str, mech: str, latency: Optional[int]) -> None:
+        """Record that the given mech delivered the response of a request after the given number of blocks."""
+        self._in_flight.pop(nonce, None)
+        stats = self._stats(mech)
+        stats.failure_rate *= 1 - self.smoothing
+        if latency is None:
+            return
+        if stats.latency is None:
+            stats.latency = float(latency)
+            return
+        stats.latency += self.smoothing * (latency - stats.latency)
+
+    def record_failure(self, nonce: str, mech: str) -> None:
+        """Record that the given mech failed to deliver the response of a request."""
+        self._in_flight.pop(nonce, None)
+        stats = self._stats(mech)
+        stats.failure_rate += self.smoothing * (1 - stats.failure_rate)
+
+
+class HttpPool(Model):
+    """
+    Sends the outbound HTTP requests of the behaviours over keep-alive connections.
+
+    The requests are run on a thread pool, so that the behaviours can wait for them without blocking the agent.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the pool."""
+        max_connections_per_host: int = kwargs.pop("max_connections_per_host", 4)
+        idle_timeout: float = kwargs.pop("idle_timeout", 60.0)
+        self.request_timeout: float = kwargs.pop("request_timeout", 30.0)
+        max_workers: int = kwargs.pop("max_workers", 4)
+        super().__init__(*args, **kwargs)
+        self.pool = ConnectionPool(max_connections_per_host, idle_timeout)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Future:
+        """Send a request in the background. The future resolves to the response's status code and body."""
+        return self._executor.submit(
+            self.pool.request, method, url, body, headers, self.request_timeout
+        )
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Get the pool's utilisation statistics."""
+        return self.pool.stats
+
+    def teardown(self) -> None:
+        """Tear down the pool."""
+        self._executor.shutdown(wait=False)
+        self.pool.close()
+        super().teardown()
+
+
+class RequestTracer(Model):
+    """Traces the requests across the rounds and the external calls, exporting the spans to a JSONL file."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the tracer."""
+        path: Optional[str] = kwargs.pop("path", "/logs/traces.jsonl")
+        window: int = kwargs.pop("window", 10_000)
+        max_bytes: int = kwargs.pop("max_bytes", MAX_BYTES)
+        backup_count: int = kwargs.pop("backup_count", BACKUP_COUNT)
+        self.enabled: bool = kwargs.pop("enabled", True)
+        super().__init__(*args, **kwargs)
+        self.tracer = Tracer(
+            path if self.enabled else None, window, max_bytes, backup_count
+        )
+
+    def span(
+        self, name: str, kind: str, nonces: Iterable[str], **attributes: Any
+    ) -> ContextManager[Dict[str, Any]]:
+        """Record the enclosed block as a span."""
+        return self.tracer.span(name, kind, nonces, **attributes)
+
+    def start(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        kind: str,
+        nonces: Iterable[str],
+        now: Optional[float] = None,
+        **attributes: Any,
+    ) -> Dict[str, Any]:
+        """Start a span."""
+        return self.tracer.start(name, kind, nonces, now, **attributes)
+
+    def end(
+        self, span: Dict[str, Any], now: Optional[float] = None, error: str = ""
+    ) -> None:
+        """Finish a span."""
+        self.tracer.end(span, now, error)
+
+    def trace(self, nonce: str) -> List[Dict[str, Any]]:
+        """Get the latest spans of the request with the given nonce."""
+        return self.tracer.trace(nonce)
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Get the aggregated breakdown of the latest spans."""
+        return self.tracer.breakdown()
+
+    def teardown(self) -> None:
+        """Tear down the tracer, writing the queued spans."""
+        self.tracer.stop()
+        super().teardown()
+
+
+class Metrics(Model):
+    """
+    Keeps the agent's metrics, exposed in the Prometheus text exposition format.
+
+    The metrics are updated from the agent's main thread, without locks.
+    The hot paths keep the series they update, so that an update does not allocate.
+    """
+
+    stage_buckets = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the metrics."""
+        super().__init__(*args, **kwargs)
+        self.registry = Registry()
+        self.queue_depth = self.registry.gauge(
+            "inbox_queue_depth", "The number of the queued requests.", ("tool",)
+        )
+        self.processed = self.registry.gauge(
+            "inbox_processed_requests", "The number of the processed requests."
+        )
+        self.db_size = self.registry.gauge(
+            "inbox_db_size_bytes", "The size of the inbox's database file."
+        )
+        self.stage_latency = self.registry.histogram(
+            "request_stage_duration_seconds",
+            "The time the requests spent in each lifecycle stage.",
+            self.stage_buckets,
+            ("stage",),
+        )
+        self.condition_retries = self.registry.counter(
+            "behaviour_condition_retries_total",
+            "The number of the retries of the conditions waited for by the behaviours.",
+            ("condition",),
+        )
+        self.external_calls = self.registry.counter(
+            "external_calls_total",
+            "The number of the calls to external services.",
+            ("kind", "name"),
+        )
+        self.external_call_errors = self.registry.counter(
+            "external_call_errors_total",
+            "The number of the failed calls to external services.",
+            ("kind", "name"),
+        )
+        self.tx_settlements = self.registry.counter(
+            "tx_settlements_total",
+            "The number of the transaction settlements, per submitter and outcome.",
+            ("submitter", "outcome"),
+        )
+        # the series of the fixed calls are allocated upfront, so that they are exposed before their first update
+        for name in ("send", "get"):
+            self.external_calls.labels("ipfs", name)
+            self.external_call_errors.labels("ipfs", name)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Add a collector, to update the metrics read on demand before every rendering."""
+        self.registry.add_collector(collector)
+
+    def render(self) -> str:
+        """Render the metrics in the text exposition format."""
+        return self.registry.render()
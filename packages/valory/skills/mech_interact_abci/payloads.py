@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -32,6 +32,7 @@ class MechRequestPayload(BaseTxPayload):
     price: int
     mech_requests: str
     mech_responses: str
+    mech_stats: str
 
 
 @dataclass(frozen=True)
@@ -39,3 +40,4 @@ class MechResponsePayload(BaseTxPayload):
     """Represent a transaction payload for the MechResponseRound."""
 
     mech_responses: str
+    mech_stats: str
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -80,7 +80,10 @@ class MechInteractAbciApp(AbciApp[Event]):
     event_to_timeout: EventToTimeout = {
         Event.ROUND_TIMEOUT: 30.0,
     }
-    cross_period_persisted_keys: Set[str] = {get_name(SynchronizedData.mech_responses)}
+    cross_period_persisted_keys: Set[str] = {
+        get_name(SynchronizedData.mech_responses),
+        get_name(SynchronizedData.mech_stats),
+    }
     db_pre_conditions: Dict[AppState, Set[str]] = {
         # using `set(get_name(SynchronizedData.mech_requests))`
         # makes the checks complain that "db pre and post conditions intersect"
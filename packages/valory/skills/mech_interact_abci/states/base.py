@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -62,6 +62,7 @@ class MechRequest:
 
     data: str = ""
     requestId: int = 0
+    mech: str = ""
 
 
 @dataclass
@@ -71,11 +72,18 @@ class MechInteractionResponse(MechRequest):
     nonce: str = ""
     result: Optional[str] = None
     error: str = "Unknown"
+    deadline: Optional[float] = None
 
     def retries_exceeded(self) -> None:
         """Set an incorrect format response."""
         self.error = "Retries were exceeded while trying to get the mech's response."
 
+    def deadline_exceeded(self) -> None:
+        """Set an expired response."""
+        self.error = (
+            "The mech did not deliver a response before the request's deadline."
+        )
+
     def incorrect_format(self, res: Any) -> None:
         """Set an incorrect format response."""
         self.error = f"The response's format was unexpected: {res}"
@@ -107,6 +115,11 @@ class SynchronizedData(TxSynchronizedData):
         responses = json.loads(serialized)
         return [MechInteractionResponse(**response_item) for response_item in responses]
 
+    @property
+    def mech_stats(self) -> str:
+        """Get the serialized statistics of the mechs, used to route the requests."""
+        return cast(str, self.db.get("mech_stats", "{}"))
+
     @property
     def participant_to_requests(self) -> Mapping[str, MechRequestPayload]:
         """Get the `participant_to_requests`."""
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -48,6 +48,7 @@ class MechRequestRound(MechInteractionRound):
         get_name(SynchronizedData.mech_price),
         get_name(SynchronizedData.mech_requests),
         get_name(SynchronizedData.mech_responses),
+        get_name(SynchronizedData.mech_stats),
     )
     collection_key = get_name(SynchronizedData.participant_to_requests)
     none_event = Event.SKIP_REQUEST
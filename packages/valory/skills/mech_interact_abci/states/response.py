@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -31,5 +31,8 @@ class MechResponseRound(MechInteractionRound):
     """A round for collecting the responses from a Mech."""
 
     payload_class = MechResponsePayload
-    selection_key = get_name(SynchronizedData.mech_responses)
+    selection_key = (
+        get_name(SynchronizedData.mech_responses),
+        get_name(SynchronizedData.mech_stats),
+    )
     collection_key = get_name(SynchronizedData.participant_to_responses)
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -20,16 +20,21 @@
 """This package contains round behaviours of MechInteractAbciApp."""
 
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Hashable, Optional, Type
+from typing import Any, Dict, Generator, Hashable, Optional, Type, cast
+from unittest import mock
 
 import pytest
 
+from packages.valory.protocols.ledger_api import LedgerApiMessage
 from packages.valory.skills.abstract_round_abci.base import AbciAppDB
 from packages.valory.skills.abstract_round_abci.behaviours import BaseBehaviour
 from packages.valory.skills.abstract_round_abci.test_tools.base import (
     FSMBehaviourBaseCase,
 )
+from packages.valory.skills.mech_interact_abci.behaviours import base, response
 from packages.valory.skills.mech_interact_abci.behaviours.base import (
     MechInteractBaseBehaviour,
 )
@@ -44,10 +49,35 @@ from packages.valory.skills.mech_interact_abci.behaviours.round_behaviour import
 )
 from packages.valory.skills.mech_interact_abci.states.base import (
     Event,
+    MechInteractionResponse,
+    MechRequest,
     SynchronizedData,
 )
 
 
+class Clock(datetime):
+    """A local clock which only advances when the behaviours sleep."""
+
+    current = datetime(2024, 1, 1)
+
+    @classmethod
+    def now(cls, tz: Any = None) -> datetime:  # type: ignore
+        """Get the current time of the clock."""
+        return cls.current
+
+
+def satisfied(*_args: Any) -> Generator[None, None, bool]:
+    """A condition which is satisfied at once."""
+    yield
+    return True
+
+
+def unsatisfied(*_args: Any) -> Generator[None, None, bool]:
+    """A condition which is never satisfied, e.g., waiting for a mech which never delivers."""
+    yield
+    return False
+
+
 @dataclass
 class BehaviourTestCase:
     """BehaviourTestCase"""
@@ -81,10 +111,10 @@ class BaseMechInteractTest(FSMBehaviourBaseCase):
         data = data if data is not None else {}
         self.fast_forward_to_behaviour(
             self.behaviour,
-            self.behaviour_class.behaviour_id,
+            self.behaviour_class.auto_behaviour_id(),
             SynchronizedData(AbciAppDB(setup_data=AbciAppDB.data_to_lists(data))),
         )
-        assert self.current_behaviour_id == self.behaviour_class.behaviour_id
+        assert self.current_behaviour_id == self.behaviour_class.auto_behaviour_id()
 
     def complete(self, event: Event) -> None:
         """Complete test"""
@@ -93,7 +123,9 @@ class BaseMechInteractTest(FSMBehaviourBaseCase):
         self.mock_a2a_transaction()
         self._test_done_flag_set()
         self.end_round(done_event=event)
-        assert self.current_behaviour_id == self.next_behaviour_class.behaviour_id
+        assert (
+            self.current_behaviour_id == self.next_behaviour_class.auto_behaviour_id()
+        )
 
 
 class TestMechRequestBehaviour(BaseMechInteractTest):
@@ -130,3 +162,128 @@ class TestMechResponseBehaviour(BaseMechInteractTest):
         # TODO: mock the necessary calls
         # self.mock_ ...
         self.complete(test_case.event)
+
+    def test_time_to_deadline(self) -> None:
+        """Test that the time left until a response's deadline is measured against the consensus time."""
+        self.fast_forward()
+        behaviour = cast(MechResponseBehaviour, self.behaviour.current_behaviour)
+        consensus_time = datetime(2024, 1, 1)
+        round_sequence = type(self.skill.skill_context.state.round_sequence)
+        with mock.patch.object(
+            round_sequence,
+            "last_round_transition_timestamp",
+            new_callable=mock.PropertyMock,
+            return_value=consensus_time,
+        ):
+            behaviour._current_mech_response = MechInteractionResponse()
+            assert behaviour._time_to_deadline() is None
+            for deadline, left in ((10.0, 10.0), (-5.0, 0.0)):
+                behaviour._current_mech_response = MechInteractionResponse(
+                    deadline=consensus_time.timestamp() + deadline
+                )
+                assert behaviour._time_to_deadline() == left
+
+    def test_wait_for_partial_condition(self) -> None:
+        """Test waiting for a partially applied condition, whose retries are counted under the wrapped function's name."""
+        self.fast_forward()
+        behaviour = cast(MechResponseBehaviour, self.behaviour.current_behaviour)
+        results = iter((False, False, True))
+
+        def _is_delivered(mech: str) -> Generator[None, None, bool]:
+            """Check whether the mech has delivered."""
+            assert mech == "0x1"
+            yield
+            return next(results)
+
+        def sleep(_seconds: float) -> Generator:
+            """Do not sleep."""
+            yield
+
+        with mock.patch.object(behaviour, "sleep", sleep):
+            for _ in behaviour.wait_for_condition_with_sleep(
+                partial(_is_delivered, "0x1")
+            ):
+                pass
+        retries = behaviour.metrics.condition_retries.labels("_is_delivered")
+        assert retries.value == 2
+
+    def test_ledger_api_call(self) -> None:
+        """Test that the calls to the ledger API are traced and counted."""
+        self.fast_forward()
+        behaviour = cast(MechResponseBehaviour, self.behaviour.current_behaviour)
+        response = mock.MagicMock(performative=LedgerApiMessage.Performative.ERROR)
+
+        def get_ledger_api_response(*_args: Any, **_kwargs: Any) -> Generator:
+            """Respond with an error."""
+            yield
+            return response
+
+        with mock.patch.object(
+            BaseBehaviour, "get_ledger_api_response", get_ledger_api_response
+        ):
+            for _ in behaviour.get_ledger_api_response(
+                LedgerApiMessage.Performative.GET_STATE, "get_balance"  # type: ignore
+            ):
+                pass
+        span = behaviour.tracer.tracer.spans[-1]
+        assert (span["name"], span["kind"], span["status"]) == (
+            "get_balance",
+            "ledger_api",
+            "ok",
+        )
+        assert span["attributes"]["performative"] == "error"
+        metrics = behaviour.metrics
+        assert metrics.external_calls.labels("ledger_api", "get_balance").value == 1
+        assert (
+            metrics.external_call_errors.labels("ledger_api", "get_balance").value == 1
+        )
+
+    def test_deadlines_bound_the_waits(self) -> None:
+        """Test that the waits for the requests which are never delivered are bounded by their deadlines in total."""
+        self.fast_forward()
+        behaviour = cast(MechResponseBehaviour, self.behaviour.current_behaviour)
+        consensus_time = datetime(2024, 1, 1)
+        budget = 10.0
+        behaviour._mech_responses = [
+            MechInteractionResponse(
+                data=data.hex(),
+                mech="0x1",
+                nonce=data.hex(),
+                deadline=consensus_time.timestamp() + budget,
+            )
+            for data in (b"a", b"b")
+        ]
+        behaviour._routed_requests = [
+            MechRequest(data=data, requestId=i, mech="0x1")  # type: ignore
+            for i, data in enumerate((b"a", b"b"))
+        ]
+
+        def sleep(seconds: float) -> Generator:
+            """Advance the local clock instead of sleeping."""
+            Clock.current += timedelta(seconds=seconds)
+            yield
+
+        round_sequence = type(self.skill.skill_context.state.round_sequence)
+        started = Clock.current
+        with mock.patch.object(
+            round_sequence,
+            "last_round_transition_timestamp",
+            new_callable=mock.PropertyMock,
+            return_value=consensus_time,
+        ), mock.patch.object(base, "datetime", Clock), mock.patch.object(
+            response, "datetime", Clock
+        ), mock.patch.multiple(
+            behaviour,
+            sleep=sleep,
+            _get_block_number=satisfied,
+            _process_request_event=satisfied,
+            _get_response_hash=unsatisfied,
+        ):
+            for _ in behaviour._process_responses():
+                pass
+
+        elapsed = (Clock.current - started).total_seconds()
+        assert elapsed <= budget
+        for mech_response in behaviour._mech_responses:
+            assert mech_response.result is None
+            assert "deadline" in mech_response.error
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the benchmarks.py module of the MechInteract."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from packages.valory.skills.mech_interact_abci.benchmarks import (
+    LogHistogram,
+    RollingHistograms,
+)
+
+
+HOUR = 3600.0
+
+
+class TestLogHistogram:
+    """Test LogHistogram of MechInteract."""
+
+    def test_percentiles(self) -> None:
+        """Test that the percentiles are within the relative error of the exact ones."""
+        rng = random.Random(0)
+        values = sorted(rng.lognormvariate(0, 1.5) for _ in range(10_000))
+        histogram = LogHistogram(precision=0.01)
+        for value in values:
+            histogram.record(value)
+
+        assert histogram.count == len(values)
+        assert histogram.max == values[-1]
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            assert histogram.percentile(q) == pytest.approx(exact, rel=0.011)
+
+    def test_fixed_memory(self) -> None:
+        """Test that the buckets are preallocated and the out of range values are clamped."""
+        histogram = LogHistogram()
+        size = len(histogram.counts)
+        for value in (0.0, 1e-9, 1.0, 1e9):
+            histogram.record(value)
+        assert len(histogram.counts) == size
+        assert histogram.counts[0] == 2
+        assert histogram.counts[-1] == 1
+        assert histogram.percentile(1.0) == 1e9
+
+    def test_serialize(self) -> None:
+        """Test that a histogram is serialized with its non-empty buckets only and loaded back."""
+        histogram = LogHistogram()
+        for value in (0.2, 0.2, 3.0):
+            histogram.record(value)
+        data = histogram.serialize()
+        assert len(data["buckets"]) == 2
+
+        loaded = LogHistogram.load(data)
+        assert loaded.counts == histogram.counts
+        assert loaded.summary() == histogram.summary()
+
+    def test_merge(self) -> None:
+        """Test that merging histograms adds their values, unless their precisions differ."""
+        first, second = LogHistogram(), LogHistogram()
+        first.record(1.0)
+        second.record(2.0)
+        first.merge(second)
+        assert first.count == 2
+        assert first.sum == 3.0
+        assert first.max == 2.0
+        with pytest.raises(ValueError):
+            first.merge(LogHistogram(precision=0.05))
+
+    def test_empty(self) -> None:
+        """Test the summary of an empty histogram."""
+        assert LogHistogram().summary() == {
+            "count": 0,
+            "mean": None,
+            "p50": None,
+            "p90": None,
+            "p99": None,
+            "max": None,
+        }
+
+
+class TestRollingHistograms:
+    """Test RollingHistograms of MechInteract."""
+
+    def test_rotation(self, tmp_path: Path) -> None:
+        """Test that a window is written per interval and queried across the windows."""
+        histograms = RollingHistograms(str(tmp_path), interval=HOUR)
+        histograms.record("behaviour", "local", 1.0, now=10.0)
+        histograms.flush()
+        histograms.record("behaviour", "local", 3.0, now=HOUR + 10.0)
+        histograms.record("behaviour", "consensus", 2.0, now=HOUR + 20.0)
+        histograms.flush()
+        files = sorted(file.name for file in tmp_path.iterdir())
+        assert files == ["0.json", "3600.json"]
+
+        result = histograms.query()
+        assert result["windows"] == {"count": 2, "from": 0.0, "to": 2 * HOUR}
+        assert result["behaviours"]["behaviour"]["local"]["count"] == 2
+        assert result["behaviours"]["behaviour"]["consensus"]["count"] == 1
+
+        latest = histograms.query(since=HOUR)
+        assert latest["windows"]["count"] == 1
+        assert latest["behaviours"]["behaviour"]["local"]["max"] == 3.0
+        assert histograms.query(behaviour="other")["behaviours"] == {}
+
+    def test_resume(self, tmp_path: Path) -> None:
+        """Test that the current window is resumed from disk after a restart."""
+        histograms = RollingHistograms(str(tmp_path))
+        histograms.record("behaviour", "local", 1.0, now=10.0)
+        histograms.flush()
+
+        restarted = RollingHistograms(str(tmp_path))
+        restarted.record("behaviour", "local", 2.0, now=20.0)
+        result = restarted.query()
+        assert result["windows"]["count"] == 1
+        assert result["behaviours"]["behaviour"]["local"]["count"] == 2
+
+    def test_retention(self, tmp_path: Path) -> None:
+        """Test that only the latest windows are kept on disk."""
+        histograms = RollingHistograms(str(tmp_path), interval=HOUR, retention=3)
+        for hour in range(5):
+            histograms.record("behaviour", "local", 1.0, now=hour * HOUR)
+            histograms.flush()
+        assert sorted(int(file.stem) for file in tmp_path.iterdir()) == [
+            2 * int(HOUR),
+            3 * int(HOUR),
+            4 * int(HOUR),
+        ]
+
+    def test_corrupted_window(self, tmp_path: Path) -> None:
+        """Test that a corrupted window is skipped."""
+        (tmp_path / "0.json").write_text("{")
+        histograms = RollingHistograms(str(tmp_path))
+        assert histograms.query()["behaviours"] == {}
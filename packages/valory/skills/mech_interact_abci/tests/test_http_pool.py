@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the http_pool.py module of the MechInteract."""
+
+import socket
+from http.client import RemoteDisconnected
+from typing import List, Optional
+from unittest import mock
+
+import pytest
+
+from packages.valory.skills.mech_interact_abci.http_pool import ConnectionPool
+
+
+URL = "http://localhost:8000/notify"
+
+
+def connection(
+    send_error: Optional[Exception] = None,
+    response_error: Optional[Exception] = None,
+) -> mock.MagicMock:
+    """A connection which fails on sending the request or on getting the response, if given the errors."""
+    connection_mock = mock.MagicMock()
+    connection_mock.request.side_effect = send_error
+    connection_mock.getresponse.side_effect = response_error
+    connection_mock.getresponse.return_value.status = 200
+    connection_mock.getresponse.return_value.read.return_value = b"ok"
+    connection_mock.getresponse.return_value.will_close = False
+    return connection_mock
+
+
+def pool_of(connections: List[mock.MagicMock]) -> ConnectionPool:
+    """A pool which has already used the first of the given connections, and opens the rest in order."""
+    pool = ConnectionPool(max_per_host=2, idle_timeout=60.0)
+    key, _ = pool._host_key(URL)
+    pool._active[key] = 1
+    pool._release(key, connections[0], reusable=True)
+    pool._connect = mock.MagicMock(side_effect=connections[1:])  # type: ignore
+    return pool
+
+
+class TestConnectionPool:
+    """Test ConnectionPool of MechInteract."""
+
+    @pytest.mark.parametrize(
+        "stale",
+        (
+            connection(send_error=BrokenPipeError()),
+            connection(response_error=RemoteDisconnected()),
+        ),
+    )
+    def test_retry_closed_connection(self, stale: mock.MagicMock) -> None:
+        """Test that a request is retried on a fresh connection if the server had closed the reused one."""
+        fresh = connection()
+        pool = pool_of([stale, fresh])
+        assert pool.request("post", URL, b"{}") == (200, b"ok")
+        stale.close.assert_called_once()
+        fresh.request.assert_called_once()
+        assert pool.stats["reused"] == pool.stats["created"] == 1
+
+    def test_no_retry_once_sent(self) -> None:
+        """Test that a request which has been written is not retried if its response times out, so it is not sent twice."""
+        reused, fresh = connection(response_error=socket.timeout()), connection()
+        pool = pool_of([reused, fresh])
+        with pytest.raises(socket.timeout):
+            pool.request("post", URL, b"{}")
+        reused.request.assert_called_once()
+        fresh.request.assert_not_called()
+
+    def test_no_retry_on_fresh_connection(self) -> None:
+        """Test that a request failing on a fresh connection is not retried."""
+        pool = ConnectionPool(max_per_host=2, idle_timeout=60.0)
+        fresh = connection(response_error=RemoteDisconnected())
+        pool._connect = mock.MagicMock(return_value=fresh)  # type: ignore
+        with pytest.raises(RemoteDisconnected):
+            pool.request("get", URL)
+        assert pool.stats["created"] == 1
+        assert pool.stats["hosts"]["http://localhost:8000"]["active"] == 0
+
+    def test_exhausted(self) -> None:
+        """Test that waiting for a connection of an exhausted pool is bounded by the request's timeout."""
+        pool = ConnectionPool(max_per_host=1, idle_timeout=60.0)
+        pool._connect = mock.MagicMock(return_value=connection())  # type: ignore
+        key, _ = pool._host_key(URL)
+        pool._acquire(key, timeout=1.0)
+        with pytest.raises(TimeoutError):
+            pool.request("get", URL, timeout=0.01)
+        assert pool.stats["timeouts"] == 1
+        assert pool.stats["hosts"]["http://localhost:8000"]["active"] == 1
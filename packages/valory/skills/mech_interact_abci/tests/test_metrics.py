@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the metrics.py module of the MechInteract."""
+
+import pytest
+
+from packages.valory.skills.mech_interact_abci.metrics import Registry
+
+
+class TestRegistry:
+    """Test Registry of MechInteract."""
+
+    def test_counter(self) -> None:
+        """Test that the counters are rendered per series, with their labels escaped."""
+        registry = Registry()
+        calls = registry.counter("calls_total", "The calls.", ("kind", "name"))
+        series = calls.labels("ipfs", "send")
+        series.inc()
+        series.inc(2)
+        calls.labels("contract_api", 'say "hi"').inc()
+
+        assert calls.labels("ipfs", "send") is series
+        assert registry.render() == (
+            "# HELP calls_total The calls.\n"
+            "# TYPE calls_total counter\n"
+            'calls_total{kind="ipfs",name="send"} 3\n'
+            'calls_total{kind="contract_api",name="say \\"hi\\""} 1\n'
+        )
+
+    def test_labels_mismatch(self) -> None:
+        """Test that a series cannot be selected with the wrong number of labels."""
+        registry = Registry()
+        calls = registry.counter("calls_total", "The calls.", ("kind",))
+        with pytest.raises(ValueError):
+            calls.labels("ipfs", "send")
+
+    def test_duplicate(self) -> None:
+        """Test that a metric cannot be registered twice."""
+        registry = Registry()
+        registry.gauge("depth", "The depth.")
+        with pytest.raises(ValueError):
+            registry.counter("depth", "The depth.")
+
+    def test_histogram(self) -> None:
+        """Test that the histograms are rendered with cumulative buckets, their sum and count."""
+        registry = Registry()
+        latency = registry.histogram("latency_seconds", "The latency.", (1, 5))
+        series = latency.labels()
+        for value in (0.5, 1, 3, 10):
+            series.observe(value)
+
+        assert registry.render() == (
+            "# HELP latency_seconds The latency.\n"
+            "# TYPE latency_seconds histogram\n"
+            'latency_seconds_bucket{le="1"} 2\n'
+            'latency_seconds_bucket{le="5"} 3\n'
+            'latency_seconds_bucket{le="+Inf"} 4\n'
+            "latency_seconds_sum 14.5\n"
+            "latency_seconds_count 4\n"
+        )
+
+    def test_collectors(self) -> None:
+        """Test that the collectors update the gauges before every rendering."""
+        registry = Registry()
+        depth = registry.gauge("depth", "The depth.", ("tool",))
+        queue = {"a": 2}
+        registry.add_collector(
+            lambda: [depth.labels(tool).set(n) for tool, n in queue.items()]
+        )
+
+        assert 'depth{tool="a"} 2\n' in registry.render()
+        queue["a"] = 0.25
+        assert 'depth{tool="a"} 0.25\n' in registry.render()
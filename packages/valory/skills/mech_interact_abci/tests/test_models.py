@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -20,7 +20,11 @@
 """Test the models.py module of the MechInteract."""
 
 from packages.valory.skills.abstract_round_abci.test_tools.base import DummyContext
-from packages.valory.skills.mech_interact_abci.models import SharedState
+from packages.valory.skills.mech_interact_abci.models import (
+    DeliverSubscription,
+    MechRouter,
+    SharedState,
+)
 
 
 class TestSharedState:
@@ -29,3 +33,100 @@ class TestSharedState:
     def test_initialization(self) -> None:
         """Test initialization."""
         SharedState(name="", skill_context=DummyContext())
+
+
+class TestDeliverSubscription:
+    """Test DeliverSubscription of MechInteract."""
+
+    def test_push_and_pop(self) -> None:
+        """Test that deliveries are pushed once and the cursor moves past the scanned blocks."""
+        subscription = DeliverSubscription()
+        subscription.track([1, 2], from_block=10)
+        assert subscription.from_block == 10
+        assert subscription.pending == [1, 2]
+
+        subscription.push(
+            [
+                {"requestId": 2, "data": b"2", "block_number": 12},
+                {"requestId": 3, "data": b"3", "block_number": 14},
+            ],
+            to_block=15,
+        )
+        assert subscription.from_block == 16
+        assert subscription.pending == [1]
+        assert subscription.latency(1) is None
+        assert subscription.latency(2) == 2
+        assert subscription.pop(1) is None
+        assert subscription.pop(3) is None
+        assert subscription.pop(2) == b"2"
+
+        subscription.push(
+            [{"requestId": 1, "data": b"1", "block_number": 20}], to_block=20
+        )
+        assert subscription.pop(1) == b"1"
+        assert subscription.pending == []
+        assert subscription.from_block is None
+
+    def test_track_rewinds_cursor(self) -> None:
+        """Test that tracking a request settled before the cursor rescans its blocks."""
+        subscription = DeliverSubscription()
+        subscription.track([1], from_block=10)
+        subscription.push([], to_block=30)
+        subscription.track([2], from_block=25)
+        assert subscription.from_block == 25
+
+
+class TestMechRouter:
+    """Test MechRouter of MechInteract."""
+
+    def test_route_spreads_requests(self) -> None:
+        """Test that a batch is spread over equally scored mechs and that the cheaper one is preferred."""
+        router = MechRouter(name="", skill_context=DummyContext())
+        candidates = ["0xa", "0xb"]
+        assert router.route("1", candidates) == "0xa"
+        assert router.route("2", candidates) == "0xb"
+        # re-routing a request does not count it twice
+        assert router.route("2", candidates) == "0xb"
+
+        router.record_delivery("1", "0xa", latency=5)
+        router.record_delivery("2", "0xb", latency=5)
+        router.update_price("0xa", 20, now=0.0)
+        router.update_price("0xb", 10, now=0.0)
+        assert router.route("3", candidates) == "0xb"
+        assert not router.is_price_stale("0xa", now=router.price_ttl)
+        assert router.is_price_stale("0xa", now=router.price_ttl + 1)
+
+    def test_failures_and_latency(self) -> None:
+        """Test that mechs which fail or deliver slowly are avoided."""
+        router = MechRouter(name="", skill_context=DummyContext())
+        candidates = ["0xa", "0xb"]
+        router.route("1", candidates)
+        router.record_failure("1", "0xa")
+        assert router.in_flight("0xa") == 0
+        assert router.route("2", candidates) == "0xb"
+
+        router.record_delivery("2", "0xb", latency=50)
+        router.record_delivery("3", "0xa", latency=5)
+        assert router.stats["0xa"].failure_rate < router.smoothing
+        assert router.route("4", candidates) == "0xa"
+
+    def test_load_and_serialize(self) -> None:
+        """Test that routers loading the same statistics route identically, regardless of their local history."""
+        router = MechRouter(name="", skill_context=DummyContext())
+        candidates = ["0xa", "0xb"]
+        router.update_price("0xa", 10, now=0.0)
+        router.record_delivery("1", "0xa", latency=50)
+        router.record_failure("2", "0xb")
+        serialized = router.serialize()
+
+        other = MechRouter(name="", skill_context=DummyContext())
+        other.record_failure("3", "0xa")
+        other.route("4", candidates)
+        other.load(serialized)
+        assert other.serialize() == serialized
+        assert other.in_flight("0xa") == 0
+        assert other.route("5", candidates) == router.route("5", candidates)
+
+        other.load("{}", {"6": "0xa"})
+        assert other.stats == {}
+        assert other.in_flight("0xa") == 1
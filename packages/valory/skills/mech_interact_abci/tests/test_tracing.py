@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the tracing.py module of the MechInteract."""
+
+import json
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from packages.valory.skills.mech_interact_abci.tracing import (
+    ROUND_KIND,
+    STAGE_KIND,
+    Tracer,
+    breakdown,
+    load_spans,
+)
+
+
+class TestTracer:
+    """Test Tracer of MechInteract."""
+
+    def test_export(self, tmp_path: Path) -> None:
+        """Test that the finished spans are exported to the JSONL file and kept in memory."""
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(str(path))
+        span = tracer.start(
+            "WaitRound", ROUND_KIND, ["b", "a", "a"], now=10.0, height=1
+        )
+        tracer.end(span, now=12.5)
+        tracer.stop()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 1
+        exported = json.loads(lines[0])
+        assert exported == {
+            "name": "WaitRound",
+            "kind": ROUND_KIND,
+            "nonces": ["a", "b"],
+            "start": 10.0,
+            "end": 12.5,
+            "duration": 2.5,
+            "status": "ok",
+            "attributes": {"height": 1},
+        }
+        assert tracer.spans == [exported]
+        assert load_spans(str(path)) == [exported]
+
+    def test_rotation(self, tmp_path: Path) -> None:
+        """Test that the file is rotated once it reaches its maximum size, keeping a bounded number of backups."""
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(str(path), max_bytes=1024, backup_count=2)
+        for i in range(100):
+            tracer.end(tracer.start(str(i), ROUND_KIND, ["a"], now=0.0), now=1.0)
+        tracer.stop()
+        tracer.end(tracer.start("stopped", ROUND_KIND, ["a"]))
+
+        files = sorted(file.name for file in tmp_path.iterdir())
+        assert files == ["traces.jsonl", "traces.jsonl.1", "traces.jsonl.2"]
+        assert all(file.stat().st_size <= 1024 for file in tmp_path.iterdir())
+        # the latest spans are in the current file, and the stopped tracer only keeps them in memory
+        assert load_spans(str(path))[-1]["name"] == "99"
+        assert tracer.spans[-1]["name"] == "stopped"
+
+    def test_span_errors(self) -> None:
+        """Test that the spans record the errors raised in them or the generators closed while in them."""
+        tracer = Tracer(None)
+        with pytest.raises(ValueError):
+            with tracer.span("send", "ipfs", ["a"]):
+                raise ValueError("unreachable")
+
+        def call() -> Generator[None, None, None]:
+            """Stand in for a behaviour which is waiting for an external call."""
+            with tracer.span("get_mint_data", "contract_api", ["a"]):
+                yield
+
+        generator = call()
+        next(generator)
+        generator.close()
+
+        statuses = [(span["name"], span["status"]) for span in tracer.trace("a")]
+        assert statuses == [("send", "error"), ("get_mint_data", "error")]
+        assert tracer.spans[0]["attributes"]["error"] == "ValueError: unreachable"
+        assert tracer.spans[1]["attributes"]["error"] == "interrupted"
+
+    def test_recorded_error(self) -> None:
+        """Test that a span fails if an error is recorded in its attributes."""
+        tracer = Tracer(None)
+        with tracer.span("mech_response", "http", ["a"]) as span:
+            span["attributes"]["error"] = "timed out"
+        assert tracer.spans[0]["status"] == "error"
+
+    def test_window(self) -> None:
+        """Test that only the latest spans are kept in memory."""
+        tracer = Tracer(None, window=2)
+        for name in ("first", "second", "third"):
+            tracer.end(tracer.start(name, ROUND_KIND, ["a"]))
+        assert [span["name"] for span in tracer.spans] == ["second", "third"]
+
+
+def test_breakdown() -> None:
+    """Test the aggregated breakdown of the spans."""
+    tracer = Tracer(None)
+    for nonce, start in (("a", 0.0), ("b", 100.0)):
+        rounds = (
+            ("WaitRound", 1.0),
+            ("MechResponseRound", 60.0),
+            ("NftMintRound", 9.0),
+        )
+        for name, duration in rounds:
+            tracer.end(
+                tracer.start(name, ROUND_KIND, [nonce], now=start), now=start + duration
+            )
+            start += duration
+        tracer.end(tracer.start("queued", STAGE_KIND, [nonce], now=0.0), now=30.0)
+    tracer.end(tracer.start("send", "ipfs", ["a"], now=0.0), now=3.0)
+    tracer.end(tracer.start("get_mint_data", "contract_api", ["a"], now=0.0), now=1.0)
+
+    result = tracer.breakdown()
+    assert list(result[ROUND_KIND]) == [
+        "MechResponseRound",
+        "NftMintRound",
+        "WaitRound",
+    ]
+    mech_response = result[ROUND_KIND]["MechResponseRound"]
+    assert mech_response["count"] == 2
+    assert mech_response["total"] == 120.0
+    assert mech_response["share"] == pytest.approx(60 / 70)
+    assert result[STAGE_KIND]["queued"]["share"] == 1.0
+    # the external calls' shares are relative to all the external calls
+    assert result["ipfs"]["send"]["share"] == 0.75
+    assert result["contract_api"]["get_mint_data"]["share"] == 0.25
+    assert result["end_to_end"]["p50"] == 70.0
+    assert "share" not in result["end_to_end"]
+    assert breakdown([]) == {}
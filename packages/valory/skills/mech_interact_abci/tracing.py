@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tracing of the requests across the rounds and the external calls."""
+
+import json
+import logging
+import math
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+from threading import Lock
+from typing import Any, Deque, Dict, Generator, Iterable, List, Optional
+
+
+ROUND_KIND = "round"
+STAGE_KIND = "stage"
+MAX_BYTES = 100 * 1024 * 1024
+BACKUP_COUNT = 3
+
+
+class Tracer:
+    """
+    Records timed spans, tagged with the nonces of the requests they were part of.
+
+    The spans cover the rounds of the FSM, the external calls, e.g., to IPFS, the contract and ledger APIs and HTTP services,
+    and the lifecycle stages of the requests. Every finished span is appended to a JSONL file,
+    so that the trace of a request can be reconstructed across restarts,
+    and the latest ones are kept in memory for the aggregated breakdown.
+    The spans are queued by the finishing thread and written by a background one,
+    so that the file's I/O does not block the agent's main loop,
+    and the file is rotated once it reaches its maximum size, keeping a bounded number of backups.
+    Spans may be finished from the background threads too.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        window: int = 10_000,
+        max_bytes: int = MAX_BYTES,
+        backup_count: int = BACKUP_COUNT,
+    ) -> None:
+        """
+        Initialize object.
+
+        :param path: the path of the JSONL file, which is opened on the first write. The spans are not exported if `None`.
+        :param window: the number of the latest finished spans kept in memory.
+        :param max_bytes: the size of the file from which on it is rotated.
+        :param backup_count: the number of the rotated files kept, as `<path>.1`, `<path>.2`, etc.
+        """
+        self.path = path
+        self._lock = Lock()
+        self._spans: Deque[Dict[str, Any]] = deque(maxlen=window)
+        self._listener: Optional[QueueListener] = None
+        # a logger of its own, so that the spans do not reach the agent's log
+        self.logger = logging.Logger("traces")
+        if path is None:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, delay=True
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        queue: SimpleQueue = SimpleQueue()
+        self.logger.addHandler(QueueHandler(queue))
+        self._listener = QueueListener(queue, file_handler)
+        self._listener.start()
+
+    def start(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        kind: str,
+        nonces: Iterable[str],
+        now: Optional[float] = None,
+        **attributes: Any,
+    ) -> Dict[str, Any]:
+        """
+        Start a span.
+
+        :param name: the name of the span, e.g., the round's id or the contract callable.
+        :param kind: the kind of the span, e.g., `round`, `ipfs` or `contract_api`.
+        :param nonces: the nonces of the requests the span is part of.
+        :param now: the start time, defaults to the current time.
+        :param attributes: any attributes to record with the span.
+        :return: the span, to be passed to `end`.
+        """
+        return {
+            "name": name,
+            "kind": kind,
+            "nonces": sorted(set(nonces)),
+            "start": time.time() if now is None else now,
+            "attributes": attributes,
+        }
+
+    def end(
+        self, span: Dict[str, Any], now: Optional[float] = None, error: str = ""
+    ) -> None:
+        """Finish a span and export it. The span has failed if an error is given or recorded in its attributes."""
+        span["end"] = time.time() if now is None else now
+        span["duration"] = span["end"] - span["start"]
+        if error:
+            span["attributes"]["error"] = error
+        span["status"] = "error" if span["attributes"].get("error") else "ok"
+        with self._lock:
+            self._spans.append(span)
+        if self._listener is not None:
+            self.logger.info(json.dumps(span, default=str))
+
+    def stop(self) -> None:
+        """Write the queued spans and stop the background thread. Later spans are only kept in memory."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+
+    @contextmanager
+    def span(
+        self, name: str, kind: str, nonces: Iterable[str], **attributes: Any
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Record the enclosed block as a span, with an error status if it raises."""
+        span = self.start(name, kind, nonces, **attributes)
+        try:
+            yield span
+        except Exception as e:
+            self.end(span, error=f"{type(e).__name__}: {e}")
+            raise
+        # generators closed while suspended in the block, e.g., behaviours stopped by a round's end
+        except GeneratorExit:
+            self.end(span, error="interrupted")
+            raise
+        self.end(span)
+
+    @property
+    def spans(self) -> List[Dict[str, Any]]:
+        """Get the latest finished spans."""
+        with self._lock:
+            return list(self._spans)
+
+    def trace(self, nonce: str) -> List[Dict[str, Any]]:
+        """Get the latest finished spans of the request with the given nonce, in order."""
+        spans = [span for span in self.spans if nonce in span["nonces"]]
+        return sorted(spans, key=lambda span: span["start"])
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Get the aggregated breakdown of the latest finished spans."""
+        return breakdown(self.spans)
+
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Load the spans exported to the given JSONL file, skipping any truncated line."""
+    spans = []
+    with open(path, "r") as file:
+        for line in file:
+            try:
+                spans.append(json.loads(line))
+            except json.decoder.JSONDecodeError:
+                continue
+    return spans
+
+
+def _summary(durations: List[float], total: Optional[float]) -> Dict[str, float]:
+    """Summarise the durations of a group of spans, with their share of the given total, if any."""
+    ordered = sorted(durations)
+
+    def percentile(q: float) -> float:
+        """Get the nearest-rank percentile of the durations."""
+        return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+    group_total = sum(ordered)
+    summary = {
+        "count": len(ordered),
+        "total": group_total,
+        "mean": group_total / len(ordered),
+        "p50": percentile(0.5),
+        "p90": percentile(0.9),
+        "max": ordered[-1],
+    }
+    if total is not None:
+        summary["share"] = group_total / total if total else 0.0
+    return summary
+
+
+def breakdown(spans: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate spans into a breakdown of where the requests' time goes.
+
+    The spans are grouped by kind and name. The rounds' shares are relative to the total time spent in rounds,
+    the stages' shares to the total time in the requests' lifecycles
+    and the external calls' shares to the total time spent in external calls.
+    The end-to-end times of the requests are summed from the rounds they went through.
+
+    :param spans: the finished spans.
+    :return: the breakdown, per kind and name, and the requests' end-to-end times.
+    """
+    groups: Dict[str, Dict[str, List[float]]] = {}
+    end_to_end: Dict[str, float] = {}
+    for span in spans:
+        kind_groups = groups.setdefault(span["kind"], {})
+        kind_groups.setdefault(span["name"], []).append(span["duration"])
+        if span["kind"] == ROUND_KIND:
+            for nonce in span["nonces"]:
+                end_to_end[nonce] = end_to_end.get(nonce, 0.0) + span["duration"]
+
+    result: Dict[str, Any] = {}
+    calls_total = sum(
+        sum(durations)
+        for kind, kind_groups in groups.items()
+        if kind not in (ROUND_KIND, STAGE_KIND)
+        for durations in kind_groups.values()
+    )
+    for kind, kind_groups in groups.items():
+        total = calls_total
+        if kind in (ROUND_KIND, STAGE_KIND):
+            total = sum(sum(durations) for durations in kind_groups.values())
+        summaries = {
+            name: _summary(durations, total) for name, durations in kind_groups.items()
+        }
+        result[kind] = dict(
+            sorted(summaries.items(), key=lambda item: -item[1]["total"])
+        )
+    if end_to_end:
+        result["end_to_end"] = _summary(list(end_to_end.values()), None)
+    return result
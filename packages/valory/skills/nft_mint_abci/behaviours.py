@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -45,6 +45,7 @@ from packages.valory.skills.abstract_round_abci.behaviours import (
     BaseBehaviour,
 )
 from packages.valory.skills.abstract_round_abci.io_.store import SupportedFiletype
+from packages.valory.skills.mech_interact_abci.behaviours.base import TracedBehaviour
 from packages.valory.skills.nft_mint_abci.models import Params
 from packages.valory.skills.nft_mint_abci.payloads import (
     NftMintPayload,
@@ -65,7 +66,7 @@ SAFE_TX_GAS = 0
 ETHER_VALUE = 0
 
 
-class NftMintAbciBaseBehaviour(BaseBehaviour, ABC):
+class NftMintAbciBaseBehaviour(TracedBehaviour, ABC):
     """Base behaviour for the common apps' skill."""
 
     @property
@@ -116,13 +117,17 @@ class MintNftBehaviour(NftMintAbciBaseBehaviour):
             "value": ETHER_VALUE,
         }
 
-    def _publish_metadata(self, image: str, video: str) -> Generator:
+    def _publish_metadata(self, image: str, video: str, nonce: str) -> Generator:
         """Publish metadata to IPFS."""
         metadata = {
             "name": "Blockchain Short",
             "description": "NFT Mint for blockchain shorts.",
             "image": f"ipfs://{image}",
-            "attributes": [{"trait_type": "version", "value": "0.1.0"}],
+            # the contract rejects duplicate hashes, so every token needs its own metadata
+            "attributes": [
+                {"trait_type": "version", "value": "0.1.0"},
+                {"trait_type": "request", "value": nonce},
+            ],
             "animation_url": f"ipfs://{video}",
         }
         ipfs_hash = yield from self.send_to_ipfs(
@@ -136,33 +141,56 @@ class MintNftBehaviour(NftMintAbciBaseBehaviour):
         """Get the round payload"""
         mech_response = self.synchronized_data.mech_responses[0]
         self.context.logger.info(f"mech_response: {mech_response}")
+        if mech_response.result is None:
+            self.context.logger.error(
+                f"The mech did not respond to request {mech_response.nonce}: {mech_response.error}"
+            )
+            self.context.state.inbox.fail(mech_response.nonce, mech_response.error)
+            return NftMintRound.ERROR_PAYLOAD
+
         try:
             data = json.loads(mech_response.result)
         except json.JSONDecodeError:
             self.context.logger.error(
                 f"Couldn't decode the mech response: {mech_response.result}"
             )
+            self.context.state.inbox.fail(
+                mech_response.nonce, "The mech's response could not be decoded."
+            )
             return NftMintRound.ERROR_PAYLOAD
 
-        owner = self.synchronized_data.requests[mech_response.nonce]
-        ipfs_hash = yield from self._publish_metadata(
-            image=data["image"],
-            video=data["video"],
-        )
-        metadata_str = self.to_multihash(to_v1(ipfs_hash))
-        metadata = bytes.fromhex(metadata_str)
-        mint_tx = yield from self._prepare_mint_mstx(
-            owner=owner,
-            metadata=metadata,
-        )
-        if mint_tx is None:
-            self.context.logger.error("Couldn't prepare the mint tx.")
-            return NftMintRound.ERROR_PAYLOAD
-        tx_hash = yield from self._to_multisend(
-            transactions=[
-                mint_tx,
-            ]
-        )
+        inbox = self.context.state.inbox
+        inbox.cache_result(mech_response.nonce, mech_response.result)
+        # a coalesced request's result is minted once for every requester,
+        # including the ones which have been coalesced into it while it was waiting on the mech
+        requests = {
+            **self.synchronized_data.requests,
+            **inbox.requests_of(mech_response.nonce),
+        }
+        mint_txs = []
+        metadata_hashes = {}
+        for nonce, owner in requests.items():
+            ipfs_hash = yield from self._publish_metadata(
+                image=data["image"],
+                video=data["video"],
+                nonce=nonce,
+            )
+            if ipfs_hash is None:
+                self.context.logger.error("Couldn't publish the NFT metadata.")
+                return NftMintRound.ERROR_PAYLOAD
+            metadata_str = self.to_multihash(to_v1(ipfs_hash))
+            metadata = bytes.fromhex(metadata_str)
+            mint_tx = yield from self._prepare_mint_mstx(
+                owner=owner,
+                metadata=metadata,
+            )
+            if mint_tx is None:
+                self.context.logger.error("Couldn't prepare the mint tx.")
+                return NftMintRound.ERROR_PAYLOAD
+            mint_txs.append(mint_tx)
+            metadata_hashes[nonce] = ipfs_hash
+
+        tx_hash = yield from self._to_multisend(transactions=mint_txs)
         if tx_hash is None:
             self.context.logger.error("Couldn't compile the multisend tx.")
             return NftMintRound.ERROR_PAYLOAD
@@ -170,7 +198,8 @@ class MintNftBehaviour(NftMintAbciBaseBehaviour):
         data = json.dumps(
             dict(
                 tx_hash=tx_hash,
-                metadata_hash=ipfs_hash,
+                metadata_hashes=metadata_hashes,
+                requests=requests,
             ),
             sort_keys=True,
         )
@@ -275,39 +304,45 @@ class VerifyMintBehaviour(NftMintAbciBaseBehaviour):
 
     matching_round: Type[AbstractRound] = VerifyMintRound
 
-    def _get_token_id(
+    def _get_token_ids(
         self,
         tx_hash: str,
-        metadata_hash: str,
-    ) -> Generator[None, None, Optional[int]]:
-        """Get token ID"""
+    ) -> Generator[None, None, Optional[Dict[str, int]]]:
+        """Get the ids of the tokens minted by the given tx, keyed by the hex of their metadata hash."""
         response = yield from self.get_contract_api_response(
             performative=ContractApiMessage.Performative.GET_STATE,
             contract_address=self.params.blockchain_shorts_contract,
             contract_id=str(BlockchainShortsContract.contract_id),
-            contract_callable="get_token_id_from_hash",
+            contract_callable="get_token_ids_from_hash",
             tx_hash=tx_hash,
-            metadata_hash=metadata_hash,
         )
         if response.performative != ContractApiMessage.Performative.STATE:
             self.context.logger.warning(
-                f"get_token_id_from_hash unsuccessful!: {response}"
+                f"get_token_ids_from_hash unsuccessful!: {response}"
             )
             return None
-        return response.state.body["token_id"]
+        return response.state.body["token_ids"]
 
     def async_act(self) -> Generator:
         """Verify NFT mint."""
-        token_id = yield from self._get_token_id(
+        minted = yield from self._get_token_ids(
             tx_hash=self.synchronized_data.final_tx_hash,
-            metadata_hash=self.synchronized_data.metadata_hash,
         )
-        if token_id is None:
+        if minted is None:
             return
+        token_ids = {}
+        for nonce, ipfs_hash in self.synchronized_data.metadata_hashes.items():
+            token_id = minted.get(self.to_multihash(to_v1(ipfs_hash)), None)
+            if token_id is None:
+                self.context.logger.warning(
+                    f"No token was minted for request {nonce} with metadata {ipfs_hash}."
+                )
+                return
+            token_ids[nonce] = token_id
         with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
             payload = VerifyMintPayload(
                 sender=self.context.agent_address,
-                token_id=token_id,
+                token_ids=json.dumps(token_ids, sort_keys=True),
             )
             yield from self.send_a2a_transaction(payload)
             yield from self.wait_until_round_end()
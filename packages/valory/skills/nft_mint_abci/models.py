@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -21,13 +21,17 @@
 from typing import Any
 
 from packages.valory.skills.abstract_round_abci.models import BaseParams
-from packages.valory.skills.abstract_round_abci.models import (
-    BenchmarkTool as BaseBenchmarkTool,
-)
 from packages.valory.skills.abstract_round_abci.models import Requests as BaseRequests
 from packages.valory.skills.abstract_round_abci.models import (
     SharedState as BaseSharedState,
 )
+from packages.valory.skills.mech_interact_abci.models import (
+    BenchmarkTool as BaseBenchmarkTool,
+)
+from packages.valory.skills.mech_interact_abci.models import Metrics as BaseMetrics
+from packages.valory.skills.mech_interact_abci.models import (
+    RequestTracer as BaseRequestTracer,
+)
 from packages.valory.skills.nft_mint_abci.rounds import NftMintAbciApp
 
 
@@ -50,3 +54,5 @@ class Params(BaseParams):
 
 Requests = BaseRequests
 BenchmarkTool = BaseBenchmarkTool
+RequestTracer = BaseRequestTracer
+Metrics = BaseMetrics
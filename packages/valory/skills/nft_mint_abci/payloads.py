@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -35,4 +35,4 @@ class NftMintPayload(BaseTxPayload):
 class VerifyMintPayload(BaseTxPayload):
     """Represent a transaction payload for the TokenTrackRound."""
 
-    token_id: int
+    token_ids: str
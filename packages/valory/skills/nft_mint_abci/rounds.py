@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2024 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -86,14 +86,14 @@ class SynchronizedData(BaseSynchronizedData):
         return cast(str, self.db.get_strict("final_tx_hash"))
 
     @property
-    def metadata_hash(self) -> str:
-        """Get the verified tx hash."""
-        return cast(str, self.db.get_strict("final_tx_hash"))
+    def metadata_hashes(self) -> Dict[str, str]:
+        """Get the IPFS hashes of the minted tokens' metadata, keyed by request nonce."""
+        return cast(Dict[str, str], self.db.get_strict("metadata_hashes"))
 
     @property
-    def token_id(self) -> int:
-        """Get the verified tx hash."""
-        return cast(int, self.db.get_strict("token_id"))
+    def token_ids(self) -> Dict[str, int]:
+        """Get the ids of the minted tokens, keyed by request nonce."""
+        return cast(Dict[str, int], json.loads(self.db.get_strict("token_ids")))
 
 
 class NftMintRound(CollectSameUntilThresholdRound):
@@ -116,7 +116,12 @@ class NftMintRound(CollectSameUntilThresholdRound):
                 synchronized_data_class=SynchronizedData,
                 **{
                     get_name(SynchronizedData.most_voted_tx_hash): payload["tx_hash"],
-                    get_name(SynchronizedData.metadata_hash): payload["metadata_hash"],
+                    get_name(SynchronizedData.metadata_hashes): payload[
+                        "metadata_hashes"
+                    ],
+                    get_name(SynchronizedData.requests): payload.get(
+                        "requests", self.synchronized_data.requests
+                    ),
                     "tx_submitter": self.auto_round_id(),
                 }
             )
@@ -141,7 +146,7 @@ class VerifyMintRound(CollectSameUntilThresholdRound):
             synchronized_data = self.synchronized_data.update(
                 synchronized_data_class=SynchronizedData,
                 **{
-                    get_name(SynchronizedData.token_id): self.most_voted_payload,
+                    get_name(SynchronizedData.token_ids): self.most_voted_payload,
                 }
             )
             return synchronized_data, Event.DONE
@@ -202,7 +207,7 @@ class NftMintAbciApp(AbciApp[Event]):
             get_name(SynchronizedData.most_voted_tx_hash),
         },
         FinishedVerifyMintRound: {
-            get_name(SynchronizedData.token_id),
+            get_name(SynchronizedData.token_ids),
         },
         FinishedWithErrorRound: set(),
     }
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2024 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -20,15 +20,25 @@
 """This package contains round behaviours of OutboxAbciApp."""
 
 import json
+import time
 from abc import ABC
-from typing import Generator, Set, Type, cast
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Generator, List, Optional, Set, Tuple, Type, cast
+
+from aea.skills.behaviours import TickerBehaviour
 
 from packages.valory.skills.abstract_round_abci.base import AbstractRound
 from packages.valory.skills.abstract_round_abci.behaviours import (
     AbstractRoundBehaviour,
     BaseBehaviour,
 )
-from packages.valory.skills.outbox_abci.models import Params
+from packages.valory.skills.inbox_abci.handlers import RequestStage
+from packages.valory.skills.outbox_abci.models import HttpPool, Params, RequestTracer
+from packages.valory.skills.outbox_abci.notifications import (
+    NotificationQueue,
+    deliver,
+    undelivered_accounts,
+)
 from packages.valory.skills.outbox_abci.payloads import PushNotificationPayload
 from packages.valory.skills.outbox_abci.rounds import (
     OutboxAbciApp,
@@ -37,6 +47,9 @@ from packages.valory.skills.outbox_abci.rounds import (
 )
 
 
+NOTIFICATION_BODY = "Your Blockchain Short NFT has been minted."
+
+
 class OutboxAbciBaseBehaviour(BaseBehaviour, ABC):
     """Base behaviour for the common apps' skill."""
 
@@ -56,43 +69,48 @@ class PushNotificationBehaviour(OutboxAbciBaseBehaviour):
 
     matching_round: Type[AbstractRound] = PushNotificationRound
 
-    def _push_from_response(self) -> Generator:
+    @property
+    def notifications(self) -> NotificationQueue:
+        """Get the queue of the push notifications."""
+        return cast(NotificationQueue, self.context.state.notifications)
+
+    def _push_from_response(self) -> None:
         """
         Push notification from mech interaction response.
 
         https://docs.walletconnect.com/web3inbox/sending-notifications?send-client=curl
         """
         response = self.synchronized_data.mech_responses[0]
-        data = json.loads(response.result)
-        data["id"] = self.synchronized_data.token_id
-        self.context.state.inbox.add_response(data)
-        address = self.synchronized_data.requests[response.nonce]
+        # coalesced requests share the mech's response, but each one has its own token
+        for nonce, token_id in self.synchronized_data.token_ids.items():
+            data = json.loads(response.result)
+            data["id"] = token_id
+            data["nonce"] = nonce
+            self.context.state.inbox.add_response(data)
+            address = self.synchronized_data.requests[nonce]
+            self._push_notification(address, nonce, token_id)
+
+    def _push_notification(self, address: str, nonce: str, token_id: int) -> None:
+        """Queue a notification for the token minted for the given address."""
         self.context.logger.info(
-            f"Pushing notification for address {address} with nonce {response.nonce}"
+            f"Queueing notification for address {address} with nonce {nonce} and token ID {token_id}"
         )
-        notification_response = yield from self.get_http_response(
-            method="post",
-            url=f"https://notify.walletconnect.com/{self.params.w3_inbox_project_id}/notify",
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.params.w3_notification_api_key}",
+        # the notification is delivered in the background, by the `NotificationDeliveryBehaviour`,
+        # which only batches the notifications sharing the same content,
+        # so the content carries nothing specific to the token
+        self.notifications.put(
+            nonce,
+            {
+                "type": f"{self.params.w3_notification_type}",
+                "title": "Another",
+                "body": NOTIFICATION_BODY,
             },
-            content=json.dumps(
-                {
-                    "notification": {
-                        "type": f"{self.params.w3_notification_type}",
-                        "title": "Another",
-                        "body": f"Minted NFT with token ID {self.synchronized_data.token_id}",
-                    },
-                    "accounts": [f"eip155:1:{address}"],
-                }
-            ).encode("utf-8"),
+            f"eip155:1:{address}",
         )
-        self.context.logger.info(notification_response)
 
     def async_act(self) -> Generator:
         """Get a list of the new tokens."""
-        yield from self._push_from_response()
+        self._push_from_response()
         with self.context.benchmark_tool.measure(
             self.behaviour_id,
         ).consensus():
@@ -104,6 +122,140 @@ class PushNotificationBehaviour(OutboxAbciBaseBehaviour):
         self.set_done()
 
 
+class NotificationDeliveryBehaviour(TickerBehaviour):
+    """Delivers the queued push notifications, off the critical path of the periods."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initialize the behaviour."""
+        self.queue_path: str = kwargs.pop("queue_path", "/logs/notifications.json")
+        self.dead_letter_path: str = kwargs.pop(
+            "dead_letter_path", "/logs/notifications_dead_letter.jsonl"
+        )
+        self.max_attempts: int = kwargs.pop("max_attempts", 5)
+        self.backoff_base: float = kwargs.pop("backoff_base", 2.0)
+        self.backoff_max: float = kwargs.pop("backoff_max", 300.0)
+        self.max_in_flight: int = kwargs.pop("max_in_flight", 4)
+        self.max_batch_size: int = kwargs.pop("max_batch_size", 100)
+        self.request_timeout: float = kwargs.pop("request_timeout", 10.0)
+        super().__init__(**kwargs)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # the in-flight deliveries, keyed by the id of their first entry
+        self._in_flight: Dict[str, Tuple[Future, List[Dict[str, Any]]]] = {}
+
+    @property
+    def params(self) -> Params:
+        """Return the params."""
+        return cast(Params, self.context.params)
+
+    @property
+    def notifications(self) -> NotificationQueue:
+        """Get the queue of the push notifications."""
+        return cast(NotificationQueue, self.context.state.notifications)
+
+    @property
+    def http_pool(self) -> HttpPool:
+        """Get the pool of keep-alive HTTP connections."""
+        return cast(HttpPool, self.context.http_pool)
+
+    @property
+    def tracer(self) -> RequestTracer:
+        """Get the tracer of the requests."""
+        return cast(RequestTracer, self.context.tracer)
+
+    @property
+    def url(self) -> str:
+        """Get the url of the notification service."""
+        return (
+            f"https://notify.walletconnect.com/{self.params.w3_inbox_project_id}/notify"
+        )
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Get the headers of the notification requests."""
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.params.w3_notification_api_key}",
+        }
+
+    def setup(self) -> None:
+        """Set up the behaviour."""
+        self.context.state.notifications = NotificationQueue(
+            logger=self.context.logger,
+            path=self.queue_path,
+            dead_letter_path=self.dead_letter_path,
+            max_attempts=self.max_attempts,
+            backoff_base=self.backoff_base,
+            backoff_max=self.backoff_max,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+
+    def act(self) -> None:
+        """Collect the finished deliveries and start the due ones."""
+        now = time.time()
+        self._collect(now)
+        free_slots = self.max_in_flight - len(self._in_flight)
+        if free_slots <= 0:
+            return
+        executor = cast(ThreadPoolExecutor, self._executor)
+        in_flight_ids = {
+            entry["id"] for _, batch in self._in_flight.values() for entry in batch
+        }
+        batches = self.notifications.batches(
+            now, self.max_batch_size, exclude=in_flight_ids
+        )
+        for batch in batches[:free_slots]:
+            future = executor.submit(self._deliver, batch)
+            self._in_flight[batch[0]["id"]] = (future, batch)
+
+    def _deliver(self, batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Deliver a batch of notifications, recording a span. This runs on the executor's threads."""
+        nonces = [entry["id"] for entry in batch]
+        with self.tracer.span("notification", "http", nonces, accounts=len(batch)):
+            return deliver(
+                self.http_pool.pool,
+                self.url,
+                self.headers,
+                batch[0]["notification"],
+                [entry["account"] for entry in batch],
+                self.request_timeout,
+            )
+
+    def _collect(self, now: float) -> None:
+        """Update the queue with the results of the finished deliveries."""
+        for batch_id, (future, batch) in list(self._in_flight.items()):
+            if not future.done():
+                continue
+            del self._in_flight[batch_id]
+            # the entries of a failed batch fall back to being delivered one by one
+            solo = len(batch) > 1
+            error = future.exception()
+            if error is not None:
+                for entry in batch:
+                    self.notifications.failed(entry["id"], str(error), now, solo)
+                continue
+
+            undelivered = undelivered_accounts(future.result())
+            n_delivered = 0
+            for entry in batch:
+                reason = undelivered.get(entry["account"], None)
+                if reason is None:
+                    self.notifications.delivered(entry["id"])
+                    self.context.state.inbox.set_stage(
+                        entry["id"], RequestStage.NOTIFIED
+                    )
+                    n_delivered += 1
+                    continue
+                self.notifications.failed(entry["id"], reason, now, solo)
+            self.context.logger.info(
+                f"Delivered {n_delivered}/{len(batch)} notifications in one request."
+            )
+
+    def teardown(self) -> None:
+        """Tear down the behaviour."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
 class OutboxAbciRoundBehaviour(AbstractRoundBehaviour):
     """OutboxAbciRoundBehaviour"""
 
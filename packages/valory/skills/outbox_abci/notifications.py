@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the durable queue of the push notifications of OutboxAbciApp."""
+
+import json
+import os
+from logging import Logger
+from typing import Any, Collection, Dict, List, Optional, cast
+
+from packages.valory.skills.mech_interact_abci.http_pool import ConnectionPool
+
+
+class DeliveryError(Exception):
+    """Raised when the notification service rejects a request."""
+
+
+class NotificationQueue:
+    """
+    A durable queue of push notifications.
+
+    Each entry is a notification for a single account.
+    Due entries sharing the same notification are delivered together, in batches of accounts.
+    The queue is persisted on every change, so that no notification is lost on a restart.
+    Failed deliveries are retried with an exponential backoff,
+    and the notifications which keep failing are moved to a dead-letter file.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        logger: Logger,
+        path: str,
+        dead_letter_path: str,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+    ) -> None:
+        """Initialize object."""
+        self.logger = logger
+        self.path = path
+        self.dead_letter_path = dead_letter_path
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._entries: List[Dict[str, Any]] = []
+        self._load()
+
+    def __len__(self) -> int:
+        """Get the number of the pending notifications."""
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Load the pending notifications from the queue's file."""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r") as file:
+            try:
+                self._entries = json.load(file)
+            except json.decoder.JSONDecodeError as e:
+                self.logger.error(
+                    f"Error loading the notification queue: {e}. Starting with an empty queue."
+                )
+
+    def _persist(self) -> None:
+        """Persist the pending notifications, replacing the queue's file atomically."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self._entries, file)
+        os.replace(tmp_path, self.path)
+
+    def _find(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        """Find the pending notification with the given id."""
+        for entry in self._entries:
+            if entry["id"] == entry_id:
+                return entry
+        return None
+
+    def put(self, entry_id: str, notification: Dict[str, Any], account: str) -> None:
+        """Queue a notification for an account, unless an entry with the same id is already pending."""
+        if self._find(entry_id) is not None:
+            return
+        entry = {
+            "id": entry_id,
+            "notification": notification,
+            "account": account,
+            "attempts": 0,
+            "next_attempt": 0.0,
+            "solo": False,
+        }
+        self._entries.append(entry)
+        self._persist()
+
+    def due(self, now: float, exclude: Collection[str] = ()) -> List[Dict[str, Any]]:
+        """Get the pending notifications which are due for delivery, in order."""
+        return [
+            entry
+            for entry in self._entries
+            if entry["next_attempt"] <= now and entry["id"] not in exclude
+        ]
+
+    def batches(
+        self, now: float, max_batch_size: int, exclude: Collection[str] = ()
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Group the due entries which share the same notification into batches.
+
+        Entries which have failed as part of a batch are delivered on their own,
+        so that a single failing account cannot hold back the rest.
+
+        :param now: the current time.
+        :param max_batch_size: the maximum number of accounts per batch.
+        :param exclude: the ids of the entries to leave out, e.g., the ones being delivered.
+        :return: the batches, in the order of their oldest entry.
+        """
+        batches: List[List[Dict[str, Any]]] = []
+        open_batches: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in self.due(now, exclude):
+            if entry["solo"]:
+                batches.append([entry])
+                continue
+            key = json.dumps(entry["notification"], sort_keys=True)
+            batch = open_batches.get(key, None)
+            if batch is None or len(batch) >= max_batch_size:
+                batch = []
+                open_batches[key] = batch
+                batches.append(batch)
+            batch.append(entry)
+        return batches
+
+    def delivered(self, entry_id: str) -> None:
+        """Remove a delivered notification from the queue."""
+        entry = self._find(entry_id)
+        if entry is None:
+            return
+        self._entries.remove(entry)
+        self._persist()
+
+    def failed(self, entry_id: str, error: str, now: float, solo: bool = False) -> None:
+        """Schedule the retry of a failed notification or move it to the dead-letter file."""
+        entry = self._find(entry_id)
+        if entry is None:
+            return
+
+        entry["attempts"] += 1
+        entry["last_error"] = error
+        entry["solo"] = entry["solo"] or solo
+        if entry["attempts"] < self.max_attempts:
+            backoff = self.backoff_base * 2 ** (entry["attempts"] - 1)
+            entry["next_attempt"] = now + min(backoff, self.backoff_max)
+            self.logger.warning(
+                f"Delivery of notification {entry_id} failed: {error}. "
+                f"Retrying in {entry['next_attempt'] - now} seconds."
+            )
+            self._persist()
+            return
+
+        self.logger.error(
+            f"Delivery of notification {entry_id} failed {entry['attempts']} times: {error}. "
+            f"Moving it to {self.dead_letter_path}."
+        )
+        self._entries.remove(entry)
+        with open(self.dead_letter_path, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+        self._persist()
+
+
+def deliver(  # pylint: disable=too-many-arguments
+    pool: ConnectionPool,
+    url: str,
+    headers: Dict[str, str],
+    notification: Dict[str, Any],
+    accounts: List[str],
+    timeout: float,
+) -> Dict[str, Any]:
+    """
+    Post a notification to the given accounts, raising on any failure.
+
+    This blocks, so it is meant to be run off the agent's main loop.
+
+    :param pool: the pool of keep-alive connections to send the request over.
+    :param url: the url of the notification service.
+    :param headers: the headers of the request.
+    :param notification: the notification.
+    :param accounts: the accounts to notify.
+    :param timeout: the timeout of the request, in seconds.
+    :return: the service's response, which reports the accounts that were not notified, if any.
+    """
+    body = {"notification": notification, "accounts": accounts}
+    status_code, content = pool.request(
+        "POST", url, json.dumps(body).encode("utf-8"), headers, timeout
+    )
+    if status_code >= 400:
+        raise DeliveryError(f"The notification service responded with {status_code}.")
+    if not content:
+        return {}
+    return cast(Dict[str, Any], json.loads(content))
+
+
+def undelivered_accounts(response: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Get the accounts which a notification could not be delivered to, with the reason.
+
+    :param response: the notification service's response.
+    :return: the undelivered accounts, mapped to the reason of the failure.
+    """
+    undelivered = {}
+    for failure in response.get("failed", []):
+        # the failures may be reported either as plain accounts or with a reason
+        if isinstance(failure, dict):
+            undelivered[failure.get("account", "")] = failure.get("reason", "failed")
+        else:
+            undelivered[str(failure)] = "failed"
+    return undelivered
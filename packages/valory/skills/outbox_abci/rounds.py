@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2024 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -58,9 +58,9 @@ class SynchronizedData(BaseSynchronizedData):
     """
 
     @property
-    def token_id(self) -> str:
-        """Get the verified tx hash."""
-        return cast(str, self.db.get_strict("token_id"))
+    def token_ids(self) -> Dict[str, int]:
+        """Get the ids of the minted tokens, keyed by request nonce."""
+        return cast(Dict[str, int], json.loads(self.db.get_strict("token_ids")))
 
     @property
     def requests(self) -> Dict:
@@ -118,7 +118,7 @@ class OutboxAbciApp(AbciApp[Event]):
     }
     db_pre_conditions: Dict[AppState, Set[str]] = {
         PushNotificationRound: {
-            get_name(SynchronizedData.token_id),
+            get_name(SynchronizedData.token_ids),
         },
     }
     db_post_conditions: Dict[AppState, Set[str]] = {
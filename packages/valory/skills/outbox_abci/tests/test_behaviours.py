@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the behaviours.py module of the Outbox."""
+
+import json
+from pathlib import Path
+from unittest import mock
+
+from packages.valory.skills.abstract_round_abci.base import AbciAppDB
+from packages.valory.skills.outbox_abci import behaviours
+from packages.valory.skills.outbox_abci.behaviours import (
+    NotificationDeliveryBehaviour,
+    PushNotificationBehaviour,
+)
+from packages.valory.skills.outbox_abci.rounds import SynchronizedData
+
+
+def test_one_request_per_period(tmp_path: Path) -> None:
+    """Test that the notifications of the tokens minted in one period are delivered in a single request."""
+    context = mock.MagicMock()
+    context.params.w3_notification_type = "type"
+    delivery = NotificationDeliveryBehaviour(
+        name="delivery",
+        skill_context=context,
+        queue_path=str(tmp_path / "notifications.json"),
+        dead_letter_path=str(tmp_path / "dead_letter.jsonl"),
+    )
+    delivery.setup()
+
+    data = dict(
+        requests={"a": "0x1", "b": "0x2"},
+        token_ids=json.dumps({"a": 1, "b": 2}),
+        mech_responses=json.dumps(
+            [{"nonce": "a", "result": json.dumps({"image": "i", "video": "v"})}]
+        ),
+    )
+    context.state.synchronized_data = SynchronizedData(
+        AbciAppDB(setup_data=AbciAppDB.data_to_lists(data))
+    )
+    PushNotificationBehaviour(name="push", skill_context=context)._push_from_response()
+
+    with mock.patch.object(behaviours, "deliver", return_value={}) as deliver:
+        delivery.act()
+        for future, _ in delivery._in_flight.values():
+            future.result()
+    delivery.teardown()
+
+    deliver.assert_called_once()
+    notification, accounts = deliver.call_args.args[3:5]
+    assert accounts == ["eip155:1:0x1", "eip155:1:0x2"]
+    assert notification["body"] == behaviours.NOTIFICATION_BODY
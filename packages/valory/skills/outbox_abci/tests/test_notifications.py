@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the notifications.py module of the Outbox."""
+
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any, Dict, Generator, List, Tuple
+
+import pytest
+
+from packages.valory.skills.mech_interact_abci.http_pool import ConnectionPool
+from packages.valory.skills.outbox_abci.notifications import (
+    DeliveryError,
+    NotificationQueue,
+    deliver,
+    undelivered_accounts,
+)
+
+
+NOTIFICATION = {"type": "type", "title": "title", "body": "body"}
+OTHER_NOTIFICATION = {"type": "type", "title": "title", "body": "other"}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """A stand-in for the notification service, which records the notifications it receives."""
+
+    # keep the connections alive, so that they can be reused
+    protocol_version = "HTTP/1.1"
+    received: List[Tuple[str, Dict[str, Any]]] = []
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Handle a notification, failing on the `/fail` path."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.received.append((self.path, body))
+        if self.path == "/fail":
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        # the first account is reported as failed on the `/partial` path
+        failed = body["accounts"][:1] if self.path == "/partial" else []
+        response = json.dumps({"sent": body["accounts"][1:], "failed": failed})
+        content = response.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args: Any) -> None:
+        """Do not log the requests."""
+
+
+@pytest.fixture
+def stand_in() -> Generator[str, None, None]:
+    """Serve the stand-in notification service on a free local port."""
+    StandInHandler.received = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool() -> Generator[ConnectionPool, None, None]:
+    """A pool of keep-alive connections."""
+    connection_pool = ConnectionPool(max_per_host=2, idle_timeout=60.0)
+    yield connection_pool
+    connection_pool.close()
+
+
+def make_queue(tmp_path: Path) -> NotificationQueue:
+    """Create a notification queue in the given directory."""
+    return NotificationQueue(
+        logger=logging.getLogger(__name__),
+        path=str(tmp_path / "notifications.json"),
+        dead_letter_path=str(tmp_path / "dead_letter.jsonl"),
+        max_attempts=3,
+        backoff_base=2.0,
+        backoff_max=3.0,
+    )
+
+
+class TestNotificationQueue:
+    """Test NotificationQueue of Outbox."""
+
+    def test_durability(self, tmp_path: Path) -> None:
+        """Test that the pending notifications survive a restart and are queued once."""
+        queue = make_queue(tmp_path)
+        queue.put("nonce", NOTIFICATION, "account")
+        queue.put("nonce", NOTIFICATION, "account")
+        assert len(make_queue(tmp_path)) == 1
+
+        queue.delivered("nonce")
+        assert len(make_queue(tmp_path)) == 0
+
+    def test_backoff_and_dead_letter(self, tmp_path: Path) -> None:
+        """Test that failed notifications are retried with a backoff and dead-lettered eventually."""
+        queue = make_queue(tmp_path)
+        queue.put("nonce", NOTIFICATION, "account")
+        assert [entry["id"] for entry in queue.due(0.0)] == ["nonce"]
+        assert queue.due(0.0, exclude={"nonce"}) == []
+
+        queue.failed("nonce", "error", now=0.0)
+        assert queue.due(1.9) == []
+        assert len(queue.due(2.0)) == 1
+
+        # the backoff is capped
+        queue.failed("nonce", "error", now=2.0)
+        assert queue.due(4.9) == []
+        assert len(queue.due(5.0)) == 1
+
+        queue.failed("nonce", "error", now=5.0)
+        assert len(queue) == 0
+        dead_letters = (tmp_path / "dead_letter.jsonl").read_text().splitlines()
+        assert len(dead_letters) == 1
+        dead_letter = json.loads(dead_letters[0])
+        assert dead_letter["notification"] == NOTIFICATION
+        assert dead_letter["attempts"] == 3
+
+    def test_batches(self, tmp_path: Path) -> None:
+        """Test that the due entries sharing a notification are batched, unless they failed in a batch."""
+        queue = make_queue(tmp_path)
+        for i in range(3):
+            queue.put(f"nonce{i}", NOTIFICATION, f"account{i}")
+        queue.put("other", OTHER_NOTIFICATION, "account")
+
+        batches = queue.batches(0.0, max_batch_size=2)
+        assert [[entry["id"] for entry in batch] for batch in batches] == [
+            ["nonce0", "nonce1"],
+            ["nonce2"],
+            ["other"],
+        ]
+        batches = queue.batches(0.0, max_batch_size=2, exclude={"nonce0"})
+        assert [[entry["id"] for entry in batch] for batch in batches] == [
+            ["nonce1", "nonce2"],
+            ["other"],
+        ]
+
+        queue.failed("nonce0", "error", now=0.0, solo=True)
+        queue.failed("nonce1", "error", now=0.0, solo=True)
+        batches = queue.batches(10.0, max_batch_size=2)
+        assert [[entry["id"] for entry in batch] for batch in batches] == [
+            ["nonce0"],
+            ["nonce1"],
+            ["nonce2"],
+            ["other"],
+        ]
+
+
+class TestDeliver:
+    """Test the delivery of the notifications."""
+
+    headers = {"Content-Type": "application/json"}
+
+    def test_deliver(self, stand_in: str, pool: ConnectionPool) -> None:
+        """Test that a notification is posted to all the accounts in one request."""
+        accounts = ["account0", "account1"]
+        response = deliver(
+            pool,
+            f"{stand_in}/notify",
+            self.headers,
+            NOTIFICATION,
+            accounts,
+            timeout=5.0,
+        )
+        expected_body = {"notification": NOTIFICATION, "accounts": accounts}
+        assert StandInHandler.received == [("/notify", expected_body)]
+        assert undelivered_accounts(response) == {}
+
+    def test_connection_reuse(self, stand_in: str, pool: ConnectionPool) -> None:
+        """Test that consecutive deliveries reuse the same connection."""
+        for _ in range(3):
+            deliver(pool, f"{stand_in}/notify", self.headers, NOTIFICATION, ["a"], 5.0)
+        stats = pool.stats
+        assert stats["requests"] == 3
+        assert stats["created"] == 1
+        assert stats["reused"] == 2
+        assert stats["hosts"] == {stand_in: {"active": 0, "idle": 1}}
+
+    def test_deliver_partial_failure(self, stand_in: str, pool: ConnectionPool) -> None:
+        """Test that the accounts which were not notified are reported."""
+        accounts = ["account0", "account1"]
+        response = deliver(
+            pool,
+            f"{stand_in}/partial",
+            self.headers,
+            NOTIFICATION,
+            accounts,
+            timeout=5.0,
+        )
+        assert undelivered_accounts(response) == {"account0": "failed"}
+        assert undelivered_accounts(
+            {"failed": [{"account": "account1", "reason": "reason"}]}
+        ) == {"account1": "reason"}
+
+    def test_deliver_failure(self, stand_in: str, pool: ConnectionPool) -> None:
+        """Test that a failed delivery raises."""
+        with pytest.raises(DeliveryError):
+            deliver(pool, f"{stand_in}/fail", self.headers, NOTIFICATION, ["a"], 5.0)
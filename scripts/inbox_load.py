@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Load test for the HTTP API of the inbox.
+
+Drives `POST /generate`, `POST /generate/batch`, `GET /responses`, with sorting, filtering and pagination,
+and `GET /queue_time`,
+either against a running agent or against an in-process `HttpApplication`,
+whose history of processed responses is preloaded with each of the given sizes.
+
+The load is either closed-loop, with every worker sending its next request once the previous one is answered,
+or open-loop, with Poisson arrivals at the given rate whose latencies include the time they waited for a worker.
+The report holds the p50, p95 and p99 latencies and the throughput of each endpoint, per history size.
+
+Examples:
+    python scripts/inbox_load.py --url http://localhost:8000 --concurrency 8 --requests 2000
+    python scripts/inbox_load.py --history 1000,10000,100000,1000000 --rate 200 --duration 30
+    python scripts/inbox_load.py --mix generate_batch=1,responses=8 --batch-size 50 --batch-format ndjson
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import math
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlparse
+
+
+ENDPOINTS = ("generate", "generate_batch", "responses", "queue_time")
+BATCH_FORMATS = ("json", "ndjson")
+DEFAULT_MIX = "generate=1,responses=8,queue_time=1"
+TOOLS = ("short-maker",)
+
+# the endpoint, the latency in seconds and whether the request succeeded
+Sample = Tuple[str, float, bool]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Get the nearest-rank percentile of the given sorted samples."""
+    return samples[max(math.ceil(q * len(samples)) - 1, 0)]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse the weights of the endpoints, e.g., `generate=1,responses=8`."""
+    mix = {}
+    for item in spec.split(","):
+        endpoint, _, weight = item.partition("=")
+        if endpoint not in ENDPOINTS:
+            raise ValueError(
+                f"Unknown endpoint {endpoint!r}, expected one of {ENDPOINTS}."
+            )
+        mix[endpoint] = float(weight or 1)
+    return mix
+
+
+def load_requests(path: Optional[str]) -> List[Dict[str, Any]]:
+    """Load the bodies of the `POST /generate` requests to replay, one JSON object per line."""
+    if path is None:
+        return []
+    bodies = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            body = json.loads(line)
+            if isinstance(body, dict) and "prompt" in body and "tool" in body:
+                bodies.append(body)
+    if not bodies:
+        raise ValueError(f"{path} contains no request with a prompt and a tool.")
+    return bodies
+
+
+# a generator whose only public method is `next`, with the workload's knobs as its attributes
+class Workload:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """Generates the requests of the load test, picking their endpoints according to the mix."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        mix: Dict[str, float],
+        bodies: List[Dict[str, Any]],
+        history_size: int,
+        seed: int,
+        batch_size: int = 10,
+        batch_format: str = BATCH_FORMATS[0],
+    ) -> None:
+        """Initialize object."""
+        self.endpoints = list(mix)
+        self.weights = [mix[endpoint] for endpoint in self.endpoints]
+        self.bodies = bodies
+        self.history_size = history_size
+        self.batch_size = batch_size
+        self.batch_format = batch_format
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._n_bodies = 0
+
+    def _body(self) -> Dict[str, Any]:
+        """Get the body of the next `POST /generate` request, replaying the given ones in order."""
+        if self.bodies:
+            body = self.bodies[self._n_bodies % len(self.bodies)]
+            self._n_bodies += 1
+            return dict(body)
+        return {
+            "prompt": f"prompt {self._rng.randrange(1_000_000)}",
+            "tool": self._rng.choice(TOOLS),
+            "address": f"0x{self._rng.randrange(1000):040x}",
+        }
+
+    def _batch_body(self) -> bytes:
+        """Get the body of the next `POST /generate/batch` request, either as a JSON array or as NDJSON."""
+        bodies = [self._body() for _ in range(self.batch_size)]
+        if self.batch_format == "ndjson":
+            return "\n".join(json.dumps(body) for body in bodies).encode("utf-8")
+        return json.dumps(bodies).encode("utf-8")
+
+    def _responses_query(self) -> Dict[str, Any]:
+        """Get the query of a `GET /responses` request: a page, filtered by id or, rarely, the whole history."""
+        choice = self._rng.random()
+        if choice < 0.1 and self.history_size:
+            return {"id": self._rng.randrange(1, self.history_size + 1)}
+        if choice < 0.11:
+            return {}
+        query = {
+            "sortBy": self._rng.choice(("id", "nonce")),
+            "sortOrder": self._rng.choice(("asc", "desc")),
+            "limit": self._rng.choice((10, 20, 50)),
+        }
+        # the first pages are the most requested ones
+        query["pageNum"] = 1 + int(self._rng.expovariate(0.5))
+        return query
+
+    def next(self) -> Tuple[str, str, str, bytes]:
+        """Get the endpoint, the method, the path and the body of the next request."""
+        with self._lock:
+            endpoint = self._rng.choices(self.endpoints, self.weights)[0]
+            if endpoint == "generate":
+                body = json.dumps(self._body()).encode("utf-8")
+                return endpoint, "post", "/generate", body
+            if endpoint == "generate_batch":
+                return endpoint, "post", "/generate/batch", self._batch_body()
+            if endpoint == "responses":
+                query = urlencode(self._responses_query())
+                return endpoint, "get", f"/responses?{query}", b""
+            tool = self._rng.choice(TOOLS)
+            return endpoint, "get", f"/queue_time?tool={tool}", b""
+
+
+class HttpTarget:
+    """Sends the requests to a running agent, over a keep-alive connection per worker."""
+
+    def __init__(self, url: str, timeout: float) -> None:
+        """Initialize object."""
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        """Get the connection of the current worker."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout
+            )
+            self._local.connection = connection
+        return connection
+
+    def request(self, method: str, path: str, body: bytes) -> int:
+        """Send a request and get the status code of its response."""
+        connection = self._connection()
+        headers = {"Content-Type": "application/json"} if body else {}
+        try:
+            connection.request(method.upper(), path, body or None, headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            # the connection is re-opened by the next request
+            connection.close()
+            self._local.connection = None
+            return 0
+
+    def close(self) -> None:
+        """Close the connection of the current worker."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+
+
+class InProcessTarget:
+    """
+    Handles the requests with an in-process `HttpApplication`, whose inbox is preloaded with a history of responses.
+
+    The requests are handled one at a time, as the agent's main loop handles them.
+    """
+
+    def __init__(self, history_size: int, workdir: str) -> None:
+        """Initialize object."""
+        # the skill's modules are imported from the repository's root
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+        from packages.valory.skills.inbox_abci.handlers import (  # pylint: disable=import-outside-toplevel
+            HttpApplication,
+            InBox,
+        )
+
+        logger = logging.getLogger(__name__)
+        inbox = InBox(logger, db=str(Path(workdir) / "db.json"))
+        inbox.restore(list(self.history(history_size)))
+        self.app = HttpApplication(inbox=inbox, auth="")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def history(size: int) -> Iterator[Dict[str, Any]]:
+        """Generate a history of processed responses, with a failed request in every hundred."""
+        for token_id in range(1, size + 1):
+            nonce = f"{token_id:032x}"
+            if token_id % 100 == 0:
+                yield {
+                    "nonce": nonce,
+                    "prompt": "prompt",
+                    "tool": "short-maker",
+                    "error": "failed",
+                }
+                continue
+            yield {
+                "image": f"bafy{token_id:012x}",
+                "video": f"bafy{token_id:012x}",
+                "id": token_id,
+                "nonce": nonce,
+            }
+
+    def request(self, method: str, path: str, body: bytes) -> int:
+        """Handle a request and get the status code of its response."""
+        message = types.SimpleNamespace(
+            method=method,
+            url=f"http://localhost{path}",
+            body=body,
+            headers="Content-Type: application/json\n",
+        )
+        with self._lock:
+            response = self.app.handle(message)
+        return 0 if response is None else response["code"].value
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+
+def _send(target: Any, workload: Workload, scheduled: Optional[float]) -> Sample:
+    """Send the next request, measuring its latency from the time it was scheduled, if given."""
+    endpoint, method, path, body = workload.next()
+    started = time.perf_counter() if scheduled is None else scheduled
+    status = target.request(method, path, body)
+    return endpoint, time.perf_counter() - started, 200 <= status < 300
+
+
+def run_closed_loop(
+    target: Any,
+    workload: Workload,
+    concurrency: int,
+    n_requests: int,
+    duration: float,
+) -> List[Sample]:
+    """Run the workers, each sending its next request once the previous one has been answered."""
+    samples: List[Sample] = []
+    sent = itertools.count()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration if duration else math.inf
+
+    def worker() -> None:
+        """Send requests until the budget or the time runs out."""
+        while time.perf_counter() < deadline:
+            with lock:
+                if n_requests and next(sent) >= n_requests:
+                    break
+            sample = _send(target, workload, None)
+            with lock:
+                samples.append(sample)
+        target.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def run_open_loop(  # pylint: disable=too-many-arguments
+    target: Any,
+    workload: Workload,
+    concurrency: int,
+    rate: float,
+    n_requests: int,
+    duration: float,
+    seed: int,
+) -> List[Sample]:
+    """Send requests at Poisson arrivals, whatever the latency of the previous ones."""
+    rng = random.Random(seed)
+    futures = []
+    started = time.perf_counter()
+    deadline = started + duration if duration else math.inf
+    scheduled = started
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while scheduled < deadline:
+            if n_requests and len(futures) >= n_requests:
+                break
+            scheduled += rng.expovariate(rate)
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            # the latency is measured from the arrival, so the time waiting for a worker is not omitted
+            futures.append(executor.submit(_send, target, workload, scheduled))
+    return [future.result() for future in futures]
+
+
+def summarise(samples: Sequence[Sample], elapsed: float) -> Dict[str, Any]:
+    """Summarise the latencies, in milliseconds, and the throughput of each endpoint and overall."""
+    groups: Dict[str, List[Sample]] = {"all": list(samples)}
+    for sample in samples:
+        groups.setdefault(sample[0], []).append(sample)
+
+    summary = {}
+    for endpoint, group in groups.items():
+        latencies = sorted(latency * 1000 for _, latency, _ in group)
+        summary[endpoint] = {
+            "count": len(group),
+            "errors": sum(1 for _, _, ok in group if not ok),
+            "throughput": len(group) / elapsed if elapsed else 0.0,
+            "p50": percentile(latencies, 0.5),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1],
+        }
+    return summary
+
+
+def run(args: argparse.Namespace, history_size: Optional[int]) -> Dict[str, Any]:
+    """Run a load test against the target, with the given history size for an in-process one."""
+    workload = Workload(
+        parse_mix(args.mix),
+        load_requests(args.requests_file),
+        history_size or 0,
+        args.seed,
+        args.batch_size,
+        args.batch_format,
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        if history_size is None:
+            target: Any = HttpTarget(args.url, args.timeout)
+        else:
+            target = InProcessTarget(history_size, workdir)
+        started = time.perf_counter()
+        if args.rate:
+            samples = run_open_loop(
+                target,
+                workload,
+                args.concurrency,
+                args.rate,
+                args.requests,
+                args.duration,
+                args.seed,
+            )
+        else:
+            samples = run_closed_loop(
+                target, workload, args.concurrency, args.requests, args.duration
+            )
+        elapsed = time.perf_counter() - started
+    return summarise(samples, elapsed) if samples else {}
+
+
+def print_table(reports: Dict[str, Dict[str, Any]]) -> None:
+    """Print the reports as a table, with the latencies in milliseconds."""
+    columns = ("count", "errors", "throughput", "p50", "p95", "p99", "max")
+    print(f"{'history':>10} {'endpoint':>14} " + " ".join(f"{c:>10}" for c in columns))
+    for history, report in reports.items():
+        for endpoint, summary in report.items():
+            values = " ".join(
+                f"{summary[column]:>10.2f}"
+                if isinstance(summary[column], float)
+                else f"{summary[column]:>10}"
+                for column in columns
+            )
+            print(f"{history:>10} {endpoint:>14} {values}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the load tests from the command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--url", help="the url of a running agent's inbox API")
+    parser.add_argument(
+        "--history",
+        default="1000",
+        help="the comma-separated history sizes of the in-process target",
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument(
+        "--requests-file",
+        help="a JSONL file with the bodies of the `POST /generate` requests to replay",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10,
+        help="the number of requests per `POST /generate/batch` request",
+    )
+    parser.add_argument("--batch-format", choices=BATCH_FORMATS, default="json")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="open-loop requests per second"
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=0.0, help="in seconds")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.url:
+        reports = {"remote": run(args, None)}
+    else:
+        sizes = [int(size) for size in args.history.split(",")]
+        reports = {str(size): run(args, size) for size in sizes}
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_table(reports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,775 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+A discrete-event model of GeneratooorrAbciApp, to estimate its throughput offline.
+
+This is a model, not a run of the agent: none of the rounds' or the behaviours' code is executed.
+It only walks the transition function of the composed app, with a single agent whose payloads
+are committed by a fake Tendermint, one block per round, and the work of each round is replaced by
+hand-written calls to in-process stand-ins for the ledger and contract APIs, IPFS, the mech and the notification service,
+whose latencies are sampled from configurable distributions, on a simulated clock.
+Only the inbox and the notification queue are the real ones, so their cost is measured in CPU time.
+Its estimates are only as good as the stand-ins, and they need to be kept in line with the rounds they stand for.
+
+Run it from the repository's root with `python -m scripts.simulation --help`.
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import math
+import random
+import tempfile
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, cast
+
+from packages.valory.skills.abstract_round_abci.base import AbstractRound
+from packages.valory.skills.generatooorr_abci.behaviours import ROUND_STAGES
+from packages.valory.skills.generatooorr_abci.composition import GeneratooorrAbciApp
+from packages.valory.skills.generatooorr_abci.tx_multiplexer import (
+    TxMultiplexerFailedRound,
+    TxMultiplexerRound,
+)
+from packages.valory.skills.inbox_abci.handlers import InBox, RequestStage, percentile
+from packages.valory.skills.inbox_abci.rounds import WaitRound
+from packages.valory.skills.mech_interact_abci.states.request import MechRequestRound
+from packages.valory.skills.mech_interact_abci.states.response import MechResponseRound
+from packages.valory.skills.nft_mint_abci.rounds import NftMintRound, VerifyMintRound
+from packages.valory.skills.outbox_abci.notifications import NotificationQueue
+from packages.valory.skills.outbox_abci.rounds import PushNotificationRound
+from packages.valory.skills.reset_pause_abci.rounds import ResetAndPauseRound
+from packages.valory.skills.transaction_settlement_abci.rounds import (
+    CheckTransactionHistoryRound,
+    FinalizationRound,
+    ValidateTransactionRound,
+)
+
+
+MECH_TX = "mech"
+NFT_TX = "nft"
+FINAL_STAGES = (RequestStage.NOTIFIED.value, RequestStage.FAILED.value)
+
+
+class Latency:
+    """
+    A distribution of latencies, in seconds.
+
+    It is parsed from `<kind>:<params>`, where the kind is one of
+    `const:<seconds>`, `uniform:<low>,<high>`, `exp:<mean>` and `lognormal:<median>,<sigma>`.
+    A plain number is a constant latency.
+    """
+
+    def __init__(self, kind: str, params: Sequence[float]) -> None:
+        """Initialize object."""
+        self.kind = kind
+        self.params = tuple(params)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        """Parse a distribution."""
+        kind, _, params = spec.partition(":")
+        if not params:
+            kind, params = "const", kind
+        values = [float(value) for value in params.split(",")]
+        n_params = {"const": 1, "uniform": 2, "exp": 1, "lognormal": 2}.get(kind, None)
+        if n_params is None or len(values) != n_params:
+            raise ValueError(f"Invalid latency distribution {spec!r}.")
+        return cls(kind, values)
+
+    def sample(self, rng: random.Random) -> float:
+        """Sample a latency."""
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "exp":
+            return rng.expovariate(1 / self.params[0]) if self.params[0] else 0.0
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return rng.lognormvariate(math.log(median), sigma)
+        return self.params[0]
+
+    def __repr__(self) -> str:
+        """Get the distribution's spec."""
+        return f"{self.kind}:{','.join(str(param) for param in self.params)}"
+
+
+class FakeTendermint:  # pylint: disable=too-few-public-methods
+    """A single-agent Tendermint, which commits a block every `block_interval` seconds."""
+
+    def __init__(self, block_interval: float) -> None:
+        """Initialize object."""
+        self.block_interval = block_interval
+        self.height = 0
+
+    def commit(self, now: float) -> float:
+        """Commit the next block, which includes the payloads sent until now, and get its time."""
+        self.height += 1
+        return (math.floor(now / self.block_interval) + 1) * self.block_interval
+
+
+class StandIn:  # pylint: disable=too-few-public-methods
+    """A stand-in for an external service, counting the calls made to it."""
+
+    def __init__(self, rng: random.Random, latency: Latency) -> None:
+        """Initialize object."""
+        self.rng = rng
+        self.latency = latency
+        self.calls = 0
+
+    def call(self) -> float:
+        """Make a call and get its latency."""
+        self.calls += 1
+        return self.latency.sample(self.rng)
+
+
+class LedgerStandIn(StandIn):  # pylint: disable=too-many-instance-attributes
+    """
+    Stands in for the ledger and the contract APIs of the mech and the NFT contracts.
+
+    The settled mech txs emit `Request` logs, which the mech answers with `Deliver` logs after its latency,
+    and the settled mint txs emit `CreateBlockchainShort` logs.
+    The logs are returned decoded, in the format of the contracts' callables.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        rng: random.Random,
+        latency: Latency,
+        settlement_latency: Latency,
+        tx_failure_rate: float,
+        mech_latency: Latency,
+        mech_failure_rate: float,
+    ) -> None:
+        """Initialize object."""
+        super().__init__(rng, latency)
+        self.settlement_latency = settlement_latency
+        self.tx_failure_rate = tx_failure_rate
+        self.mech_latency = mech_latency
+        self.mech_failure_rate = mech_failure_rate
+        self.settlements: Dict[str, int] = {"settled": 0, "failed": 0}
+        self._request_id = 0
+        self._token_id = 0
+        # the `Deliver` logs, with the time the mech emits them
+        self._deliveries: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+
+    def settle(self) -> Tuple[float, bool]:
+        """Settle a tx and get the time it took and whether it succeeded."""
+        self.calls += 1
+        settled = self.rng.random() >= self.tx_failure_rate
+        self.settlements["settled" if settled else "failed"] += 1
+        return self.settlement_latency.sample(self.rng), settled
+
+    def process_request_event(self, data: str, now: float) -> Dict[str, Any]:
+        """Get the `Request` log of a settled mech tx, which the mech starts working on."""
+        self._request_id += 1
+        request_id = self._request_id
+        result = None
+        if self.rng.random() >= self.mech_failure_rate:
+            result = json.dumps({"image": f"image-{data}", "video": f"video-{data}"})
+        delivered_at = now + self.mech_latency.sample(self.rng)
+        self._deliveries[request_id] = (
+            delivered_at,
+            {"requestId": request_id, "data": result},
+        )
+        return {"results": [{"requestId": request_id, "data": data}]}
+
+    def get_delivered(self, request_ids: Sequence[int], now: float) -> Dict[str, Any]:
+        """Get the `Deliver` logs which the mech has emitted for the given requests."""
+        events = []
+        for request_id in request_ids:
+            delivered_at, _ = self._deliveries.get(request_id, (math.inf, {}))
+            if delivered_at <= now:
+                events.append(self._deliveries.pop(request_id)[1])
+        return {"delivered": {"events": events}}
+
+    def get_token_ids_from_hash(self, hashes: Sequence[str]) -> Dict[str, Any]:
+        """Get the `CreateBlockchainShort` logs of a settled mint tx."""
+        token_ids = {}
+        for ipfs_hash in hashes:
+            self._token_id += 1
+            token_ids[ipfs_hash] = self._token_id
+        return {"token_ids": token_ids}
+
+
+class IpfsStandIn(StandIn):
+    """Stands in for IPFS."""
+
+    def __init__(self, rng: random.Random, latency: Latency) -> None:
+        """Initialize object."""
+        super().__init__(rng, latency)
+        self._objects: Dict[str, Any] = {}
+
+    def send(self, obj: Any) -> Tuple[float, str]:
+        """Store an object and get the latency and its hash."""
+        ipfs_hash = f"bafy{len(self._objects):012x}"
+        self._objects[ipfs_hash] = obj
+        return self.call(), ipfs_hash
+
+
+class NotifyStandIn(StandIn):
+    """Stands in for the notification service."""
+
+    def __init__(
+        self, rng: random.Random, latency: Latency, failure_rate: float
+    ) -> None:
+        """Initialize object."""
+        super().__init__(rng, latency)
+        self.failure_rate = failure_rate
+
+    def deliver(self, accounts: Sequence[str]) -> Tuple[float, List[str]]:
+        """Deliver a notification and get the latency and the accounts which were not notified."""
+        latency = self.call()
+        failed = [
+            account for account in accounts if self.rng.random() < self.failure_rate
+        ]
+        return latency, failed
+
+
+@dataclass
+class Period:  # pylint: disable=too-many-instance-attributes
+    """The state of the request being processed in a period."""
+
+    request: Dict[str, Any]
+    # the addresses of the request and of its coalesced duplicates, by nonce
+    requests: Dict[str, str]
+    result: Optional[str] = None
+    error: str = ""
+    tx_submitter: str = ""
+    settled: bool = False
+    request_id: int = 0
+    metadata_hashes: Dict[str, str] = field(default_factory=dict)
+    token_ids: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class SimulationConfig:  # pylint: disable=too-many-instance-attributes
+    """The configuration of a simulation."""
+
+    block_interval: float = 1.0
+    sleep_time: float = 1.0
+    reset_pause_duration: float = 300.0
+    response_timeout: float = 3600.0
+    max_retries: int = 0
+    notification_batch_size: int = 100
+    notification_max_attempts: int = 5
+    ledger_latency: Latency = field(default_factory=lambda: Latency.parse("0.2"))
+    settlement_latency: Latency = field(default_factory=lambda: Latency.parse("exp:10"))
+    tx_failure_rate: float = 0.0
+    ipfs_latency: Latency = field(default_factory=lambda: Latency.parse("0.5"))
+    mech_latency: Latency = field(
+        default_factory=lambda: Latency.parse("lognormal:120,0.5")
+    )
+    mech_failure_rate: float = 0.0
+    notify_latency: Latency = field(default_factory=lambda: Latency.parse("0.3"))
+    notify_failure_rate: float = 0.0
+    max_time: float = 30 * 24 * 3600.0
+
+
+def generate_arrivals(  # pylint: disable=too-many-arguments
+    rng: random.Random,
+    n_requests: int,
+    rate: float,
+    tools: Sequence[str],
+    n_addresses: int,
+    n_prompts: int,
+) -> List[Tuple[float, Dict[str, Any]]]:
+    """
+    Generate the requests submitted to the inbox, with their arrival times.
+
+    :param rng: the random number generator.
+    :param n_requests: the number of the requests.
+    :param rate: the arrival rate, in requests per hour, with Poisson arrivals. Zero submits all of them at once.
+    :param tools: the tools, picked uniformly.
+    :param n_addresses: the number of the requesting addresses, picked uniformly.
+    :param n_prompts: the number of the distinct prompts, fewer than the requests to exercise the coalescing and the cache.
+    :return: the arrival times and the requests, in order.
+    """
+    arrivals = []
+    now = 0.0
+    for _ in range(n_requests):
+        if rate:
+            now += rng.expovariate(rate / 3600)
+        request = {
+            "prompt": f"prompt {rng.randrange(n_prompts)}",
+            "tool": rng.choice(tools),
+            "address": f"0x{rng.randrange(n_addresses):040x}",
+        }
+        arrivals.append((now, request))
+    return arrivals
+
+
+def _summary(durations: List[float]) -> Dict[str, float]:
+    """Summarise a group of durations."""
+    return {
+        "count": len(durations),
+        "mean": sum(durations) / len(durations),
+        "p50": percentile(durations, 0.5),
+        "p90": percentile(durations, 0.9),
+        "max": max(durations),
+    }
+
+
+class Simulation:  # pylint: disable=too-many-instance-attributes
+    """A simulation of GeneratooorrAbciApp, driven by a fake Tendermint and stand-ins for the external services."""
+
+    def __init__(self, config: SimulationConfig, workdir: str, seed: int = 0) -> None:
+        """Initialize object."""
+        self.config = config
+        self.rng = random.Random(seed)
+        self.now = 0.0
+        self.tendermint = FakeTendermint(config.block_interval)
+        self.ledger = LedgerStandIn(
+            self.rng,
+            config.ledger_latency,
+            config.settlement_latency,
+            config.tx_failure_rate,
+            config.mech_latency,
+            config.mech_failure_rate,
+        )
+        self.ipfs = IpfsStandIn(self.rng, config.ipfs_latency)
+        self.notify = NotifyStandIn(
+            self.rng, config.notify_latency, config.notify_failure_rate
+        )
+        logger = logging.getLogger(__name__)
+        self.inbox = InBox(
+            logger, str(Path(workdir) / "db.json"), max_retries=config.max_retries
+        )
+        self.notifications = NotificationQueue(
+            logger,
+            str(Path(workdir) / "notifications.json"),
+            str(Path(workdir) / "notifications_dead_letter.jsonl"),
+            config.notification_max_attempts,
+            backoff_base=1.0,
+            backoff_max=60.0,
+        )
+        self.inbox.subscribe(self._on_stage)
+        self.transition_function = GeneratooorrAbciApp.transition_function
+        self.round: Type[AbstractRound] = WaitRound
+        self.period: Optional[Period] = None
+        # the pending events, with their times, e.g., the arrivals of the requests
+        self._events: List[Tuple[float, int, Callable[[], None]]] = []
+        self._seq = 0
+        self._delivering: Dict[str, List[str]] = {}
+        self._delivery_scheduled = False
+        # the stages each request went through, with the simulated times they were reached
+        self.stages: Dict[str, List[Tuple[str, float]]] = {}
+        self.completed: Dict[str, str] = {}
+        self.submitted = 0
+        self.round_durations: Dict[str, List[float]] = {}
+        self.periods = 0
+        self.drivers: Dict[Any, Callable[[], str]] = {
+            WaitRound: self._wait,
+            MechRequestRound: self._mech_request,
+            FinalizationRound: self._finalization,
+            ValidateTransactionRound: self._validate_transaction,
+            CheckTransactionHistoryRound: self._check_transaction_history,
+            TxMultiplexerRound: self._tx_multiplexer,
+            TxMultiplexerFailedRound: self._failed_tx_multiplexer,
+            MechResponseRound: self._mech_response,
+            NftMintRound: self._nft_mint,
+            VerifyMintRound: self._verify_mint,
+            PushNotificationRound: self._push_notification,
+            ResetAndPauseRound: self._reset_and_pause,
+        }
+
+    def schedule(self, at: float, callback: Callable[[], None]) -> None:
+        """Schedule an event at the given simulated time."""
+        heapq.heappush(self._events, (at, self._seq, callback))
+        self._seq += 1
+
+    def advance(self, until: float) -> None:
+        """Advance the simulated clock, running the events which happen in the meantime in order."""
+        while self._events and self._events[0][0] <= until:
+            at, _, callback = heapq.heappop(self._events)
+            self.now = max(self.now, at)
+            callback()
+        self.now = max(self.now, until)
+
+    def work(self, seconds: float) -> None:
+        """Spend the given time on the current round's work."""
+        self.advance(self.now + seconds)
+
+    def _on_stage(self, record: Dict) -> None:
+        """Record the simulated time a request reached a stage."""
+        nonce = record["nonce"]
+        self.stages.setdefault(nonce, []).append((record["stage"], self.now))
+        if record["stage"] in FINAL_STAGES:
+            self.completed[nonce] = record["stage"]
+
+    def submit(self, request: Dict[str, Any]) -> None:
+        """Submit a request to the inbox, as the HTTP handler does."""
+        self.inbox.put(request)
+        self.submitted += 1
+
+    def _enter(self, round_cls: Any) -> None:
+        """Move the requests of the period to the stage reached when the FSM enters the given round."""
+        stage = ROUND_STAGES.get(round_cls.auto_round_id(), None)
+        if stage is None or self.period is None:
+            return
+        if stage == RequestStage.MINTED:
+            for nonce, token_id in self.period.token_ids.items():
+                self.inbox.set_stage(nonce, stage, token_id=token_id)
+            return
+        for nonce in self.period.requests:
+            self.inbox.set_stage(nonce, stage)
+
+    def _wait(self) -> str:
+        """Pick the next request from the inbox, sleeping for a second if there is none."""
+        request = self.inbox.get()
+        if request is None:
+            # nothing changes until the next event, so the idle periods are skipped
+            next_event = self._events[0][0] if self._events else self.now
+            self.work(max(1.0, next_event - self.now))
+            return "no_request"
+        requests = {request["nonce"]: request["address"]}
+        for coalesced in request.get("coalesced", []):
+            requests[coalesced["nonce"]] = coalesced["address"]
+        self.period = Period(request=request, requests=requests)
+        self.periods += 1
+        if "result" in request:
+            self.period.result = request["result"]
+            return "cache_hit"
+        return "done"
+
+    def _mech_request(self) -> str:
+        """Upload the request's metadata and prepare the mech request tx."""
+        period = self._period
+        latency, _ = self.ipfs.send(period.request)
+        self.work(latency)
+        # `get_price`, `get_request_data`, `get_tx_data` and `get_raw_safe_transaction_hash`
+        for _ in range(4):
+            self.work(self.ledger.call())
+        period.tx_submitter = MECH_TX
+        return "done"
+
+    def _finalization(self) -> str:
+        """Send the tx and wait for it to be mined."""
+        latency, settled = self.ledger.settle()
+        self.work(latency)
+        self._period.settled = settled
+        return "done"
+
+    def _validate_transaction(self) -> str:
+        """Validate the settled tx."""
+        self.work(self.ledger.call())
+        return "done" if self._period.settled else "negative"
+
+    def _check_transaction_history(self) -> str:
+        """Check the history of a tx which could not be validated."""
+        self.work(self.ledger.call())
+        return "negative"
+
+    def _tx_multiplexer(self) -> str:
+        """Move on to the round which follows the settled tx."""
+        period = self._period
+        if period.tx_submitter == MECH_TX:
+            self.work(self.ledger.call())
+            nonce = period.request["nonce"]
+            results = self.ledger.process_request_event(nonce, self.now)
+            period.request_id = results["results"][0]["requestId"]
+            return "mech_tx"
+        return "nft_tx"
+
+    def _failed_tx_multiplexer(self) -> str:
+        """Move on to the round which retries the failed tx."""
+        if self._period.tx_submitter == MECH_TX:
+            return "failed_mech_tx"
+        return "failed_nft_tx"
+
+    def _mech_response(self) -> str:
+        """Poll the `Deliver` events until the mech delivers the response or the deadline passes."""
+        period = self._period
+        deadline = self.now + self.config.response_timeout
+        while True:
+            self.work(self.ledger.call())
+            delivered = self.ledger.get_delivered([period.request_id], self.now)
+            events = delivered["delivered"]["events"]
+            if events:
+                period.result = events[0]["data"]
+                if period.result is None:
+                    period.error = "The mech could not process the request."
+                break
+            if self.now >= deadline:
+                period.error = (
+                    "The mech did not deliver a response before the request's deadline."
+                )
+                break
+            self.work(self.config.sleep_time)
+        if period.result is not None:
+            # the response is fetched from IPFS
+            self.work(self.ipfs.call())
+        return "done"
+
+    def _nft_mint(self) -> str:
+        """Publish the metadata of the tokens and prepare the mint tx."""
+        period = self._period
+        if period.result is None:
+            self.inbox.fail(period.request["nonce"], period.error)
+            return "error"
+        self.inbox.cache_result(period.request["nonce"], period.result)
+        for nonce in period.requests:
+            metadata = {"nonce": nonce, "result": period.result}
+            latency, ipfs_hash = self.ipfs.send(metadata)
+            self.work(latency)
+            # `get_mint_data`
+            self.work(self.ledger.call())
+            period.metadata_hashes[nonce] = ipfs_hash
+        # `get_tx_data` and `get_raw_safe_transaction_hash`
+        for _ in range(2):
+            self.work(self.ledger.call())
+        period.tx_submitter = NFT_TX
+        return "done"
+
+    def _verify_mint(self) -> str:
+        """Get the ids of the minted tokens."""
+        period = self._period
+        self.work(self.ledger.call())
+        minted = self.ledger.get_token_ids_from_hash(
+            list(period.metadata_hashes.values())
+        )["token_ids"]
+        period.token_ids = {
+            nonce: minted[ipfs_hash]
+            for nonce, ipfs_hash in period.metadata_hashes.items()
+        }
+        return "done"
+
+    def _push_notification(self) -> str:
+        """Add the responses to the inbox and queue their notifications."""
+        period = self._period
+        for nonce, token_id in period.token_ids.items():
+            data = json.loads(cast(str, period.result))
+            data["id"] = token_id
+            data["nonce"] = nonce
+            self.inbox.add_response(data)
+            notification = {"body": "Your blockchain short has been minted!"}
+            account = f"eip155:1:{period.requests[nonce]}"
+            self.notifications.put(nonce, notification, account)
+        self._schedule_delivery()
+        return "done"
+
+    def _reset_and_pause(self) -> str:
+        """Pause until the next period."""
+        self.period = None
+        self.work(self.config.reset_pause_duration)
+        return "done"
+
+    def _schedule_delivery(self) -> None:
+        """Schedule the next tick of the notification delivery, if there is none."""
+        if self._delivery_scheduled:
+            return
+        self._delivery_scheduled = True
+        self.schedule(self.now + 1.0, self._deliver_notifications)
+
+    def _deliver_notifications(self) -> None:
+        """Deliver the due notifications in batches, as the notification delivery behaviour does."""
+        self._delivery_scheduled = False
+        batches = self.notifications.batches(
+            self.now, self.config.notification_batch_size, exclude=self._delivering
+        )
+        for batch in batches:
+            ids = [entry["id"] for entry in batch]
+            for entry_id in ids:
+                self._delivering[entry_id] = ids
+            accounts = [entry["account"] for entry in batch]
+            latency, failed = self.notify.deliver(accounts)
+            self.schedule(
+                self.now + latency,
+                partial(self._delivered, batch, failed),
+            )
+        if len(self.notifications) > len(self._delivering):
+            self._schedule_delivery()
+
+    def _delivered(self, batch: List[Dict[str, Any]], failed: List[str]) -> None:
+        """Handle the outcome of the delivery of a batch of notifications."""
+        for entry in batch:
+            self._delivering.pop(entry["id"], None)
+            if entry["account"] not in failed:
+                self.notifications.delivered(entry["id"])
+                self.inbox.set_stage(entry["id"], RequestStage.NOTIFIED)
+                continue
+            self.notifications.failed(entry["id"], "failed", self.now, solo=True)
+            pending = {pending["id"] for pending in self.notifications.due(math.inf)}
+            if entry["id"] not in pending:
+                # the notification was moved to the dead-letter file
+                self.completed[entry["id"]] = "dead_letter"
+        if len(self.notifications) > 0:
+            self._schedule_delivery()
+
+    @property
+    def _period(self) -> Period:
+        """Get the current period, which the rounds past the inbox's require."""
+        if self.period is None:
+            raise ValueError(f"Round {self.round.auto_round_id()} requires a request.")
+        return self.period
+
+    @staticmethod
+    def _default() -> str:
+        """Drive a round whose work is negligible, e.g., one of the tx settlement's consensus rounds."""
+        return "done"
+
+    def step(self) -> None:
+        """Run the current round until the block which ends it and transition to the next one."""
+        round_cls = self.round
+        started = self.now
+        self._enter(round_cls)
+        event = self.drivers.get(round_cls, self._default)()
+        # the payload is included in the next block, where the single agent reaches the threshold
+        self.advance(self.tendermint.commit(self.now))
+        transitions = {
+            transition_event.value: next_round
+            for transition_event, next_round in self.transition_function[
+                round_cls
+            ].items()
+        }
+        if event not in transitions:
+            raise ValueError(
+                f"Round {round_cls.auto_round_id()} has no transition for {event!r}."
+            )
+        self.round = transitions[event]
+        round_id = round_cls.auto_round_id()
+        self.round_durations.setdefault(round_id, []).append(self.now - started)
+
+    def run(self, arrivals: List[Tuple[float, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Run the simulation until all the given requests have been processed and report the results."""
+        for at, request in arrivals:
+            self.schedule(at, partial(self.submit, request))
+        cpu_started = time.process_time()
+        while self.now < self.config.max_time:
+            self.step()
+            if len(self.completed) == len(arrivals) and not self._events:
+                break
+        cpu_time = time.process_time() - cpu_started
+        return self.report(cpu_time, arrivals[0][0] if arrivals else 0.0)
+
+    def report(self, cpu_time: float, started: float) -> Dict[str, Any]:
+        """Report the throughput, the stage latencies and the cost of the requests."""
+        stage_durations: Dict[str, List[float]] = {}
+        end_to_end = []
+        for nonce, stages in self.stages.items():
+            for (stage, reached), (_, left) in zip(stages, stages[1:]):
+                stage_durations.setdefault(stage, []).append(left - reached)
+            if nonce in self.completed:
+                end_to_end.append(stages[-1][1] - stages[0][1])
+        n_completed = len(self.completed)
+        hours = (self.now - started) / 3600
+        outcomes: Dict[str, int] = {}
+        for outcome in self.completed.values():
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        return {
+            "requests": self.submitted,
+            "completed": n_completed,
+            "outcomes": outcomes,
+            "simulated_hours": hours,
+            "requests_per_hour": n_completed / hours if hours else 0.0,
+            "periods": self.periods,
+            "blocks": self.tendermint.height,
+            "stage_latencies": {
+                stage: _summary(durations)
+                for stage, durations in stage_durations.items()
+            },
+            "end_to_end": _summary(end_to_end) if end_to_end else None,
+            "rounds": {
+                round_id: _summary(durations)
+                for round_id, durations in self.round_durations.items()
+            },
+            "calls": {
+                "ledger": self.ledger.calls,
+                "ipfs": self.ipfs.calls,
+                "notify": self.notify.calls,
+            },
+            "settlements": self.ledger.settlements,
+            "cpu_seconds": cpu_time,
+            "cpu_per_request": cpu_time / n_completed if n_completed else None,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a simulation from the command line and print its report as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="requests per hour, 0 for all at once"
+    )
+    parser.add_argument("--tools", default="short-maker")
+    parser.add_argument("--addresses", type=int, default=10)
+    parser.add_argument(
+        "--prompts",
+        type=int,
+        default=0,
+        help="distinct prompts, defaults to as many as the requests",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--block-interval", type=float, default=1.0)
+    parser.add_argument("--sleep-time", type=float, default=1.0)
+    parser.add_argument("--reset-pause-duration", type=float, default=300.0)
+    parser.add_argument("--response-timeout", type=float, default=3600.0)
+    parser.add_argument("--max-retries", type=int, default=0)
+    parser.add_argument("--ledger-latency", type=Latency.parse, default="0.2")
+    parser.add_argument("--settlement-latency", type=Latency.parse, default="exp:10")
+    parser.add_argument("--tx-failure-rate", type=float, default=0.0)
+    parser.add_argument("--ipfs-latency", type=Latency.parse, default="0.5")
+    parser.add_argument(
+        "--mech-latency", type=Latency.parse, default="lognormal:120,0.5"
+    )
+    parser.add_argument("--mech-failure-rate", type=float, default=0.0)
+    parser.add_argument("--notify-latency", type=Latency.parse, default="0.3")
+    parser.add_argument("--notify-failure-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="the file to write the report to")
+    parser.add_argument("--log-level", default="ERROR")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level)
+
+    config = SimulationConfig(
+        block_interval=args.block_interval,
+        sleep_time=args.sleep_time,
+        reset_pause_duration=args.reset_pause_duration,
+        response_timeout=args.response_timeout,
+        max_retries=args.max_retries,
+        ledger_latency=args.ledger_latency,
+        settlement_latency=args.settlement_latency,
+        tx_failure_rate=args.tx_failure_rate,
+        ipfs_latency=args.ipfs_latency,
+        mech_latency=args.mech_latency,
+        mech_failure_rate=args.mech_failure_rate,
+        notify_latency=args.notify_latency,
+        notify_failure_rate=args.notify_failure_rate,
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        simulation = Simulation(config, workdir, args.seed)
+        arrivals = generate_arrivals(
+            simulation.rng,
+            args.requests,
+            args.rate,
+            args.tools.split(","),
+            args.addresses,
+            args.prompts or args.requests,
+        )
+        report = simulation.run(arrivals)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()